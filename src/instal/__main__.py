@@ -28,6 +28,7 @@ def main():
     print("instalf: Filter a trace.")
     print("instalr: Generate a Trace Report.")
     print("instalv: Generate a stub AST Walker.")
+    print("instalb: Benchmark each stage of Instal.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+##-- end imports
+
+import pytest
+
+from instal import defaults
+from instal.benchmark.generator import SyntheticGenerator, SyntheticSpec
+from instal.parser.v2.parser import InstalPyParser
+
+logging = logmod.root
+
+class TestSyntheticGenerator:
+
+    def test_initial(self):
+        gen = SyntheticGenerator(SyntheticSpec())
+        assert(isinstance(gen, SyntheticGenerator))
+
+    def test_files(self):
+        files = SyntheticGenerator(SyntheticSpec(name="test", institutions=2, bridges=1)).generate()
+        assert(set(files) == {"test_inst_0.ial", "test_inst_1.ial", "test_bridge_0.iab",
+                              "test.idc", "test.iaf", "test.iaq"})
+
+    def test_deterministic(self):
+        spec = SyntheticSpec(rules=30, seed=3)
+        assert(SyntheticGenerator(spec).generate() == SyntheticGenerator(spec).generate())
+
+    def test_seed_changes_rules(self):
+        first  = SyntheticGenerator(SyntheticSpec(rules=30, seed=1)).generate()
+        second = SyntheticGenerator(SyntheticSpec(rules=30, seed=2)).generate()
+        assert(first["synthetic_inst_0.ial"] != second["synthetic_inst_0.ial"])
+
+    def test_bad_bridges(self):
+        with pytest.raises(AssertionError):
+            SyntheticSpec(institutions=1, bridges=1)
+
+    @pytest.mark.parametrize("arity", [0, 1, 2])
+    def test_parses(self, arity):
+        spec   = SyntheticSpec(events=5, fluents=3, rules=15, arity=arity)
+        files  = SyntheticGenerator(spec).generate()
+        parser = InstalPyParser()
+        insts  = parser.parse_institution(files[f"synthetic{'_inst_0'}{defaults.INST_EXT}"])
+        assert(len(insts[0].events) == 10)
+        assert(len(insts[0].fluents) == 3)
+        assert(len(parser.parse_query(files["synthetic.iaq"])) == spec.horizon)
+
+    def test_bridge_parses(self):
+        files  = SyntheticGenerator(SyntheticSpec(institutions=2, bridges=1)).generate()
+        bridge = InstalPyParser().parse_bridge(files["synthetic_bridge_0.iab"])
+        assert(bool(bridge[0].rules))
+
+    def test_write(self, tmp_path):
+        written = SyntheticGenerator(SyntheticSpec()).write(tmp_path)
+        assert(all(x.exists() for x in written))
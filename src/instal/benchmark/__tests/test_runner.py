@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib
+##-- end imports
+
+import pytest
+
+from instal.benchmark.generator import SyntheticSpec
+from instal.benchmark.runner import (STAGES, BenchmarkCase, BenchmarkRunner,
+                                     compare_results, example_cases,
+                                     write_results)
+
+logging = logmod.root
+
+@pytest.fixture(scope="module")
+def results(tmp_path_factory):
+    target = tmp_path_factory.mktemp("bench")
+    case   = BenchmarkCase.from_spec(SyntheticSpec(name="tiny", events=3, fluents=2, rules=5, horizon=2), target)
+    return BenchmarkRunner(repeats=2).run([case])
+
+class TestBenchmarkRunner:
+
+    def test_case_from_spec(self, tmp_path):
+        case = BenchmarkCase.from_spec(SyntheticSpec(name="test"), tmp_path)
+        assert(case.name == "synthetic/test")
+        assert(case.query is not None)
+        assert(case.spec['name'] == "test")
+        assert(all(x.exists() for x in case.files))
+
+    def test_stages(self, results):
+        case = results['cases']['synthetic/tiny']
+        assert('error' not in case)
+        assert(set(case['stages']) == set(STAGES))
+        assert(all(x['runs'] == 2 for x in case['stages'].values()))
+        assert(case['models'] == 1)
+        assert(bool(case['statistics']))
+
+    def test_environment(self, results):
+        assert({"version", "clingo_version", "python", "commit"} <= set(results['environment']))
+
+    def test_errors_recorded(self, tmp_path):
+        bad = tmp_path / "bad.ial"
+        bad.write_text("not an institution")
+        result = BenchmarkRunner(repeats=1).run_case(BenchmarkCase("bad", [bad]))
+        assert(result['failed_stage'] == "parse")
+        assert(result['error'].startswith("parse: "))
+        assert(not bool(result['stages']))
+
+    def test_optional_failures_excluded(self, tmp_path):
+        bad = tmp_path / "bad.ial"
+        bad.write_text("not an institution")
+        results = BenchmarkRunner(repeats=1).run([BenchmarkCase("bad", [bad], optional=True),
+                                                  BenchmarkCase("required", [bad])])
+        assert(set(results['cases']) == {"required"})
+        assert(results['excluded']['bad'].startswith("parse: "))
+
+    def test_no_models_flagged(self, tmp_path):
+        inst = tmp_path / "test.ial"
+        inst.write_text("institution test;\ntype Agent;\nexo event go(Agent);\n")
+        result = BenchmarkRunner(repeats=1, validate=False).run_case(BenchmarkCase("empty", [inst]))
+        assert('error' not in result)
+        assert(result['models'] == 0)
+        assert(result['warning'] == "no models")
+
+    def test_ground_timing(self, results):
+        case = results['cases']['synthetic/tiny']
+        assert(case['stages']['ground']['min'] <= case['stages']['ground']['mean'])
+
+    def test_compare_failed(self, results):
+        failed = {"cases": {"synthetic/tiny": {"error": "parse: ParseException: bad", "stages": {}}}}
+        lines  = compare_results(results, failed)
+        assert(lines[1].endswith("(failed: parse: ParseException: bad)"))
+
+    def test_write_results(self, results, tmp_path):
+        write_results(results, tmp_path / "results.json")
+        loaded = json.loads((tmp_path / "results.json").read_text())
+        assert(set(loaded['cases']) == {"synthetic/tiny"})
+
+    def test_compare(self, results):
+        lines = compare_results(results, results)
+        assert(len(lines) == 1 + len(STAGES))
+        assert(all(x.endswith("1.00") for x in lines[1:]))
+
+    def test_compare_missing(self, results):
+        lines = compare_results({"cases": {}}, results)
+        assert("not in baseline" in lines[1])
+
+    def test_example_cases(self, tmp_path):
+        inst_dir = tmp_path / "v2" / "example"
+        inst_dir.mkdir(parents=True)
+        (inst_dir / "test.ial").write_text("institution test.")
+        (inst_dir / "test.iaq").write_text("")
+        (tmp_path / "v2" / "empty").mkdir()
+        cases = example_cases(tmp_path)
+        assert(len(cases) == 1)
+        assert(cases[0].name == "examples/v2/example")
+        assert(cases[0].optional)
@@ -0,0 +1,208 @@
+#/usr/bin/env python3
+"""
+Generation of synthetic instal specifications, of configurable size,
+as v2 DSL text for each file a real specification would have:
+
+{name}_inst_{i}.ial  : institutions, of events, fluents and rules over the types
+{name}_bridge_{i}.iab: bridges from institution i to i+1, of xgenerates rules
+{name}.idc           : domain instances of each type
+{name}.iaf           : the initial situation
+{name}.iaq           : a query, observing an external event each timestep
+
+Generation is deterministic for a given spec (including its seed),
+so results can be compared between commits.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib as pl
+import random
+from dataclasses import asdict, dataclass, field
+
+from instal import defaults
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+@dataclass
+class SyntheticSpec:
+    """
+    The size of a synthetic specification.
+    Events, fluents and rules are per institution.
+    `arity` is the number of typed parameters of each event and fluent.
+    """
+    name         : str = "synthetic"
+    institutions : int = 1
+    bridges      : int = 0
+    types        : int = 2
+    instances    : int = 3
+    events       : int = 6
+    fluents      : int = 4
+    rules        : int = 12
+    arity        : int = 1
+    horizon      : int = 4
+    seed         : int = 0
+
+    def __post_init__(self):
+        assert(0 < self.institutions), "A Synthetic spec needs an institution"
+        assert(0 < self.types and 0 < self.instances), "A Synthetic spec needs types and instances"
+        assert(1 < self.events and 0 < self.fluents), "A Synthetic spec needs at least 2 events and a fluent"
+        assert(self.bridges < self.institutions), "Bridges link consecutive institutions"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass
+class SyntheticGenerator:
+    """
+    Builds the DSL text of a SyntheticSpec.
+
+    Each institution has `events` external events ex{i}, each generating its
+    institutional event in{i}. The remaining rules initiate and terminate
+    fluents fl{j}, and chain institutional events forward (in{i} -> in{j}, j > i),
+    some conditional on fluents. Every institutional event is initially
+    empowered and permitted.
+    """
+    spec : SyntheticSpec
+    _rng : random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.spec.seed)
+
+    def generate(self) -> dict[str, str]:
+        """ filename -> text, for every file of the specification """
+        spec   = self.spec
+        result = {}
+        for i in range(spec.institutions):
+            result[f"{spec.name}_inst_{i}{defaults.INST_EXT}"] = self.institution(i)
+
+        for i in range(spec.bridges):
+            result[f"{spec.name}_bridge_{i}{defaults.BRIDGE_EXT}"] = self.bridge(i)
+
+        result[f"{spec.name}{defaults.DOMAIN_EXT}"]    = self.domain()
+        result[f"{spec.name}{defaults.SITUATION_EXT}"] = self.situation()
+        result[f"{spec.name}{defaults.QUERY_EXT}"]     = self.query()
+        return result
+
+    def write(self, target:pl.Path) -> list[pl.Path]:
+        """ Write the specification's files into the directory target """
+        target.mkdir(parents=True, exist_ok=True)
+        written = []
+        for filename, text in self.generate().items():
+            (target / filename).write_text(text)
+            written.append(target / filename)
+
+        return written
+
+    def inst_name(self, i:int) -> str:
+        return f"{self.spec.name}Inst{i}"
+
+    def type_name(self, i:int) -> str:
+        return f"Type{i % self.spec.types}"
+
+    def instance(self, type_i:int, i:int) -> str:
+        return f"t{type_i % self.spec.types}v{i}"
+
+    def params(self, i:int) -> str:
+        """ The typed parameters of the i'th event or fluent """
+        if not bool(self.spec.arity):
+            return ""
+
+        types = [self.type_name(i + x) for x in range(self.spec.arity)]
+        return "({})".format(", ".join(types))
+
+    def ground_params(self, i:int, choice:int) -> str:
+        if not bool(self.spec.arity):
+            return ""
+
+        values = [self.instance(i + x, choice % self.spec.instances) for x in range(self.spec.arity)]
+        return "({})".format(", ".join(values))
+
+    def institution(self, inst:int) -> str:
+        spec  = self.spec
+        lines = []
+        lines.append(f"%% Synthetic institution {inst} of {spec}")
+        lines.append(f"institution {self.inst_name(inst)}.")
+        lines.append("")
+        lines += [f"type {self.type_name(x)}." for x in range(spec.types)]
+        lines.append("")
+        lines += [f"external event ex{x}{self.params(x)}." for x in range(spec.events)]
+        lines += [f"institutional event in{x}{self.params(x)}." for x in range(spec.events)]
+        lines.append("")
+        lines += [f"fluent fl{x}{self.params(x)}." for x in range(spec.fluents)]
+        lines.append("")
+
+        # Every external event generates its institutional event:
+        lines += [f"ex{x}{self.params(x)} generates in{x}{self.params(x)}." for x in range(spec.events)]
+        for _ in range(max(0, spec.rules - spec.events)):
+            lines.append(self.rule())
+
+        lines.append("")
+        lines += [f"initially pow(in{x}{self.params(x)}), perm(in{x}{self.params(x)}), perm(ex{x}{self.params(x)})." for x in range(spec.events)]
+        lines.append("")
+        return "\n".join(lines)
+
+    def rule(self) -> str:
+        spec    = self.spec
+        index   = self._rng.randrange(spec.events)
+        params  = self.params(index)
+        # Only events and fluents with the same parameter types are related
+        later   = [x for x in range(index + 1, spec.events) if self._aligned(index, x)]
+        fluents = [x for x in range(spec.fluents) if self._aligned(index, x)]
+        kinds   = (["generates"] if bool(later) else []) + (["initiates", "terminates"] if bool(fluents) else [])
+        if not bool(kinds):
+            return f"%% no rule with the types of in{index}"
+
+        match self._rng.choice(kinds):
+            case "generates":
+                target = self._rng.choice(later)
+                cond   = ""
+                if bool(fluents) and self._rng.random() < 0.5:
+                    fluent = self._rng.choice(fluents)
+                    cond   = f" if fl{fluent}{self.params(fluent)}"
+                return f"in{index}{params} generates in{target}{self.params(target)}{cond}."
+            case kind:
+                fluent = self._rng.choice(fluents)
+                return f"in{index}{params} {kind} fl{fluent}{self.params(fluent)}."
+
+    def _aligned(self, a:int, b:int) -> bool:
+        return (a % self.spec.types) == (b % self.spec.types)
+
+    def bridge(self, i:int) -> str:
+        spec  = self.spec
+        lines = []
+        lines.append(f"%% Synthetic bridge {i} of {spec}")
+        lines.append(f"bridge {spec.name}Bridge{i}.")
+        lines.append(f"source {self.inst_name(i)}.")
+        lines.append(f"sink {self.inst_name(i + 1)}.")
+        lines.append("")
+        lines += [f"type {self.type_name(x)}." for x in range(spec.types)]
+        lines.append("")
+        for x in range(spec.events):
+            lines.append(f"cross fluent gpow({self.inst_name(i)}, ex{x}{self.params(x)}, {self.inst_name(i + 1)}).")
+        lines.append("")
+        lines += [f"in{x}{self.params(x)} xgenerates ex{x}{self.params(x)}." for x in range(spec.events)]
+        lines.append("")
+        return "\n".join(lines)
+
+    def domain(self) -> str:
+        spec = self.spec
+        return "\n".join(f"{self.type_name(x)}: " + " ".join(self.instance(x, y) for y in range(spec.instances))
+                         for x in range(spec.types)) + "\n"
+
+    def situation(self) -> str:
+        spec  = self.spec
+        lines = []
+        for x in range(min(spec.fluents, spec.instances)):
+            lines.append(f"initially fl{x}{self.ground_params(x, x)} in {self.inst_name(0)}")
+
+        return "\n".join(lines) + "\n"
+
+    def query(self) -> str:
+        spec  = self.spec
+        events = [self._rng.randrange(spec.events) for _ in range(spec.horizon)]
+        lines  = [f"observed ex{event}{self.ground_params(event, step)}" for step, event in enumerate(events)]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,331 @@
+#/usr/bin/env python3
+"""
+Timing of each stage of instal, over synthetic specifications and the examples corpus.
+
+Each case is run `repeats` times, timing:
+parse -> validate -> compile -> ground -> solve -> trace -> report
+
+Results are a json document of environment metadata and, for each case,
+the min/median/mean of each stage, and the solver's statistics,
+so runs on different commits can be compared with `compare_results`.
+
+Cases which can't run record the stage they failed in and why, under 'error',
+and cases which solve to no models are flagged with a 'warning',
+as their later stages time an empty result.
+Most of the examples corpus doesn't parse or compile with the current parsers,
+so optional cases (ie: examples) which fail to are excluded from the results,
+and listed under 'excluded' instead.
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib as pl
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from importlib.resources import files
+from typing import Any, Final, Iterator
+
+import clingo
+import instal
+from instal import defaults
+from instal.benchmark.generator import SyntheticGenerator, SyntheticSpec
+from instal.util.compilation import load_parser
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+STAGES          : Final[tuple[str, ...]] = ("parse", "validate", "compile", "ground", "solve", "trace", "report")
+EXCLUDED_STAGES : Final[tuple[str, ...]] = ("parse", "compile")
+
+PRESETS : Final[dict[str, SyntheticSpec]] = {
+    "small"   : SyntheticSpec(name="small"),
+    "medium"  : SyntheticSpec(name="medium", institutions=2, bridges=1, types=3, instances=6,
+                                events=20, fluents=12, rules=60, arity=1, horizon=8),
+    "large"   : SyntheticSpec(name="large", institutions=3, bridges=2, types=4, instances=10,
+                                events=50, fluents=30, rules=200, arity=2, horizon=12),
+}
+
+# Example directories are parsed with the parser of their dsl version
+EXAMPLE_PARSERS : Final[dict[str, str]] = {
+    "v1a" : "instal.parser.v1a.parser.InstalPyParser",
+    "v1b" : "instal.parser.v1b.parser.InstalPyParser",
+    "v2"  : "instal.parser.v2.parser.InstalPyParser",
+}
+
+PARSE_FUNCS : Final[dict[str, str]] = {
+    defaults.INST_EXT      : "parse_institution",
+    defaults.BRIDGE_EXT    : "parse_bridge",
+    defaults.DOMAIN_EXT    : "parse_domain",
+    defaults.SITUATION_EXT : "parse_situation",
+}
+
+@dataclass
+class BenchmarkCase:
+    """ A set of files to parse, compile and solve as a single program.
+    Optional cases are excluded from results if they fail to parse or compile
+    """
+    name          : str
+    files         : list[pl.Path]
+    query         : None|pl.Path   = None
+    horizon       : int            = 4
+    parser_import : str            = field(default=defaults.PARSER)
+    spec          : None|dict      = None
+    optional      : bool           = False
+
+    @staticmethod
+    def from_spec(spec:SyntheticSpec, target:pl.Path, parser_import:str=defaults.PARSER) -> BenchmarkCase:
+        written = SyntheticGenerator(spec).write(target / spec.name)
+        queries = [x for x in written if x.suffix == defaults.QUERY_EXT]
+        return BenchmarkCase(f"synthetic/{spec.name}",
+                             [x for x in written if x.suffix in PARSE_FUNCS],
+                             query=queries[0],
+                             horizon=spec.horizon,
+                             parser_import=parser_import,
+                             spec=spec.to_dict())
+
+    @staticmethod
+    def from_directory(path:pl.Path, parser_import:str=defaults.PARSER, horizon:int=4) -> None|BenchmarkCase:
+        """ An example directory, using its first query file, if any """
+        targets = sorted(x for x in path.iterdir() if x.suffix in PARSE_FUNCS)
+        queries = sorted(x for x in path.iterdir() if x.suffix == defaults.QUERY_EXT)
+        if not any(x.suffix == defaults.INST_EXT for x in targets):
+            return None
+
+        return BenchmarkCase(f"examples/{path.parent.name}/{path.name}",
+                             targets,
+                             query=queries[0] if bool(queries) else None,
+                             horizon=horizon,
+                             parser_import=parser_import,
+                             optional=True)
+
+def example_cases(root:pl.Path, horizon:int=4) -> list[BenchmarkCase]:
+    """
+    Every directory of institutions in the examples corpus,
+    for dsl versions with a parser
+    """
+    cases = []
+    for version, parser_import in EXAMPLE_PARSERS.items():
+        if not (root / version).is_dir():
+            continue
+
+        for path in sorted(x for x in (root / version).iterdir() if x.is_dir()):
+            match BenchmarkCase.from_directory(path, parser_import, horizon=horizon):
+                case None:
+                    pass
+                case case:
+                    cases.append(case)
+
+    return cases
+
+def environment() -> dict[str, Any]:
+    """ What the results were measured with """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"],
+                                capture_output=True, text=True, check=True,
+                                cwd=pl.Path(instal.__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit"         : commit,
+        "timestamp"      : time.time(),
+        "version"        : instal.__version__,
+        "clingo_version" : clingo.__version__,
+        "python"         : platform.python_version(),
+        "platform"       : platform.platform(),
+    }
+
+class StageFailed(Exception):
+    """ A case couldn't complete a stage """
+
+    def __init__(self, stage:str, err:Exception):
+        super().__init__(stage, err)
+        self.stage = stage
+        self.err   = err
+
+    def __str__(self):
+        return f"{self.stage}: {self.err.__class__.__name__}: {self.err}"
+
+def summarise(times:list[float]) -> dict[str, float]:
+    return {
+        "min"    : min(times),
+        "median" : statistics.median(times),
+        "mean"   : statistics.fmean(times),
+        "runs"   : len(times),
+    }
+
+@dataclass
+class BenchmarkRunner:
+    """
+    Runs cases, returning a results dict for `write_results`.
+
+    Usage:
+        runner  = BenchmarkRunner(repeats=3)
+        results = runner.run([BenchmarkCase.from_spec(PRESETS['small'], tmp_dir)])
+    """
+    repeats  : int  = 3
+    validate : bool = True
+
+    def run(self, cases:list[BenchmarkCase]) -> dict[str, Any]:
+        results = {"environment" : environment(), "cases" : {}, "excluded" : {}}
+        for case in cases:
+            logging.info("Benchmarking: %s", case.name)
+            result = self.run_case(case)
+            if case.optional and result.get('failed_stage', None) in EXCLUDED_STAGES:
+                results['excluded'][case.name] = result['error']
+            else:
+                results['cases'][case.name] = result
+
+        return results
+
+    def run_case(self, case:BenchmarkCase) -> dict[str, Any]:
+        """
+        Time each stage over the repeats.
+        Failures are recorded with their stage, not raised,
+        and the partial timings of a failed case are discarded
+        """
+        times  : dict[str, list[float]] = {x : [] for x in STAGES}
+        result : dict[str, Any]         = {"files" : [str(x) for x in case.files], "spec" : case.spec}
+        try:
+            for _ in range(self.repeats):
+                result.update(self._run_once(case, times))
+        except StageFailed as err:
+            logging.warning("Benchmark Case Failed: %s : %s", case.name, err)
+            result['error']        = str(err)
+            result['failed_stage'] = err.stage
+            times                  = {}
+
+        if result.get('models', None) == 0:
+            result['warning'] = "no models"
+
+        result['stages'] = {stage : summarise(x) for stage, x in times.items() if bool(x)}
+        return result
+
+    @contextmanager
+    def _stage(self, stage:str, times:None|dict[str, list[float]]=None) -> Iterator[None]:
+        """
+        Wrap any error of a stage with the stage's name,
+        and time it, unless times is None (ie: the solver times it)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as err:
+            raise StageFailed(stage, err) from err
+
+        if times is not None:
+            times[stage].append(time.perf_counter() - start)
+
+    def _run_once(self, case:BenchmarkCase, times:dict[str, list[float]]) -> dict[str, Any]:
+        # Imported here, as these import the parsers' grammars
+        from instal.interfaces.validate import InstalValidatorRunner
+        from instal.solve.clingo_solver import ClingoSolver
+        from instal.util.batch import traces_from_solver
+
+        parser = load_parser(case.parser_import)
+
+        with self._stage("parse", times):
+            asts   = [(path, getattr(parser, PARSE_FUNCS[path.suffix])(path)) for path in case.files]
+            query  = parser.parse_query(case.query) if case.query is not None else []
+
+        if self.validate:
+            runner = InstalValidatorRunner(self._validators())
+            with self._stage("validate", times):
+                for _, ast in asts:
+                    try:
+                        runner.validate(ast)
+                    except Exception as err:
+                        # Validation errors are part of the workload, not a failure of it
+                        logging.debug("Validation Errors: %s", err)
+
+        with self._stage("compile", times):
+            compiled = [self._compiler(path).compile(ast) for path, ast in asts]
+
+        prelude  = files(defaults.STANDARD_PRELUDE_loc)
+        with self._stage("ground"):
+            solver   = ClingoSolver("\n".join(compiled),
+                                    input_files=sorted(x for x in prelude.iterdir() if x.suffix == defaults.COMPILED_EXT),
+                                    options=['-n', '1', '-c', f'horizon={case.horizon}'])
+        times['ground'].append(solver.timings['ground'])
+
+        with self._stage("solve"):
+            count    = solver.solve(query)
+            if solver.ctl is None:
+                raise RuntimeError("Clingo failed to solve")
+        times['solve'].append(solver.timings['solve'])
+
+        with self._stage("trace", times):
+            traces   = traces_from_solver(solver, case.horizon, case.files)
+
+        with self._stage("report", times):
+            for trace in traces:
+                str(trace)
+                trace.to_json_str()
+
+        return {"models"        : count,
+                "compiled_size" : sum(len(x) for x in compiled),
+                "statistics"    : solver.statistics}
+
+    def _compiler(self, path:pl.Path):
+        from instal.compiler.bridge_compiler import InstalBridgeCompiler
+        from instal.compiler.domain_compiler import InstalDomainCompiler
+        from instal.compiler.institution_compiler import InstalInstitutionCompiler
+        from instal.compiler.situation_compiler import InstalSituationCompiler
+        match path.suffix:
+            case defaults.INST_EXT:
+                return InstalInstitutionCompiler()
+            case defaults.BRIDGE_EXT:
+                return InstalBridgeCompiler()
+            case defaults.DOMAIN_EXT:
+                return InstalDomainCompiler()
+            case defaults.SITUATION_EXT:
+                return InstalSituationCompiler()
+
+    def _validators(self) -> list:
+        from instal.validate.declaration_type_validator import DeclarationTypeValidator
+        from instal.validate.event_validator import EventValidator
+        from instal.validate.fluent_validator import FluentValidator
+        from instal.validate.institution_structure_validator import InstitutionStructureValidator
+        from instal.validate.name_duplication_validator import NameDuplicationValidator
+        from instal.validate.rule_validator import RuleValidator
+        return [DeclarationTypeValidator(), EventValidator(), FluentValidator(),
+                InstitutionStructureValidator(), NameDuplicationValidator(), RuleValidator()]
+
+def write_results(results:dict, path:pl.Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=4, sort_keys=True, default=str))
+
+def compare_results(baseline:dict, current:dict, stat:str="median") -> list[str]:
+    """
+    A table of each case and stage's time in the baseline and current results,
+    and current / baseline
+    """
+    lines = [f"{'Case':<40} {'Stage':<9} {'Baseline':>10} {'Current':>10} {'Ratio':>7}"]
+    for name, case in current['cases'].items():
+        base_case = baseline['cases'].get(name, None)
+        if base_case is None:
+            lines.append(f"{name:<40} (not in baseline)")
+            continue
+        if 'error' in case or 'error' in base_case:
+            lines.append(f"{name:<40} (failed: {case.get('error', None) or base_case['error']})")
+            continue
+
+        for stage in STAGES:
+            if stage not in case.get('stages', {}) or stage not in base_case.get('stages', {}):
+                continue
+
+            old   = base_case['stages'][stage][stat]
+            new   = case['stages'][stage][stat]
+            ratio = (new / old) if old else float("inf")
+            lines.append(f"{name:<40} {stage:<9} {old:>10.5f} {new:>10.5f} {ratio:>7.2f}")
+
+    return lines
@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+"""
+CLI program to benchmark each stage of instal,
+from parsing to trace reporting.
+
+Runs synthetic specifications of preset sizes,
+and optionally the examples corpus, writing results as json.
+With --compare, prints each stage's time against a previous results file.
+"""
+##-- imports
+from __future__ import annotations
+
+import argparse
+import json
+import logging as logmod
+import pathlib
+import tempfile
+from sys import stdout
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+##-- argparse
+argparser = argparse.ArgumentParser()
+argparser.add_argument('-s', '--size',     action="append", help="synthetic preset sizes to run (small, medium, large). Defaults to all")
+argparser.add_argument('-e', '--examples', help="an examples directory, of v1a/v1b/v2 subdirectories, to include as a baseline. Examples which fail to parse or compile are excluded")
+argparser.add_argument('-r', '--repeats',  type=int, default=3, help="runs of each case (default 3)")
+argparser.add_argument('-o', '--output',   type=str, default="instal_benchmark.json", help="where to write results (default instal_benchmark.json)")
+argparser.add_argument('-c', '--compare',  help="a previous results file to compare against")
+argparser.add_argument('-k', '--keep',     help="a directory to write the synthetic specifications into, instead of a temporary one")
+argparser.add_argument('-p', '--parser',   help="the parser import string for synthetic cases (default defaults.PARSER)")
+argparser.add_argument('--no-synthetic',   action="store_true", help="only run the examples")
+argparser.add_argument('--no-validate',    action="store_true", help="skip the validation stage")
+argparser.add_argument("-v", "--verbose",  action='count', help="increase verbosity of logging (repeatable)")
+##-- end argparse
+
+def main():
+    ##-- logging
+    LOG_FORMAT    = "%(levelname)8s | %(name)8s | %(message)s"
+    STREAM_TARGET = stdout
+
+    logging = logmod.root
+    console_handler = logmod.StreamHandler(STREAM_TARGET)
+    console_handler.setFormatter(logmod.Formatter(LOG_FORMAT))
+    logging.addHandler(console_handler)
+    ##-- end logging
+
+    args = argparser.parse_args()
+    # Quiet by default: failed validator visits are logged with tracebacks,
+    # which would otherwise dominate validation timings
+    logging.setLevel(max(logmod.NOTSET, logmod.CRITICAL - (10 * (args.verbose or 0))))
+
+    from instal import defaults
+    from instal.benchmark.runner import (PRESETS, BenchmarkCase, BenchmarkRunner,
+                                         compare_results, example_cases,
+                                         write_results)
+
+    sizes = args.size or list(PRESETS.keys())
+    if unknown := [x for x in sizes if x not in PRESETS]:
+        argparser.error(f"Unknown sizes: {unknown}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_dir = pathlib.Path(args.keep or tmp).expanduser().resolve()
+        cases    = []
+        if not args.no_synthetic:
+            parser_import = args.parser or defaults.PARSER
+            cases += [BenchmarkCase.from_spec(PRESETS[x], spec_dir, parser_import=parser_import) for x in sizes]
+        if args.examples:
+            cases += example_cases(pathlib.Path(args.examples).expanduser().resolve())
+
+        runner  = BenchmarkRunner(repeats=args.repeats, validate=not args.no_validate)
+        results = runner.run(cases)
+
+    output = pathlib.Path(args.output).expanduser().resolve()
+    write_results(results, output)
+    print(f"Benchmark Results written to: {output}")
+
+    for name, case in results['cases'].items():
+        if 'error' in case:
+            print(f"{name:<40} (failed) {case['error']}")
+            continue
+
+        timings = " ".join(f"{stage}={x['median']:.4f}" for stage, x in case['stages'].items())
+        print(f"{name:<40} {timings} {case.get('warning', '')}")
+
+    if bool(results['excluded']):
+        print(f"Excluded {len(results['excluded'])} example cases which failed to parse or compile, listed in the results")
+
+    if args.compare:
+        baseline = json.loads(pathlib.Path(args.compare).expanduser().read_text())
+        print("")
+        print("\n".join(compare_results(baseline, results)))
+
+##-- ifmain
+if __name__ == "__main__":
+    main()
+
+##-- end ifmain
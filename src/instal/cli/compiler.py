@@ -41,6 +41,9 @@ argparser.add_argument("-v", "--verbose", action='count', help="increase verbosi
 argparser.add_argument('-d', '--debug', action="store_true")
 argparser.add_argument('-c', '--check', action="store_true")
 argparser.add_argument('-p', '--parser', default=defaults.PARSER, help="The import path for the parser class")
+argparser.add_argument('-i', '--incremental', action="store_true", help="compile to base/step(t) programs for incremental solving")
+argparser.add_argument('-w', '--workers', type=int, default=None, help="parse and compile over a pool of <n> processes")
+argparser.add_argument('--no-cache', action="store_true", help="don't use or update the compile and ast caches")
 argparser.add_argument('--noprint', action="store_true")
 argparser.add_argument('--defs')
 ##-- end argparse
@@ -84,8 +87,11 @@ def main():
     else:
         targets = list(args.target.iterdir())
 
+    from instal.util.cache import ASTCache, CompileCache
     from instal.util.compilation import compile_target
-    result = compile_target(targets, args.debug, with_prelude=True, check=args.check, parser_import=args.parser)
+    cache     = None if args.no_cache else CompileCache()
+    ast_cache = None if args.no_cache else ASTCache()
+    result    = compile_target(targets, args.debug, with_prelude=True, check=args.check, parser_import=args.parser, incremental=args.incremental, cache=cache, ast_cache=ast_cache, workers=args.workers)
 
     if args.output:
         logging.info("Writing to Output: %s", args.output)
@@ -18,6 +18,7 @@ from sys import stderr, stdout
 from instal.report.gantt import InstalGanttReporter
 from instal.report.pdf import InstalPDFReporter
 from instal.report.text import InstalTextReporter
+from instal.trace.jsonl import JSONL_EXT, load_trace, stream_filter, write_jsonl
 from instal.trace.trace import InstalTrace
 
 ##-- end imports
@@ -28,7 +29,7 @@ logging = logmod.getLogger(__name__)
 
 ##-- argparse
 parser = argparse.ArgumentParser()
-parser.add_argument('-t', '--target',    help="Specify json file trace to load", required=True)
+parser.add_argument('-t', '--target',    help="Specify json or json lines file trace to load", required=True)
 parser.add_argument("-o", "--output",    type=str, help="output dir location, defaults to {cwd}/instal_tmp")
 parser.add_argument('-i', '--interactive', action="store_true")
 parser.add_argument('-b', '--blacklist', action='append', help="regular expressions to reject terms by")
@@ -75,11 +76,21 @@ def main():
 
     trace_path = pathlib.Path(args.target).expanduser().resolve()
     assert(trace_path.exists())
-    assert(trace_path.suffix == ".json"), "You must specify a json trace to load"
+    assert(trace_path.suffix in (".json", JSONL_EXT)), "You must specify a json or json lines trace to load"
 
 
+    if not args.interactive and args.output and trace_path.suffix == JSONL_EXT and pathlib.Path(args.output).suffix == JSONL_EXT:
+        # Filter without loading the whole trace
+        logging.info("Streaming Trace: %s", trace_path)
+        count = stream_filter(trace_path, pathlib.Path(args.output),
+                              args.whitelist or [], args.blacklist or [],
+                              start=args.start, end=args.end)
+        print(f"Filtered {count} States to: {args.output}")
+        return
+
     logging.info("Loading Trace: %s", trace_path)
-    trace = InstalTrace.from_json(json.loads(trace_path.read_text()))
+    # Only json lines traces can skip states while loading
+    trace = load_trace(trace_path, start=None if args.interactive else args.start, end=None if args.interactive else args.end)
 
     if args.interactive:
         from instal.util.filter import filter_loop
@@ -93,9 +104,12 @@ def main():
     print(repr(filtered))
 
     if args.output:
-        out_path      = pathlib.Path(args.output)
-        as_json : str = filtered.to_json_str(out_path.name)
+        out_path = pathlib.Path(args.output)
+        if out_path.suffix == JSONL_EXT:
+            write_jsonl(filtered, out_path, out_path.name)
+            return
 
+        trace_s : str = filtered.to_json_str(out_path.name)
         with open(out_path, 'w') as f:
             f.write(trace_s)
 
@@ -7,12 +7,17 @@ If you point it to a compiled logic program, it will run that without parsing it
 Can Supplement the logic program with initial situational facts, and a query.
 
 Prints result traces to the output directory, as strings, or json.
+
+With --batch, compiles the targets once, then runs every query file in a directory
+over a pool of worker processes, writing traces to {output}/{query name}/.
 """
 ##-- imports
 from __future__ import annotations
 
 import argparse
+import atexit
 import logging as logmod
+import os
 import pathlib
 from importlib.resources import files
 from io import StringIO
@@ -22,7 +27,9 @@ from json import dumps
 
 from clingo import Control, Function, Symbol, parse_term
 from instal.solve.clingo_solver import ClingoSolver
+from instal.solve.clingo_incremental_solver import ClingoIncrementalSolver
 from instal.trace.trace import InstalTrace
+from instal.util import spans
 ##-- end imports
 
 ##-- logging
@@ -41,6 +48,7 @@ argparser.add_argument('-q', '--query',       help="Specify a string or file to
 
 argparser.add_argument("-o", "--output",      type=str, help="output dir location, defaults to {cwd}/instal_tmp")
 argparser.add_argument("-j", "--json",        action='store_true', help="toggle json output")
+argparser.add_argument("--jsonl",             action='store_true', help="toggle json lines output, written a state at a time")
 
 argparser.add_argument("-v", "--verbose",     action='count', help="increase verbosity of logging (repeatable)")
 argparser.add_argument('--logfilter',         action="append", default=[])
@@ -48,6 +56,13 @@ argparser.add_argument('-a', '--answer-set',  type=int, default=0, help='choose
 argparser.add_argument('-n', '--number',      type=int, default=1, help='compute at most <n> models (default 1, 0 for all)')
 argparser.add_argument('-l', '--length',      type=int, default=3, help='length of model trace (default 3)')
 argparser.add_argument('-d', '--debug',       action="store_true", help="activate debug parser functions")
+argparser.add_argument('-i', '--incremental', action="store_true", help="ground the trace one timestep at a time, instead of the full length up front")
+argparser.add_argument('-b', '--batch',       help="a directory of query files to run against the targets, instead of a single query")
+argparser.add_argument('-w', '--workers',     type=int, default=None, help="number of worker processes for compilation, and --batch (default cpu count)")
+argparser.add_argument('--stream',            action="store_true", help="write each trace as its model is found, instead of storing all models. Streamed traces have no solve statistics or timings")
+argparser.add_argument('--profile',           action="store_true", help="report the ground rules each instal declaration produced (slows grounding)")
+argparser.add_argument('--spans',             choices=spans.SINK_FORMATS, help="record timing spans of each stage: logged, or written to {output}/spans.jsonl|json")
+argparser.add_argument('--no-cache',          action="store_true", help="don't use or update the compile cache")
 ##-- end argparse
 
 def main():
@@ -74,58 +89,99 @@ def main():
     args         = argparser.parse_args()
 
     # Set Logging level
-    console_handler.setLevel(max(logmod.NOTSET, logmod.WARNING - (10 * self.verbose)))
+    console_handler.setLevel(max(logmod.NOTSET, logmod.WARNING - (10 * (args.verbose or 0))))
 
+    # Resolved here, as compile_target defaults to compiling serially
+    args.workers = args.workers or os.cpu_count()
     args.output = pathlib.Path(args.output if args.output else "instal_tmp").expanduser().resolve()
+    args.output.mkdir(parents=True, exist_ok=True)
 
     for name in args.logfilter:
         console_handler.addFilter(logmod.Filter(name))
 
+    if args.spans:
+        spans.set_sink(spans.build_sink(args.spans, args.output))
+        # Written on any exit
+        atexit.register(spans.set_sink, None)
+
     logging.info("Starting Compile -> Query")
+    from instal import defaults
+    from instal.util.batch import iter_traces, run_batch, traces_from_solver, write_traces
+    from instal.util.cache import CompileCache
     from instal.util.compilation import compile_target
     from instal.util.misc import maybe_get_query_and_situation
-    from instal.defaults import STANDARD_PRELUDE_loc
-    inst_prelude    = files(STANDARD_PRELUDE_loc)
-    compiled         = compile_target(file_group.get_sources(), args.debug)
-    prelude_files    = list(inst_prelude.iterdir())
+    inst_prelude     = files(defaults.STANDARD_PRELUDE_INCREMENTAL_loc if args.incremental else defaults.STANDARD_PRELUDE_loc)
+    targets          = [pathlib.Path(x).expanduser().resolve() for x in args.target]
+    targets          = [y for x in targets for y in ([x] if x.is_file() else sorted(x.iterdir()))]
+    sources          = [x for x in targets if x.suffix != defaults.COMPILED_EXT]
+    compiled_files   = [x for x in targets if x.suffix == defaults.COMPILED_EXT]
+    cache            = None if args.no_cache else CompileCache()
+    with spans.span("compile_target", targets=len(sources)):
+        compiled     = compile_target(sources, args.debug, incremental=args.incremental, cache=cache, workers=args.workers)
+    prelude_files    = [x for x in inst_prelude.iterdir() if x.suffix == defaults.COMPILED_EXT]
+
+    if args.incremental:
+        solver_cls    = ClingoIncrementalSolver
+        options       = ['-n', str(args.number)]
+        solver_kwargs = {"horizon" : args.length}
+    else:
+        solver_cls    = ClingoSolver
+        options       = ['-n', str(args.number), '-c', f'horizon={args.length}']
+        solver_kwargs = {}
+
+    if args.batch:
+        batch_dir = pathlib.Path(args.batch).expanduser().resolve()
+        queries   = sorted(batch_dir.glob(f"*{defaults.QUERY_EXT}"))
+        results   = run_batch(queries, "\n".join(compiled),
+                              output=args.output,
+                              steps=args.length,
+                              input_files=prelude_files + compiled_files,
+                              options=options,
+                              solver_cls=solver_cls,
+                              solver_kwargs=solver_kwargs,
+                              workers=args.workers,
+                              as_json=args.json,
+                              as_jsonl=args.jsonl,
+                              sources=sources,
+                              stream=args.stream)
+        failed = [x for x,y in results.items() if y is None]
+        print(f"Batch Results: {len(results) - len(failed)} / {len(results)} queries succeeded")
+        for query in failed:
+            print(f"Failed: {query}")
+        return
+
     query, situation = maybe_get_query_and_situation(args.query, args.situation)
+    solver           = solver_cls("\n".join(compiled),
+                                  input_files=prelude_files + compiled_files,
+                                  options=options,
+                                  profile=args.profile,
+                                  **solver_kwargs)
+
+    if args.stream:
+        written = write_traces(iter_traces(solver, query, args.length, sources), args.output, as_json=args.json, as_jsonl=args.jsonl)
+        print(f"Wrote {len(written)} traces to {args.output}")
+        return
 
-    solver           = ClingoSolver("\n".join(compiled),
-                                    input_files=prelude_files + file_group.get_compiled(),
-                                    options=['-n', str(args.number),
-                                             '-c', f'horizon={args.length}'])
     num_models       = solver.solve(query)
 
+    if args.profile and solver.profiler is not None:
+        print("Grounding Profile:")
+        print(solver.grounding_report())
+        print("")
+
     if num_models == 0:
         logging.info("Found No Models")
         exit()
 
     print("Program Results:")
-    traces = []
     for i, result in enumerate(solver.results):
         print(f"Result {i}:")
         print(" ".join(str(x) for x in result.shown))
         print("")
-        # Convert to a Trace of States.
-        trace = InstalTrace.from_model(result,
-                                       steps=args.length,
-                                       metadata=solver.metadata.copy(),
-                                       sources=file_group.get_sources())
-        traces.append(trace)
-
-    ext : str = ".json" if args.json else ".txt"
-    logging.info("Writing Traces to %s/trace_[num]%s", args.output, ext)
-    for i, trace in enumerate(traces):
-        trace_s : str = ""
-        current_filename = f"trace_{i}{ext}"
-        match args.json:
-            case False:
-                trace_s = repr(trace)
-            case True:
-                trace_s = trace.to_json_str(current_filename)
-
-        with open(args.output / current_filename, 'w') as f:
-            f.write(trace_s)
+
+    # Convert to Traces of States.
+    traces = traces_from_solver(solver, args.length, sources)
+    write_traces(traces, args.output, as_json=args.json, as_jsonl=args.jsonl)
 
 ##-- ifmain
 if __name__ == "__main__":
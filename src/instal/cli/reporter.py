@@ -16,6 +16,7 @@ from sys import stderr, stdout
 from instal.report.gantt import InstalGanttReporter
 from instal.report.pdf import InstalPDFReporter
 from instal.report.text import InstalTextReporter
+from instal.trace.jsonl import JSONL_EXT, load_trace
 from instal.trace.trace import InstalTrace
 
 ##-- end imports
@@ -60,13 +61,13 @@ def main():
     trace_path = pathlib.Path(args.target).expanduser().resolve()
     output     = pathlib.Path(args.output if args.output else "instal_tmp").expanduser().resolve(),
     assert(trace_path.exists())
-    assert(trace_path.suffix == ".json")
+    assert(trace_path.suffix in (".json", JSONL_EXT))
 
     # Set Logging level
     console_handler.setLevel(max(logmod.NOTSET, logmod.WARNING - (10 * self.verbose)))
 
     logging.info("Loading Trace: %s", trace_path)
-    trace = InstalTrace.from_json(json.loads(trace_path.read_text()))
+    trace = load_trace(trace_path)
 
     if args.gantt:
         logging.info("Building Gantt Report")
@@ -272,3 +272,27 @@ class TestCompilerUtils:
 
 
 
+
+    def test_compile_term_memoised(self):
+        CompileUtil.cache_clear()
+        term   = ASTs.TermAST("permitted", [ASTs.TermAST("anAction", [ASTs.TermAST("X")])])
+        first  = CompileUtil.compile_term(term)
+        second = CompileUtil.compile_term(ASTs.TermAST("permitted", [ASTs.TermAST("anAction", [ASTs.TermAST("X")])]))
+        assert(first == second == "deontic(permitted, anAction(X))")
+        info = CompileUtil.cache_info()
+        assert(info.misses == 1)
+        assert(info.hits == 1)
+
+    def test_compile_terms(self):
+        terms  = [ASTs.TermAST("test", [ASTs.TermAST("first")]),
+                  ASTs.TermAST("test", [ASTs.TermAST("first")]),
+                  ASTs.TermAST("initPower", [ASTs.TermAST("a"), ASTs.TermAST("b"), ASTs.TermAST("c")])]
+        result = CompileUtil.compile_terms(terms)
+        assert(len(result) == 2)
+        assert(result[terms[0]] == "test(first)")
+        assert(result[terms[2]] == "deontic(initPower, ev(a, b, c))")
+
+    def test_compile_ast_terms(self):
+        inst   = InstalPyParser().parse_institution("institution simple;\n exogenous event anEvent(Person);\n inst event instEvent;\n fluent aFluent;\n anEvent(Person) generates instEvent if aFluent;")[0]
+        result = CompileUtil.compile_ast_terms(inst)
+        assert(set(result.values()) >= {"simple", "anEvent(Person)", "instEvent", "aFluent"})
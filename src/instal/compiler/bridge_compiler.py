@@ -46,6 +46,8 @@ class InstalBridgeCompiler(InstalInstitutionCompiler, InstalCompiler_i):
     def compile(self, iabs: list[IAST.BridgeDefAST]) -> str:
         logging.debug("Compiling %s Bridges", len(iabs))
         self.clear()
+        # Compile each distinct term once, up front
+        CompileUtil.compile_ast_terms(*iabs)
         for iab in iabs:
             self.compile_bridge(iab)
 
@@ -65,7 +67,9 @@ class InstalBridgeCompiler(InstalInstitutionCompiler, InstalCompiler_i):
         self.compile_fluents(iab)
 
         self.insert(HEADER, header='Part 2: Generation and Consequence', sub="")
+        self.insert_step_program()
         self.compile_rules(iab)
+        self.insert_base_program()
 
         self.insert(HEADER, header='Part 3: Initial Situation Specification', sub="")
         situation          = InstalSituationCompiler()
@@ -113,11 +117,14 @@ class InstalBridgeCompiler(InstalInstitutionCompiler, InstalCompiler_i):
                                                  rule.head,
                                                  *rule.body)
 
-            rhs = ", ".join(sorted(conditions | type_guards))
+            rhs = ", ".join(sorted(conditions | type_guards | self.time_guards()))
 
             match rule.annotation:
                 case IAST.RuleEnum.xgenerates:
-                    delay = "+{rule.delay}" if rule.delay > 0 else ""
+                    delay = f"+{rule.delay}" if rule.delay > 0 else ""
+                    # The rule's only head is delayed, see InstalInstitutionCompiler.time_guards
+                    rhs   = ", ".join(sorted(conditions | type_guards | self.time_guards(rule.delay)))
+                    self.insert_source(rule)
                     self.insert(X_GEN_PAT,
                                 event=CompileUtil.compile_term(rule.head),
                                 response=CompileUtil.compile_term(rule.body[0]),
@@ -127,6 +134,7 @@ class InstalBridgeCompiler(InstalInstitutionCompiler, InstalCompiler_i):
                                 delay=delay,
                                 rhs=rhs)
                 case IAST.RuleEnum.xinitiates:
+                    self.insert_source(rule)
                     self.insert(X_INIT_PAT,
                                 source=source,
                                 sink=sink,
@@ -136,6 +144,7 @@ class InstalBridgeCompiler(InstalInstitutionCompiler, InstalCompiler_i):
                                 rhs=rhs
                                 )
                 case IAST.RuleEnum.xterminates:
+                    self.insert_source(rule)
                     self.insert(X_TERM_PAT,
                                 source=source,
                                 sink=sink,
@@ -164,6 +173,7 @@ class InstalBridgeCompiler(InstalInstitutionCompiler, InstalCompiler_i):
         for fluent in fluents or iab.fluents:
             rhs : str = ", ".join(sorted(CompileUtil.wrap_types(iab.types, fluent.head)))
 
+            self.insert_source(fluent)
             match fluent.annotation:
                 case IAST.FluentEnum.cross if fluent.head.value == "gpow":
                     assert(len(fluent.head.params) == 3)
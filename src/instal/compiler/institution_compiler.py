@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from string import Template
 import logging as logmod
+from dataclasses import dataclass, field
 from importlib.resources import files
 
 from instal.errors import InstalCompileError
@@ -11,7 +12,7 @@ from instal.interfaces import ast as IAST
 from instal.compiler.util import CompileUtil
 from instal.compiler.situation_compiler import InstalSituationCompiler
 from instal.compiler.domain_compiler import InstalDomainCompiler
-from instal.defaults import COMP_DATA_loc, STANDARD_PRELUDE_loc
+from instal.defaults import COMP_DATA_loc, STANDARD_PRELUDE_loc, STANDARD_PRELUDE_INCREMENTAL_loc
 
 ##-- end imports
 
@@ -22,7 +23,13 @@ try:
 except ModuleNotFoundError:
     inst_prelude = data_path / STANDARD_PRELUDE_loc
 
+try:
+    inc_prelude = files(STANDARD_PRELUDE_INCREMENTAL_loc)
+except ModuleNotFoundError:
+    inc_prelude = data_path / STANDARD_PRELUDE_INCREMENTAL_loc
+
 HEADER             = Template((data_path / "header_pattern").read_text())
+PROGRAM_PAT        = Template((data_path / "program_pattern.lp").read_text())
 INST_PRELUDE       = Template((data_path / "institution_prelude.lp").read_text())
 BRIDGE_PRELUDE     = Template((data_path / "bridge_prelude.lp").read_text())
 
@@ -36,6 +43,7 @@ EVENT_PATTERN      = Template((data_path / "event_pattern.lp").read_text())
 INERTIAL_FLUENT    = Template((data_path / "inertial_fluent_pattern.lp").read_text())
 TRANSIENT_FLUENT   = Template((data_path / "transient_fluent_pattern.lp").read_text())
 OB_FLUENT          = Template((data_path / "obligation_fluent_pattern.lp").read_text())
+OB_SYNC            = Template((data_path / "obligation_sync_pattern.lp").read_text())
 
 GEN_PAT            = Template((data_path / "generate_rule_pattern.lp").read_text())
 INIT_PAT           = Template((data_path / "initiate_rule_pattern.lp").read_text())
@@ -49,18 +57,28 @@ TRANSIENT_RULE_PAT = Template((data_path / "transient_rule_pattern.lp").read_tex
 logging = logmod.getLogger(__name__)
 ##-- end logging
 
+@dataclass
 class InstalInstitutionCompiler(InstalCompiler_i):
     """
+    incremental=True splits the compiled institution into
+    the multi-shot programs of the incremental prelude:
+    static definitions in `base`,
+    and time dependent rules in `step(t)`, guarded to only ground at instant t.
+    Rules with a delay are guarded to instant t-delay instead,
+    so their delayed heads are at instant t, and only step(t) derives atoms of instant t.
     """
 
+    incremental : bool = field(default=False, kw_only=True)
+
     def load_prelude(self) -> str:
-        text = []
-        if inst_prelude.is_dir():
-            for path in sorted(x for x in inst_prelude.iterdir() if x.suffix == ".lp"):
+        text    = []
+        prelude = inc_prelude if self.incremental else inst_prelude
+        if prelude.is_dir():
+            for path in sorted(x for x in prelude.iterdir() if x.suffix == ".lp"):
                 text += path.read_text().split("\n")
         else:
-            assert(inst_prelude.is_file())
-            text.append(inst_prelude.read_text())
+            assert(prelude.is_file())
+            text.append(prelude.read_text())
 
         text.append("%% End of Prelude")
 
@@ -69,6 +87,8 @@ class InstalInstitutionCompiler(InstalCompiler_i):
     def compile(self, ials: list[IAST.InstitutionDefAST]) -> str:
         logging.debug("Compiling %s Institutions", len(ials))
         self.clear()
+        # Compile each distinct term once, up front
+        CompileUtil.compile_ast_terms(*ials)
         for ial in ials:
             self.compile_inst(ial)
 
@@ -87,7 +107,9 @@ class InstalInstitutionCompiler(InstalCompiler_i):
         self.compile_fluents(ial)
 
         self.insert(HEADER, header='Part 2: Generation and Consequence', sub="")
+        self.insert_step_program()
         self.compile_rules(ial)
+        self.insert_base_program()
 
         self.insert(HEADER, header='Part 3: Initial Situation Specification', sub="")
         situation          = InstalSituationCompiler()
@@ -131,6 +153,7 @@ class InstalInstitutionCompiler(InstalCompiler_i):
                     raise TypeError("Unknown Event Type: %s", event)
 
             assert(etype is not None)
+            self.insert_source(event)
             self.insert(EVENT_PATTERN,
                         event=CompileUtil.compile_term(event.head),
                         inst=CompileUtil.compile_term(inst.head),
@@ -143,7 +166,7 @@ class InstalInstitutionCompiler(InstalCompiler_i):
         inst_head : str = CompileUtil.compile_term(inst.head)
         for fluent in fluents or inst.fluents:
             rhs : str = ", ".join(sorted(CompileUtil.wrap_types(inst.types, fluent.head)))
-
+            self.insert_source(fluent)
             match fluent.annotation:
                 case IAST.FluentEnum.inertial:
                     self.insert(INERTIAL_FLUENT,
@@ -172,6 +195,12 @@ class InstalInstitutionCompiler(InstalCompiler_i):
                                 obType=obl_type,
                                 inst=inst_head,
                                 rhs=rhs)
+                    self.insert_step_program()
+                    self.insert(OB_SYNC,
+                                name=obl_name,
+                                inst=inst_head,
+                                guard="".join(f", {x}" for x in self.time_guards()))
+                    self.insert_base_program()
                 case IAST.FluentEnum.cross if fluent.head.value == "genPow":
                     assert(len(fluent.head.params) == 3)
                     self.insert(GPOW_FLUENT,
@@ -205,11 +234,12 @@ class InstalInstitutionCompiler(InstalCompiler_i):
                                                  rule.head,
                                                  *rule.body)
 
-            rhs = ", ".join(sorted(conditions | type_guards))
+            rhs = ", ".join(sorted(conditions | type_guards | self.time_guards()))
             match rule.annotation:
                 case IAST.RuleEnum.generates:
                     assert(not isinstance(inst, IAST.BridgeDefAST))
-                    self._compile_generation(rule, rhs, inst_head)
+                    delayed_rhs = ", ".join(sorted(conditions | type_guards | self.time_guards(rule.delay)))
+                    self._compile_generation(rule, rhs, inst_head, delayed_rhs)
                 case IAST.RuleEnum.initiates:
                     assert(not isinstance(inst, IAST.BridgeDefAST))
                     self._compile_initiation(rule, rhs, inst_head)
@@ -223,18 +253,43 @@ class InstalInstitutionCompiler(InstalCompiler_i):
                     raise TypeError("Unrecognized Relation Type: %s", rule)
 
 
-    def _compile_generation(self, rule, rhs, inst_head):
-        delay = "+{rule.delay}" if rule.delay > 0 else ""
+    def time_guards(self, delay:int=0) -> set[str]:
+        """
+        Extra rule body terms binding the rule's instant I
+        to the step(t) parameter, when compiling incrementally.
+        For a head delayed to I+delay, I is bound to t-delay,
+        so the head is at t.
+        """
+        if not self.incremental:
+            return set()
+        if 0 < delay:
+            return {f"I=t-{delay}"}
+
+        return {"I=t"}
+
+    def insert_step_program(self):
+        if self.incremental:
+            self.insert(PROGRAM_PAT, prog="step(t)")
+
+    def insert_base_program(self):
+        if self.incremental:
+            self.insert(PROGRAM_PAT, prog="base")
+
+    def _compile_generation(self, rule, rhs, inst_head, delayed_rhs):
+        delay = f"+{rule.delay}" if rule.delay > 0 else ""
         for event in rule.body:
+            self.insert_source(rule)
             self.insert(GEN_PAT,
                         source_event=CompileUtil.compile_term(rule.head),
                         result_event=CompileUtil.compile_term(event),
                         inst=inst_head,
                         delay=delay,
-                        rhs=rhs)
+                        rhs=rhs,
+                        delayed_rhs=delayed_rhs)
 
     def _compile_initiation(self, rule, rhs, inst_head):
         for state in rule.body:
+            self.insert_source(rule)
             self.insert(INIT_PAT,
                         event=CompileUtil.compile_term(rule.head),
                         state=CompileUtil.compile_term(state),
@@ -243,6 +298,7 @@ class InstalInstitutionCompiler(InstalCompiler_i):
 
     def _compile_termination(self, rule, rhs, inst_head):
         for state in rule.body:
+            self.insert_source(rule)
             self.insert(TERM_PAT,
                         event=CompileUtil.compile_term(rule.head),
                         state=CompileUtil.compile_term(state),
@@ -250,6 +306,7 @@ class InstalInstitutionCompiler(InstalCompiler_i):
                         rhs=rhs)
 
     def _compile_transient(self, rule, rhs, inst_head):
+        self.insert_source(rule)
         self.insert(TRANSIENT_RULE_PAT,
                     state=CompileUtil.compile_term(rule.body[0]),
                     inst=inst_head,
@@ -53,6 +53,7 @@ class InstalSituationCompiler(InstalCompiler_i):
         self.insert(PROGRAM_PAT, prog="base")
         for initial in facts:
             for state in initial.body:
+                self.insert_source(initial)
                 if inst:
                     inst_head   = CompileUtil.compile_term(inst.head)
                     state_term  = CompileUtil.compile_term(state)
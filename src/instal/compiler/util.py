@@ -11,6 +11,7 @@ from copy import deepcopy
 from dataclasses import InitVar, dataclass, field
 from collections import deque
 from enum import Enum, auto
+from functools import lru_cache
 import re
 from re import Pattern
 from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
@@ -21,7 +22,7 @@ from uuid import UUID, uuid1
 from weakref import ref
 
 import instal.interfaces.ast as ASTs
-from instal.defaults import DEONTICS, BRIDGE_DEONTICS
+from instal.defaults import DEONTICS, BRIDGE_DEONTICS, COMPILE_TERM_CACHE_SIZE
 
 if TYPE_CHECKING:
     # tc only imports
@@ -129,6 +130,77 @@ class CompileUtil:
 
     @staticmethod
     def compile_term(term) -> str:
+        """
+        Compile a term to its clingo form, rewriting deontics.
+        TermASTs are immutable and cache their hash, so results are memoised.
+        """
+        match term:
+            case ASTs.TermAST():
+                return _compile_term_cached(term)
+            case _:
+                return CompileUtil._compile_term(term)
+
+    @staticmethod
+    def compile_terms(terms:Iterable[ASTs.TermAST]) -> dict[ASTs.TermAST, str]:
+        """
+        Compile a batch of terms, compiling each distinct term only once
+        """
+        return {x : CompileUtil.compile_term(x) for x in set(terms)}
+
+    @staticmethod
+    def compile_ast_terms(*asts:ASTs.InstalAST) -> dict[ASTs.TermAST, str]:
+        """
+        Compile all the distinct top level terms of an institution, bridge etc,
+        which warms the memo for its compilation.
+        """
+        return CompileUtil.compile_terms(CompileUtil.collect_terms(*asts))
+
+    @staticmethod
+    def collect_terms(*asts:ASTs.InstalAST) -> set[ASTs.TermAST]:
+        """
+        Find the terms that are compiled independently in asts:
+        heads, bodies, condition sides, and the parameters of fluent heads
+        """
+        found = set()
+        queue = list(asts)
+        while bool(queue):
+            current = queue.pop()
+            match current:
+                case None:
+                    pass
+                case ASTs.TermAST():
+                    found.add(current)
+                case ASTs.FluentAST():
+                    found.add(current.head)
+                    found.update(current.head.params)
+                case ASTs.InstitutionDefAST():
+                    queue.append(current.head)
+                    queue += current.fluents + current.events + current.types + current.rules + current.initial
+                    queue += getattr(current, "links", [])
+                case ASTs.RuleAST() | ASTs.InitiallyAST() | ASTs.QueryAST() | ASTs.DomainSpecAST():
+                    queue.append(getattr(current, "head", None))
+                    queue.append(getattr(current, "inst", None))
+                    queue += getattr(current, "body", [])
+                    queue += getattr(current, "conditions", [])
+                case ASTs.ConditionAST():
+                    queue += [current.head, current.rhs]
+                case ASTs.EventAST() | ASTs.BridgeLinkAST():
+                    queue.append(current.head)
+                case list():
+                    queue += current
+
+        return found
+
+    @staticmethod
+    def cache_info():
+        return _compile_term_cached.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        _compile_term_cached.cache_clear()
+
+    @staticmethod
+    def _compile_term(term) -> str:
         result = []
         queue  = deque([term])
         param_clause_count = 0
@@ -176,3 +248,8 @@ class CompileUtil:
                 result.append(", ")
 
         return "".join(result)
+
+
+@lru_cache(maxsize=COMPILE_TERM_CACHE_SIZE)
+def _compile_term_cached(term:ASTs.TermAST) -> str:
+    return CompileUtil._compile_term(term)
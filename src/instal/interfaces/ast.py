@@ -16,7 +16,7 @@ from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
                     Protocol, Sequence, Tuple, TypeAlias, TypeGuard, TypeVar,
                     cast, final, overload, runtime_checkable)
 from uuid import UUID, uuid1
-from weakref import ref
+from weakref import WeakValueDictionary, ref
 ##-- end imports
 
 __all__ = [
@@ -81,16 +81,26 @@ class ASTContextManager:
 ##-- end util context manager
 
 ##-- core base asts
-@dataclass(frozen=True)
+_SOURCES : dict[tuple, tuple] = {}
+
+def _share_source(parse_source:tuple[str|pl.Path, ...]) -> tuple[str|pl.Path, ...]:
+    """ Every AST parsed from the same source shares a single tuple """
+    return _SOURCES.setdefault(parse_source, parse_source)
+
+@dataclass(frozen=True, slots=True)
 class InstalAST:
-    parse_source : list[str|pl.Path]    = field(default_factory=list, kw_only=True, repr=False)
-    parse_loc    : None|tuple[int, int] = field(default=None, kw_only=True)
+    parse_source : tuple[str|pl.Path, ...] = field(default=(), kw_only=True, repr=False)
+    parse_loc    : None|tuple[int, int]    = field(default=None, kw_only=True)
 
     current_parse_source : ClassVar[None|str] = None
 
     def __post_init__(self):
-        if InstalAST.current_parse_source is not None:
-            self.parse_source.append(InstalAST.current_parse_source)
+        parse_source = tuple(self.parse_source)
+        current      = InstalAST.current_parse_source
+        if current is not None and current not in parse_source:
+            parse_source += (current,)
+
+        object.__setattr__(self, "parse_source", _share_source(parse_source))
 
     @property
     def sources_str(self):
@@ -100,8 +110,10 @@ class InstalAST:
         full_path = self.parse_source[0]
         cwd       = getcwd()
         match full_path:
-            case pl.Path():
+            case pl.Path() if full_path.is_relative_to(cwd):
                 return str(full_path.relative_to(cwd))
+            case pl.Path():
+                return str(full_path)
             case str():
                 return full_path
             case _:
@@ -113,15 +125,60 @@ class InstalAST:
         return ASTContextManager(parse_source)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False)
 class TermAST(InstalAST):
+    """
+    Terms are immutable, with their hash and signature computed on construction.
+    `TermAST.intern` hash-conses terms, so identical terms share a single object.
+    As such, *never* mutate a term's params.
+    """
     value  : str             = field()
     params : list[TermAST]   = field(default_factory=list)
     is_var : bool            = field(default=False)
 
+    _hash  : int             = field(init=False, repr=False, compare=False, default=0)
+    _sig   : str             = field(init=False, repr=False, compare=False, default="")
+
+    _interned : ClassVar[WeakValueDictionary] = WeakValueDictionary()
+
     def __post_init__(self):
         assert(not (self.is_var and bool(self.params)))
-        super().__post_init__()
+        InstalAST.__post_init__(self)
+        object.__setattr__(self, "_hash", hash((self.value, *self.params)))
+        match self.is_var:
+            case False:
+                object.__setattr__(self, "_sig", f"{self.value}/{len(self.params)}")
+            case True:
+                chopped = VAR_SIG_REG.sub("", self.value)
+                object.__setattr__(self, "_sig", f"{chopped}/{len(self.params)}")
+
+    @classmethod
+    def intern(cls, value:str|int, params:list[TermAST]=None, is_var:bool=False, **kwargs) -> TermAST:
+        """
+        Build a term, returning the existing object if an identical term
+        (including its parse location and source) is alive.
+        """
+        params       = params or []
+        parse_source = tuple(kwargs.get("parse_source", ()))
+        current      = InstalAST.current_parse_source
+        if current is not None and current not in parse_source:
+            parse_source += (current,)
+
+        key = (type(value), value, is_var, kwargs.get("parse_loc", None), parse_source, *(id(x) for x in params))
+        try:
+            if (existing:=cls._interned.get(key, None)) is not None:
+                return existing
+        except TypeError:
+            # Unhashable parts
+            return cls(value, params=params, is_var=is_var, **kwargs)
+
+        term = cls(value, params=params, is_var=is_var, **kwargs)
+        cls._interned[key] = term
+        return term
+
+    def __reduce__(self):
+        # Rebuild through intern, as the cached hash is per-process
+        return (_unpickle_term, (self.value, self.params, self.is_var, self.parse_loc, self.parse_source))
 
     def __str__(self):
         if bool(self.params):
@@ -134,31 +191,31 @@ class TermAST(InstalAST):
         return str(self)
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
         if not isinstance(other, TermAST):
             return False
 
-        if not self.value == other.value:
+        if self._hash != other._hash or self.value != other.value:
             return False
 
-        return all(x == y for x,y in zip(self.params, other.params))
-
-
+        return len(self.params) == len(other.params) and all(x == y for x,y in zip(self.params, other.params))
 
     @property
     def signature(self):
-        if not self.is_var:
-            return f"{self.value}/{len(self.params)}"
-
-        chopped = VAR_SIG_REG.sub("", self.value)
-        return f"{chopped}/{len(self.params)}"
+        return self._sig
 
     @property
     def has_var(self) -> bool:
         return self.is_var or any(x.has_var for x in self.params)
 
+def _unpickle_term(value, params, is_var, parse_loc, parse_source) -> TermAST:
+    return TermAST.intern(value, params=params, is_var=is_var, parse_loc=parse_loc, parse_source=parse_source)
+
 ##-- end core base asts
 
 ##-- institutions and bridges
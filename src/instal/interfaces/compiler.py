@@ -49,6 +49,17 @@ class InstalCompiler_i(metaclass=abc.ABCMeta):
             case _:
                 raise TypeError("Unrecognised compile pattern type", pattern)
 
+    def insert_source(self, ast:ASTs.InstalAST):
+        """
+        Mark the DSL source of the text inserted next, as a comment of the form:
+        %@ {source}:{line}:{col}
+        Used to attribute grounding back to the DSL (see solve.grounding_profiler)
+        """
+        if ast.parse_loc is None:
+            return
+
+        self.insert(f"%@ {ast.sources_str}:{ast.parse_loc[0]}:{ast.parse_loc[1]}")
+
     def load_prelude(self) -> str:
         return ""
 
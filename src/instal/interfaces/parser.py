@@ -8,6 +8,7 @@ import abc
 import logging as logmod
 import pathlib as pl
 from dataclasses import InitVar, dataclass, field
+from functools import wraps
 from importlib.readers import MultiplexedPath
 from types import NoneType
 from typing import (IO, TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
@@ -20,18 +21,49 @@ import instal.interfaces.ast as InASTs
 import pyparsing as pp
 import pyparsing.testing as ppt
 
+if TYPE_CHECKING:
+    # tc only imports
+    from instal.util.cache import ASTCache
+
 ##-- end imports
 
 logging = logmod.getLogger(__name__)
 
+def cached_parse(fn):
+    """
+    Decorator for InstalParser_i parse methods.
+    When the parser has an ast_cache, and is parsing a file,
+    check the cache before parsing, and cache the result afterwards.
+    """
+    @wraps(fn)
+    def _cached(self, text:str|pl.Path, *, parse_source=None):
+        if self.ast_cache is None or not isinstance(text, pl.Path) or parse_source is not None:
+            return fn(self, text, parse_source=parse_source)
+
+        key    = self.ast_cache.key(text, f"{self.__class__.__qualname__}.{fn.__name__}")
+        result = self.ast_cache.get(key)
+        if result is not None:
+            logging.debug("AST Cache hit: %s", text)
+            return result
+
+        result = fn(self, text, parse_source=parse_source)
+        self.ast_cache.put(key, result)
+        return result
+
+    return _cached
+
 class InstalParser_i(metaclass=abc.ABCMeta):
     """
     The abstract api of an Instal Parser.
     default implementations use pyparsing,
     but that isn't necessary.
 
+    An optional ASTCache allows skipping parsing of unchanged files,
+    for parse methods decorated with `cached_parse`.
     """
 
+    def __init__(self, *, ast_cache:None|ASTCache=None):
+        self.ast_cache = ast_cache
 
     @abc.abstractmethod
     def parse_institution(self, text:str|pl.Path, *, parser_source=str|pl.Path) -> list[InASTs.InstalAST]: pass
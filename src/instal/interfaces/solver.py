@@ -9,13 +9,16 @@ import logging as logmod
 import time
 import warnings
 from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import InitVar, dataclass, field
+from enum import Enum, auto
 from typing import (IO, TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
                     Iterable, Iterator, List, Mapping, Match, MutableMapping,
                     Protocol, Sequence, Tuple, TypeAlias, TypeGuard, TypeVar,
                     cast, final, overload, runtime_checkable)
 
 from clingo import parse_term
+from instal.util.spans import span
 
 if TYPE_CHECKING:
     # tc only imports
@@ -26,6 +29,28 @@ if TYPE_CHECKING:
 
 logging = logmod.getLogger(__name__)
 
+class CapturePolicy(Enum):
+    """
+    How much of each model a solver copies out of the solver:
+    shown    : only the #show'n atoms. atoms == shown.
+    selected : the shown atoms, and atoms of selected signatures
+    full     : every atom of the model
+    """
+    shown    = auto()
+    selected = auto()
+    full     = auto()
+
+class _FieldProperty(property):
+    """ A property which can be a dataclass field without a default,
+    as the class level access dataclass uses to find defaults fails
+    """
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            raise AttributeError(self.fget.__name__)
+
+        return super().__get__(obj, objtype)
+
 @dataclass
 class InstalModelResult:
     """
@@ -33,19 +58,60 @@ class InstalModelResult:
     Does no translation from the data structures the solver uses.
 
     ie: for Clingo, it is lists of clingo.Symbol's
+
+    atoms can be given as None, with a `loader` to build them on first access.
+    Solvers call `settle` once the loader is no longer valid,
+    which falls back to the atoms captured by their capture policy.
+    Without either, atoms are the shown atoms.
+
+    statistics holds solver specific measurements of the model,
+    eg: `found_at`, the seconds from the start of solving until it was found.
     """
-    atoms   : list[Any]
+
+    def _get_atoms(self) -> list[Any]:
+        if self._atoms is None and self.loader is not None:
+            self._atoms, self.loader = self.loader(), None
+        elif self._atoms is None:
+            self._atoms = self.shown
+
+        return self._atoms
+
+    def _set_atoms(self, atoms:None|list[Any]):
+        self._atoms = atoms
+
+    # Not a field, so asdict and replace only see atoms
+    _atoms                   = None
+    atoms   : list[Any]      = _FieldProperty(_get_atoms, _set_atoms)
     shown   : list[Any]
     cost    : float
     number  : int
     optimal : bool
     type    : Any
+    loader  : None|Callable[[], list[Any]] = field(default=None, kw_only=True, repr=False, compare=False)
+    statistics : dict[str, Any]            = field(default_factory=dict, kw_only=True, repr=False, compare=False)
+
+    @property
+    def loaded(self) -> bool:
+        return self._atoms is not None
+
+    def settle(self, fallback:None|Callable[[], list[Any]]=None):
+        """
+        Called when the loader becomes invalid.
+        If the atoms weren't requested while it was valid, use the fallback, or the shown atoms
+        """
+        self.loader = None
+        if not self.loaded:
+            self._atoms = self.shown if fallback is None else fallback()
 
 
 @dataclass
 class SolverWrapper_i:
     """
     An wrapper around a solver (ie: clingo) to interface with the rest of instal
+
+    timings    : seconds spent in each phase of solving (eg: load, add, ground, solve, callback)
+    statistics : the solver's own statistics of the last solve.
+    Both are included in the metadata.
     """
 
     program        : None|str                = field(default=None)
@@ -56,11 +122,25 @@ class SolverWrapper_i:
     current_answer : int                     = field(init=False, default=0)
     cycle          : int                     = field(init=False, default=0)
     observations   : list[TermAST]           = field(default_factory=list)
-
+    timings        : dict[str, float]        = field(init=False, default_factory=dict)
+    statistics     : dict[str, Any]          = field(init=False, default_factory=dict)
 
     def __post_init__(self): pass
 
 
+    @contextmanager
+    def timed(self, phase:str):
+        """
+        Add the wall clock time of the context to the phase's timing,
+        and record it as a `solver.{phase}` span
+        """
+        start = time.perf_counter()
+        try:
+            with span(f"solver.{phase}"):
+                yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + (time.perf_counter() - start)
+
     @abc.abstractmethod
     def solve(self, assertions:None|list[Any]=None, fresh=False) -> int: pass
 
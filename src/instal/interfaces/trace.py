@@ -6,6 +6,7 @@ How model results are represented and manipulated
 from __future__ import annotations
 
 import abc
+import hashlib
 import logging as logmod
 from collections.abc import Sequence
 from copy import deepcopy
@@ -25,7 +26,7 @@ from instal.interfaces.solver import InstalModelResult
 
 if TYPE_CHECKING:
     # tc only imports
-    pass
+    from instal.trace.intervals import FluentIntervalIndex
 ##-- end imports
 
 
@@ -104,6 +105,7 @@ class Trace_i(Sequence):
 
     _states  : dict[str, State_i]     = field(default_factory=dict)
     _ordered : list[int]              = field(init=False, default_factory=list)
+    _intervals : Any                  = field(init=False, default=None, repr=False, compare=False)
     state_constructor : ClassVar[State_i] = None
 
     def __post_init__(self, states):
@@ -150,30 +152,127 @@ class Trace_i(Sequence):
     @abc.abstractmethod
     def check(self, conditions:list) -> bool: pass
     @abc.abstractmethod
-    def to_json_str(self, filename=None) -> str: pass
+    def to_json_str(self, filename=None, version:None|int=None) -> str: pass
 
     @abc.abstractmethod
     def filter(self, allow:list[str], reject:list[str], start:None|int=None, end:None|int=None) -> Trace_i: pass
 
-    @abc.abstractmethod
-    def fluent_intervals(self) -> list[tuple[str, int, int]]: pass
+    @property
+    def intervals(self) -> FluentIntervalIndex:
+        """
+        The index of fluent intervals, built on first access and cached,
+        so don't insert into the trace's states after using it
+        """
+        if self._intervals is None:
+            self._intervals = self._build_intervals()
+
+        return self._intervals
+
+    def _build_intervals(self) -> FluentIntervalIndex:
+        from instal.trace.intervals import FluentIntervalIndex
+        return FluentIntervalIndex.from_trace(self)
+
+    def fluent_intervals(self) -> list[tuple[TermAST, int, int]]:
+        """
+        Every interval of every fluent, ordered by start.
+        [fluent: TermAST, stepOn:int, stepOff:int]
+        A fluent which is terminated and reinitiated has an interval for each time it holds
+        """
+        return list(self.intervals)
 
     # @abc.abstractmethod
     # def conflicts(self) -> list[tuple[int, Any, Any]]: pass
 
 
+TREE_ROOT : Final[str] = "root"
+
 @dataclass
 class TraceTree_i:
     """
-    Collections of traces which merge to form a tree, branching at diverging actions
+    Collections of traces which merge to form a tree, branching at diverging states.
+
+    Each node is a state, identified by a hash of its terms and its parent's id,
+    so traces with a common prefix of identical states share those nodes,
+    and only branch where their states diverge.
+    `start` is a sentinel root, without a state, as traces can diverge from their first state.
+    Each added trace is recorded as the node it ends at, and its metadata,
+    so iterating the tree rebuilds the individual traces, with `trace_constructor`.
+
+    Rebuilt traces share their states with each other, so don't mutate them.
     """
 
     # [state, [successors]]
-    states : dict[str, tuple[State_i, list[str]]]
-    start  : str
+    states : dict[str, tuple[None|State_i, list[str]]] = field(default_factory=dict)
+    start  : str                                       = field(default=TREE_ROOT)
+
+    _parents : dict[str, str]              = field(init=False, default_factory=dict)
+    _ends    : list[tuple[str, dict]]      = field(init=False, default_factory=list)
+
+    trace_constructor : ClassVar[type[Trace_i]] = None
 
-    def add_trace(self, trace):
+    def __post_init__(self):
+        self.states.setdefault(self.start, (None, []))
+
+    def add_trace(self, trace:Trace_i) -> str:
         """ Add a trace into the tree
         comparing and discarding states until the divergent point is found.
+        Returns the id of the node the trace ends at.
+        """
+        parent = self.start
+        for state in sorted(trace, key=lambda x: x.timestep):
+            node = self.node_id(parent, state)
+            if node not in self.states:
+                self.states[node] = (state, [])
+                self.states[parent][1].append(node)
+                self._parents[node] = parent
+
+            parent = node
+
+        self._ends.append((parent, trace.metadata.copy()))
+        return parent
+
+    def node_id(self, parent:str, state:State_i) -> str:
+        digest = hashlib.blake2b(parent.encode(), digest_size=16)
+        digest.update(str(state.timestep).encode())
+        for term in sorted(str(x) for x in state):
+            digest.update(b"\n")
+            digest.update(term.encode())
+
+        return digest.hexdigest()
+
+    def __iter__(self) -> Iterator[Trace_i]:
+        """ Rebuild each added trace, in the order they were added """
+        for node, metadata in self._ends:
+            yield self.trace_constructor(self.path(node), metadata=metadata.copy())
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def path(self, node:str) -> list[State_i]:
+        """ The states from the root to node """
+        states = []
+        while node != self.start:
+            states.append(self.states[node][0])
+            node = self._parents[node]
+
+        states.reverse()
+        return states
+
+    @property
+    def node_count(self) -> int:
+        """ The number of states stored, not including the root """
+        return len(self.states) - 1
+
+    def branch_points(self) -> list[str]:
+        """ Nodes with more than one successor, in the order they were added """
+        return [node for node, (_, succ) in self.states.items() if len(succ) > 1]
+
+    def differences(self, node:str) -> dict[str, set[str]]:
+        """
+        For each successor of a node, the terms of its state which
+        aren't in every successor's state. ie: what the branches diverge on
         """
-        pass
+        succ   = self.states[node][1]
+        terms  = {x : {str(y) for y in self.states[x][0]} for x in succ}
+        common = set.intersection(*terms.values()) if bool(terms) else set()
+        return {x : y - common for x, y in terms.items()}
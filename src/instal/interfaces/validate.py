@@ -23,6 +23,7 @@ from instal.interfaces.ast import InstalAST
 from instal.interfaces.util import InstalASTVisitor_i
 
 from instal.util.generated_visitor import InstalGeneratedASTVisitor
+from instal.util.spans import span
 ##-- end imports
 
 
@@ -172,14 +173,16 @@ class InstalValidatorRunner:
 
 
         logging.debug("Visiting nodes")
-        self.visitor.visit_all(asts)
+        with span("validate.visit", asts=len(asts)):
+            self.visitor.visit_all(asts)
 
 
         for validator in self.validators:
             logging.debug("Running Validator: %s", validator.__class__.__name__)
             # Run the Validate, recording results
             try:
-                results = validator()
+                with span("validate.run", validator=validator.__class__.__name__):
+                    results = validator()
                 # Collect the reports by level
                 for note in results:
                     total_results[note.level].append(note)
@@ -55,9 +55,9 @@ def institution(string, loc, toks):
 
 def term(string, loc, toks) -> ASTs.TermAST:
     is_var, value = toks['value']
-    return ASTs.TermAST(value,
-                        params=toks['params'][:] if 'params' in toks else [],
-                        is_var=is_var)
+    return ASTs.TermAST.intern(value,
+                               params=toks['params'][:] if 'params' in toks else [],
+                               is_var=is_var)
 
 
 def fluent(string, loc, toks) -> ASTs.FluentAST:
@@ -73,7 +73,8 @@ def fluent(string, loc, toks) -> ASTs.FluentAST:
             if len(head.params) != 3:
                 raise pp.ParseFatalException(string, loc, "Obligation arguments need to be of the form a (requirement, deadline, violation)")
 
-            head.params.append(ASTs.TermAST("achievement"))
+            # terms are interned, so build a new head instead of mutating it
+            head = ASTs.TermAST.intern(head.value, params=head.params + [ASTs.TermAST.intern("achievement")])
         case _:
             annotation = ASTs.FluentEnum.inertial
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import dataclasses
+import logging as logmod
+import pathlib
+from importlib.resources import files
+##-- end imports
+
+import pytest
+import pyparsing as pp
+import instal.interfaces.ast as ASTs
+from instal.benchmark.generator import SyntheticGenerator, SyntheticSpec
+from instal.parser.v2.descent_parser import InstalDescentParser
+from instal.parser.v2.parser import InstalPyParser
+
+##-- data
+data_path     = files("instal.parser.v2.__tests.__data")
+validate_path = files("instal.validate.__tests.__data")
+##-- end data
+
+logging = logmod.root
+
+PARSE_FUNCS = {".ial": "parse_institution", ".iab": "parse_bridge", ".idc": "parse_domain",
+               ".iaf": "parse_situation", ".iaq": "parse_query"}
+
+INST = "institution test;\n"
+CASES = [
+    (INST + "type P;\ntype Q: a b(c) 3;", "parse_institution"),
+    (INST + "exo event e(P);\ninst event f;\nviolation event g;", "parse_institution"),
+    (INST + "achievement obligation fluent o(a,b,c);\nx fluent f(a);\ntransient fluent g;", "parse_institution"),
+    (INST + "a generates b,\n   c if d,\n  not e, X<3;", "parse_institution"),
+    (INST + "a xterminates b(X1, Y);\nc initiates d(-3, +2).", "parse_institution"),
+    (INST + "a when not(x) < 3, not y;", "parse_institution"),
+    (INST + "a generates b\nif c;", "parse_institution"),
+    (INST + "initially a, b;\ninitially c if d;", "parse_institution"),
+    (INST + "type(X) generates y;\ninitially(x) generates y;", "parse_institution"),
+    (INST + "%% comment\n\n\na generates b;\r\n\r\nc generates d;", "parse_institution"),
+    (INST + "a generates b;\n\ninstitution other;\ntype P;", "parse_institution"),
+    ("bridge b;\nsource a;\nsink b;\ntype P;\nsink(x) xgenerates y;", "parse_bridge"),
+    ("P: a b\nQ: c(d)\n", "parse_domain"),
+    ("P: a 3b\n", "parse_domain"),
+    ("initially a in i\nnot initially b(c) in i if c\n", "parse_situation"),
+    ("observed a\nnot observed b at 3 if c;\n\nobserved d.\n", "parse_query"),
+]
+
+FAILURES = [
+    (INST + "a generates;", "parse_institution"),
+    (INST + "a when not(x);", "parse_institution"),
+    (INST + "type P; % trailing comment\na generates b;", "parse_institution"),
+    ("P: a b\n\nQ: c", "parse_domain"),
+    ("initially a(X) in i\n", "parse_situation"),
+    ("observed a at +3\n", "parse_query"),
+    ("observed b at 3if c\n", "parse_query"),
+]
+
+def assert_same(first, second, path="ast"):
+    """ Compare asts including parse_loc, which term equality ignores """
+    assert(type(first) == type(second)), path
+    if dataclasses.is_dataclass(first):
+        for field in dataclasses.fields(first):
+            if field.name.startswith("_"):
+                continue
+            assert_same(getattr(first, field.name), getattr(second, field.name), f"{path}.{field.name}")
+    elif isinstance(first, (list, tuple)):
+        assert(len(first) == len(second)), path
+        for i, (x, y) in enumerate(zip(first, second)):
+            assert_same(x, y, f"{path}[{i}]")
+    else:
+        assert(first == second), path
+
+def cross_check(text:str|pathlib.Path, func:str):
+    assert_same(getattr(InstalPyParser(), func)(text), getattr(InstalDescentParser(), func)(text))
+
+class TestDescentParser:
+
+    def test_initial(self):
+        assert(isinstance(InstalDescentParser(), InstalDescentParser))
+
+    @pytest.mark.parametrize("text,func", CASES)
+    def test_same_asts(self, text, func):
+        cross_check(text, func)
+
+    @pytest.mark.parametrize("text,func", FAILURES)
+    def test_same_failures(self, text, func):
+        with pytest.raises(pp.ParseException):
+            getattr(InstalPyParser(), func)(text)
+
+        with pytest.raises(pp.ParseException):
+            getattr(InstalDescentParser(), func)(text)
+
+    def test_error_location(self):
+        with pytest.raises(pp.ParseException) as err:
+            InstalDescentParser().parse_institution(INST + "a generates b;\nc generates;")
+
+        assert(err.value.lineno == 3)
+
+    def test_obligation_is_fatal(self):
+        with pytest.raises(pp.ParseFatalException):
+            InstalDescentParser().parse_institution(INST + "obligation fluent o(a, b);")
+
+    def test_parse_source(self):
+        path   = pathlib.Path(data_path / "test_inst.ial")
+        result = InstalDescentParser().parse_institution(path)
+        assert(result[0].parse_source == (path,))
+        assert(result[0].head.parse_source == (path,))
+
+    @pytest.mark.parametrize("name", sorted(x.name for x in data_path.iterdir() if pathlib.Path(x.name).suffix in PARSE_FUNCS))
+    def test_data_files(self, name):
+        path = pathlib.Path(data_path / name)
+        cross_check(path, PARSE_FUNCS[path.suffix])
+
+    def test_validate_data_files(self):
+        for path in sorted(pathlib.Path(x) for x in validate_path.iterdir()):
+            if path.suffix not in PARSE_FUNCS:
+                continue
+            try:
+                expected = getattr(InstalPyParser(), PARSE_FUNCS[path.suffix])(path)
+            except pp.ParseBaseException:
+                with pytest.raises(pp.ParseBaseException):
+                    getattr(InstalDescentParser(), PARSE_FUNCS[path.suffix])(path)
+                continue
+
+            assert_same(expected, getattr(InstalDescentParser(), PARSE_FUNCS[path.suffix])(path), path.name)
+
+    @pytest.mark.parametrize("arity", [0, 1, 2])
+    def test_synthetic(self, arity):
+        spec = SyntheticSpec(institutions=2, bridges=1, rules=40, arity=arity, seed=arity)
+        for name, text in SyntheticGenerator(spec).generate().items():
+            cross_check(text, PARSE_FUNCS[pathlib.Path(name).suffix])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+from importlib.resources import files
+##-- end imports
+
+import pytest
+import pyparsing as pp
+import instal.interfaces.ast as ASTs
+import instal.parser.v2.fast_parse_funcs as f_dsl
+from instal.benchmark.generator import SyntheticGenerator, SyntheticSpec
+from instal.parser.v2.parser import InstalPyParser
+
+##-- data
+data_path = files("instal.parser.v2.__tests.__data")
+##-- end data
+
+logging = logmod.root
+
+INSTITUTIONS = [
+    "institution test;",
+    "institution test;\ntype Person;\nexogenous event birth(Person);\ninst event blah(Person);",
+    "institution test;\nfluent alive(Person);\ntransient fluent awake(Person);\nx fluent other(Person);",
+    "institution test;\nobligation fluent obl(blah, bloo, blee);",
+    "institution test;\nbirth(X) generates blah(X), bloo(X) if alive(X), not dead(X);",
+    "institution test;\nbirth(X) xgenerates blah(X) if X < 5, Y != X;",
+    "institution test;\nbirth(X) initiates alive(X);\ndeath(X) terminates alive(X)\n    if alive(X),\n    other(X);",
+    "institution test;\nawake(X) when alive(X), not asleep(X);",
+    "institution test;\ninitially alive(bob), awake(bob) if not dead(bob);",
+    "institution test;\ntype Person;\n%% a comment\nbirth(X) generates blah(X, -2);",
+    "institution test;\ntype Person: bob bill;\n\n\ninstitution other;\ntype Thing;",
+]
+
+FAILURES = [
+    "institution test;\nbirth(X) generates;",
+    "institution test;\nbirth(X) when;",
+    "institution test;\nbirth(X) blah(X);",
+    "institution test;\nfluent;",
+    "institution test;\nbirth(X) when not(x);",
+    "institution test;\nbirth(X) when alive(X), not;",
+]
+
+class TestFastParser:
+
+    def test_default(self):
+        assert(not InstalPyParser().fast)
+        assert(InstalPyParser(fast=True).fast)
+
+    @pytest.mark.parametrize("text", INSTITUTIONS)
+    def test_same_institution_asts(self, text):
+        assert(InstalPyParser().parse_institution(text) == InstalPyParser(fast=True).parse_institution(text))
+
+    @pytest.mark.parametrize("text", FAILURES)
+    def test_same_failures(self, text):
+        with pytest.raises(pp.ParseException) as slow:
+            InstalPyParser().parse_institution(text)
+
+        with pytest.raises(pp.ParseException) as fast:
+            InstalPyParser(fast=True).parse_institution(text)
+
+        assert(slow.value.loc == fast.value.loc)
+
+    @pytest.mark.parametrize("name", ["test_inst.ial", "test_inst2.ial", "test_inst3.ial", "test_bridge.iab"])
+    def test_same_data_asts(self, name):
+        path = pathlib.Path(data_path / name)
+        match path.suffix:
+            case ".ial":
+                assert(InstalPyParser().parse_institution(path) == InstalPyParser(fast=True).parse_institution(path))
+            case ".iab":
+                assert(InstalPyParser().parse_bridge(path) == InstalPyParser(fast=True).parse_bridge(path))
+
+    @pytest.mark.parametrize("arity", [0, 1, 2])
+    def test_same_synthetic_asts(self, arity):
+        spec  = SyntheticSpec(institutions=2, bridges=1, rules=40, arity=arity)
+        texts = SyntheticGenerator(spec).generate()
+        for name, text in texts.items():
+            match pathlib.Path(name).suffix:
+                case ".ial":
+                    assert(InstalPyParser().parse_institution(text) == InstalPyParser(fast=True).parse_institution(text))
+                case ".iab":
+                    assert(InstalPyParser().parse_bridge(text) == InstalPyParser(fast=True).parse_bridge(text))
+
+    def test_transient_rule(self):
+        result = f_dsl.RULE.parse_string("awake(X) when alive(X), not asleep(X);")[0]
+        assert(isinstance(result, ASTs.TransientRuleAST))
+        assert(result.head is None)
+        assert(str(result.body[0]) == "awake(X)")
+        assert(result.conditions[1].negated)
+
+    def test_comparison_condition(self):
+        result = f_dsl.CONDITIONS.parse_string("X < 5, not blah")[:]
+        assert(result[0].operator == "<")
+        assert(str(result[0].rhs) == "5")
+        assert(result[1].negated)
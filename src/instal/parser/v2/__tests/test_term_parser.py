@@ -74,3 +74,34 @@ class TestTermParser(InstalParserTestCase):
                                 ("blah(aweg(-2), other)", ASTs.TermAST("blah", [ASTs.TermAST("aweg", [ASTs.TermAST(-2)]),
                                                                                 ASTs.TermAST("other")]))
                                 )
+
+    def test_parsed_terms_interned(self):
+        first  = TERM.parse_string("blah(a, b)")[0]
+        second = TERM.parse_string("blah(a, b)")[0]
+        # Same location and source, so the same object:
+        assert(first is second)
+        assert(first.params[0] is second.params[0])
+
+    def test_interned_location_distinct(self):
+        first  = TERM.parse_string("blah(a, b)")[0]
+        second = TERM.parse_string(" blah(a, b)")[0]
+        assert(first is not second)
+        assert(first == second)
+        assert(hash(first) == hash(second))
+        assert(first.parse_loc != second.parse_loc)
+
+    def test_term_hash_and_signature(self):
+        term = ASTs.TermAST.intern("blah", [ASTs.TermAST.intern("a"), ASTs.TermAST.intern(2)])
+        assert(term == ASTs.TermAST("blah", [ASTs.TermAST("a"), ASTs.TermAST(2)]))
+        assert(hash(term) == hash(ASTs.TermAST("blah", [ASTs.TermAST("a"), ASTs.TermAST(2)])))
+        assert(term != ASTs.TermAST("blah", [ASTs.TermAST("a")]))
+        assert(term.signature == "blah/2")
+        assert(not hasattr(term, "__dict__"))
+
+    def test_shared_parse_source(self):
+        with ASTs.InstalAST.manage_source("test_source"):
+            first  = ASTs.TermAST("a")
+            second = ASTs.TermAST("b")
+
+        assert(first.parse_source == ("test_source",))
+        assert(first.parse_source is second.parse_source)
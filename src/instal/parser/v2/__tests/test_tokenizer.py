@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+##-- end imports
+
+import pytest
+from instal.parser.v2.tokenizer import Token, tokenize
+
+logging = logmod.root
+
+class TestTokenizer:
+
+    def test_initial(self):
+        assert(tokenize("") == [])
+
+    def test_kinds(self):
+        tokens = tokenize("foo(X, -3) <= _bar;")
+        assert([x.kind for x in tokens] == ["name", "punct", "var", "punct", "num", "punct", "op", "name", "punct"])
+
+    def test_vars_dont_take_underscores(self):
+        assert([x.text for x in tokenize("Foo_bar")] == ["Foo", "_bar"])
+
+    def test_longest_operator(self):
+        assert([x.text for x in tokenize("< <= <> == =")] == ["<", "<=", "<>", "==", "="])
+
+    def test_comments_dropped_with_newline(self):
+        tokens = tokenize("a % comment\nb\n")
+        assert([x.kind for x in tokens] == ["name", "name", "nl"])
+
+    def test_unterminated_comment(self):
+        assert(tokenize("a %")[-1].kind == "error")
+
+    def test_locations(self):
+        tokens = tokenize("a\n  b % c\n\tc")
+        assert([(x.line, x.col) for x in tokens if x.kind == "name"] == [(1, 1), (2, 3), (3, 2)])
+        assert(tokens[-1].loc == 11)
+
+    def test_glued_to_numbers(self):
+        tokens = tokenize("3if 3 if a3b -2X")
+        assert([(x.text, x.glued) for x in tokens] == [("3", False), ("if", True), ("3", False), ("if", False),
+                                                      ("a3b", False), ("-2", False), ("X", True)])
@@ -58,10 +58,10 @@ def institution(string, loc, toks):
 
 def term(string, loc, toks) -> ASTs.TermAST:
     is_var, value = toks['value']
-    return ASTs.TermAST(value,
-                        params=toks['params'][:] if 'params' in toks else [],
-                        is_var=is_var,
-                        parse_loc=(pp.lineno(loc, string), pp.col(loc, string)))
+    return ASTs.TermAST.intern(value,
+                               params=toks['params'][:] if 'params' in toks else [],
+                               is_var=is_var,
+                               parse_loc=(pp.lineno(loc, string), pp.col(loc, string)))
 
 
 def fluent(string, loc, toks) -> ASTs.FluentAST:
@@ -152,4 +152,18 @@ def transient_rule(string, loc, toks) -> ASTs.TransientRuleAST:
                                  annotation=ASTs.RuleEnum.transient,
                                  parse_loc=(pp.lineno(loc, string), pp.col(loc, string)))
 
+def rule(string, loc, toks) -> ASTs.RuleAST:
+    """ For rules factored on their head term, which is the body of a transient rule """
+    match toks.get('annotation', None):
+        case None:
+            return ASTs.TransientRuleAST(None,
+                                         [toks['head']],
+                                         toks['conditions'][:],
+                                         annotation=ASTs.RuleEnum.transient,
+                                         parse_loc=(pp.lineno(loc, string), pp.col(loc, string)))
+        case "generates" | "xgenerates":
+            return generate_rule(string, loc, toks)
+        case _:
+            return inertial_rule(string, loc, toks)
+
 ##-- end constructors
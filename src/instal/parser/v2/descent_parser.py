@@ -0,0 +1,573 @@
+#/usr/bin/env python3
+"""
+A hand written recursive descent parser for the v2 DSL,
+over the tokens of parser.v2.tokenizer.
+
+Produces the same asts as parser.v2.parser.InstalPyParser, including parse_loc,
+by following the pyparsing grammar's ordered choices and backtracking,
+but without pyparsing's per element overhead.
+Select it with:
+
+[tool.instal.dsl]
+PARSER = "instal.parser.v2.descent_parser.InstalDescentParser"
+
+Errors are raised as pyparsing exceptions, as callers of parsers expect.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib as pl
+from typing import Any, Callable, Final
+
+import pyparsing as pp
+import instal.interfaces.ast as ASTs
+from instal.defaults import SUPPRESS_PARSER_EXCEPTION_TRACE
+from instal.interfaces.parser import InstalParser_i, cached_parse
+from instal.parser.v2.tokenizer import Token, tokenize
+from instal.util.misc import maybe_read_path
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+EVENT_KWS      : Final[dict[str, ASTs.EventEnum]] = {
+    "exogenous"     : ASTs.EventEnum.exogenous,
+    "exo"           : ASTs.EventEnum.exogenous,
+    "external"      : ASTs.EventEnum.exogenous,
+    "institutional" : ASTs.EventEnum.institutional,
+    "inst"          : ASTs.EventEnum.institutional,
+    "violation"     : ASTs.EventEnum.violation,
+    "viol"          : ASTs.EventEnum.violation,
+}
+FLUENT_KWS     : Final[dict[str, ASTs.FluentEnum]] = {x.replace("_", " ") : y for x, y in ASTs.FluentEnum.__members__.items()} | {
+    "x"   : ASTs.FluentEnum.cross,
+    "obl" : ASTs.FluentEnum.obligation,
+}
+RULE_KWS       : Final[dict[str, ASTs.RuleEnum]] = {x : ASTs.RuleEnum[x] for x in ["generates", "xgenerates",
+                                                                                  "initiates", "terminates",
+                                                                                  "xinitiates", "xterminates"]}
+GENERATION_KWS : Final[frozenset[ASTs.RuleEnum]] = frozenset([ASTs.RuleEnum.generates, ASTs.RuleEnum.xgenerates])
+LINK_KWS       : Final[dict[str, ASTs.BridgeLinkEnum]] = dict(ASTs.BridgeLinkEnum.__members__)
+OBLIGATIONS    : Final[frozenset[ASTs.FluentEnum]] = frozenset([ASTs.FluentEnum.obligation,
+                                                                ASTs.FluentEnum.achievement_obligation,
+                                                                ASTs.FluentEnum.maintenance_obligation])
+TERM_KINDS     : Final[frozenset[str]] = frozenset(["var", "name", "num"])
+LN_KINDS       : Final[frozenset[str]] = frozenset(["nl", "cr"])
+
+class _Backtrack(Exception):
+    """ An alternative failed to match. Never escapes the parser """
+    pass
+
+class DescentState:
+    """
+    A single parse of a text.
+    Each rule method either returns its result, having advanced `pos` past it,
+    or raises _Backtrack, after which the caller resets `pos` and tries its next alternative.
+    The furthest failure is kept for the error message if the whole parse fails.
+    """
+
+    def __init__(self, text:str):
+        self.text     = text
+        self.tokens   = tokenize(text)
+        self.pos      = 0
+        self.furthest = 0
+        self.expected = "end of text"
+        # An eof sentinel, so lookahead never runs off the end
+        end = len(text)
+        self.tokens.append(Token("eof", "", end, pp.lineno(end, text), pp.col(end, text)))
+
+    ##-- util
+    def fail(self, expected:str):
+        if self.furthest <= self.pos:
+            self.furthest = self.pos
+            self.expected = expected
+        raise _Backtrack()
+
+    def loc(self, tok:Token) -> tuple[int, int]:
+        return (tok.line, tok.col)
+
+    def is_kw(self, tok:Token) -> bool:
+        """ Whether a token can be a keyword, which it can't if glued to a number """
+        return tok.kind == "name" and not tok.glued
+
+    def at_word(self, word:str) -> bool:
+        tok = self.tokens[self.pos]
+        return self.is_kw(tok) and tok.text == word
+
+    def word(self, word:str):
+        if not self.at_word(word):
+            self.fail(repr(word))
+        self.pos += 1
+
+    def punct(self, char:str):
+        tok = self.tokens[self.pos]
+        if tok.kind != "punct" or tok.text != char:
+            self.fail(repr(char))
+        self.pos += 1
+
+    def ln(self):
+        """ One or more newlines """
+        if self.tokens[self.pos].kind not in LN_KINDS:
+            self.fail("newline")
+        self.skip_ln()
+
+    def skip_ln(self):
+        tokens = self.tokens
+        while tokens[self.pos].kind in LN_KINDS:
+            self.pos += 1
+
+    def after_line_end(self, pos:int) -> None|int:
+        """
+        Where a line end starting at pos ends, or None.
+        As pyparsing's line_end keeps its original whitespace, it skips carriage returns.
+        At the end of the text, returns the same pos
+        """
+        tokens = self.tokens
+        while tokens[pos].kind == "cr":
+            pos += 1
+
+        match tokens[pos].kind:
+            case "nl":
+                return pos + 1
+            case "eof":
+                return pos
+            case _:
+                return None
+
+    def line_end(self):
+        """ A newline, or the end of the text """
+        match self.after_line_end(self.pos):
+            case None:
+                self.fail("end of line")
+            case end:
+                self.pos = end
+
+    def semi(self):
+        """ An optional ; or . then one or more line ends """
+        tok = self.tokens[self.pos]
+        if tok.kind == "punct" and tok.text in ";.":
+            self.pos += 1
+
+        self.line_end()
+        while (end:=self.after_line_end(self.pos)) is not None and end != self.pos:
+            self.pos = end
+
+    def attempt(self, rule:Callable, *args) -> tuple[bool, Any]:
+        """ Try a rule, resetting pos if it fails """
+        start = self.pos
+        try:
+            return True, rule(*args)
+        except _Backtrack:
+            self.pos = start
+            return False, None
+
+    def finish(self):
+        """ Check the whole text has been parsed """
+        if self.tokens[self.pos].kind != "eof":
+            self.fail("end of text")
+
+    def error(self) -> pp.ParseException:
+        loc = self.tokens[min(self.furthest, len(self.tokens) - 1)].loc
+        return pp.ParseException(self.text, loc, f"Expected {self.expected}")
+
+    ##-- end util
+
+    ##-- terms and conditions
+    def term(self) -> ASTs.TermAST:
+        tok = self.tokens[self.pos]
+        match tok.kind:
+            case "var":
+                is_var, value = True, tok.text
+            case "name":
+                is_var, value = False, tok.text
+            case "num":
+                is_var, value = False, int(tok.text)
+            case _:
+                self.fail("term")
+
+        self.pos += 1
+        params = []
+        nxt    = self.tokens[self.pos]
+        if nxt.kind == "punct" and nxt.text == "(":
+            start = self.pos
+            try:
+                self.pos += 1
+                params = self.term_list()
+                self.punct(")")
+            except _Backtrack:
+                self.pos = start
+                params   = []
+
+        return ASTs.TermAST.intern(value, params=params, is_var=is_var, parse_loc=(tok.line, tok.col))
+
+    def term_list(self) -> list[ASTs.TermAST]:
+        """ Comma separated terms, each optionally on a new line """
+        self.skip_ln()
+        result = [self.term()]
+        tokens = self.tokens
+        while tokens[self.pos].kind == "punct" and tokens[self.pos].text == ",":
+            start = self.pos
+            try:
+                self.pos += 1
+                self.skip_ln()
+                result.append(self.term())
+            except _Backtrack:
+                self.pos = start
+                break
+
+        return result
+
+    def condition(self) -> ASTs.ConditionAST:
+        """
+        As PU.COMPARISON | PU.CONDITION:
+        a comparison is tried first, so 'not' can be a term
+        """
+        start = self.pos
+        first = self.tokens[start]
+        head  = None
+        try:
+            head = self.term()
+            tok  = self.tokens[self.pos]
+            if tok.kind == "op":
+                after_head = self.pos
+                self.pos  += 1
+                matched, rhs = self.attempt(self.term)
+                if matched:
+                    return ASTs.ConditionAST(head, False, operator=tok.text, rhs=rhs, parse_loc=self.loc(first))
+                self.pos = after_head
+        except _Backtrack:
+            pass
+
+        if self.is_kw(first) and first.text == "not":
+            self.pos = start + 1
+            return ASTs.ConditionAST(self.term(), True, parse_loc=self.loc(first))
+
+        if head is None:
+            self.pos = start
+            self.fail("condition")
+
+        return ASTs.ConditionAST(head, False, parse_loc=self.loc(first))
+
+    def conditions(self) -> list[ASTs.ConditionAST]:
+        self.skip_ln()
+        result = [self.condition()]
+        tokens = self.tokens
+        while tokens[self.pos].kind == "punct" and tokens[self.pos].text == ",":
+            start = self.pos
+            try:
+                self.pos += 1
+                self.skip_ln()
+                result.append(self.condition())
+            except _Backtrack:
+                self.pos = start
+                break
+
+        return result
+
+    def if_conds(self) -> None|list[ASTs.ConditionAST]:
+        """ An optional, possibly next line, 'if' and conditions """
+        start = self.pos
+        self.skip_ln()
+        if not self.at_word("if"):
+            self.pos = start
+            return None
+
+        self.pos += 1
+        matched, conds = self.attempt(self.conditions)
+        if not matched:
+            self.pos = start
+            return None
+
+        return conds
+
+    ##-- end terms and conditions
+
+    ##-- declarations
+    def type_dec(self) -> ASTs.DomainSpecAST:
+        start = self.tokens[self.pos]
+        self.word("type")
+        head = self.term()
+        body = []
+        tok  = self.tokens[self.pos]
+        if tok.kind == "punct" and tok.text == ":":
+            before = self.pos
+            self.pos += 1
+            matched, first = self.attempt(self.term)
+            if matched:
+                body = [first] + self.terms()
+            else:
+                self.pos = before
+
+        self.semi()
+        return ASTs.DomainSpecAST(head, body, parse_loc=self.loc(start))
+
+    def terms(self) -> list[ASTs.TermAST]:
+        """ Zero or more whitespace separated terms """
+        result = []
+        while self.tokens[self.pos].kind in TERM_KINDS:
+            matched, term = self.attempt(self.term)
+            if not matched:
+                break
+            result.append(term)
+
+        return result
+
+    def event(self) -> ASTs.EventAST:
+        start = self.tokens[self.pos]
+        if not self.is_kw(start) or start.text not in EVENT_KWS:
+            self.fail("event type")
+
+        self.pos += 1
+        self.word("event")
+        head = self.term()
+        self.semi()
+        return ASTs.EventAST(head, EVENT_KWS[start.text], parse_loc=self.loc(start))
+
+    def fluent_kw(self) -> None|str:
+        """ As an optional PU.fluent_kws, including its two word keywords """
+        tok = self.tokens[self.pos]
+        if not self.is_kw(tok):
+            return None
+
+        nxt   = self.tokens[self.pos + 1]
+        two   = f"{tok.text} {nxt.text}"
+        if nxt.kind == "name" and two in FLUENT_KWS and self.text[tok.loc:nxt.loc] == f"{tok.text} ":
+            self.pos += 2
+            return two
+
+        if tok.text in FLUENT_KWS and " " not in tok.text:
+            self.pos += 1
+            return tok.text
+
+        return None
+
+    def fluent(self) -> ASTs.FluentAST:
+        start      = self.tokens[self.pos]
+        anno_str   = self.fluent_kw()
+        self.word("fluent")
+        head       = self.term()
+        self.semi()
+        annotation = FLUENT_KWS[anno_str] if anno_str is not None else ASTs.FluentEnum.inertial
+        if (annotation in OBLIGATIONS) and len(head.params) != 3:
+            raise pp.ParseFatalException(self.text, start.loc, "Obligation arguments need to be of the form a (requirement, deadline, violation)")
+
+        return ASTs.FluentAST(head, annotation, parse_loc=self.loc(start))
+
+    def rule(self) -> ASTs.RuleAST:
+        """
+        Generation, inertial and transient rules all start with a term,
+        so it is parsed once, as the grammar would parse it the same for each
+        """
+        start = self.tokens[self.pos]
+        head  = self.term()
+        tok   = self.tokens[self.pos]
+        if self.is_kw(tok) and tok.text in RULE_KWS:
+            self.pos  += 1
+            annotation = RULE_KWS[tok.text]
+            body       = self.term_list()
+            conditions = self.if_conds() or []
+            self.semi()
+            if annotation in GENERATION_KWS:
+                return ASTs.GenerationRuleAST(head, body, conditions, annotation=annotation, parse_loc=self.loc(start))
+
+            return ASTs.InertialRuleAST(head, body, conditions, annotation=annotation, parse_loc=self.loc(start))
+
+        self.word("when")
+        conditions = self.conditions()
+        self.semi()
+        return ASTs.TransientRuleAST(None, [head], conditions, annotation=ASTs.RuleEnum.transient, parse_loc=self.loc(start))
+
+    def initially(self) -> ASTs.InitiallyAST:
+        start      = self.tokens[self.pos]
+        self.word("initially")
+        body       = self.term_list()
+        conditions = self.if_conds()
+        self.semi()
+        # Without conditions, pyparsing's empty result is ''
+        return ASTs.InitiallyAST(body, conditions if conditions is not None else '', parse_loc=self.loc(start))
+
+    def link(self) -> ASTs.BridgeLinkAST:
+        start = self.tokens[self.pos]
+        if not self.is_kw(start) or start.text not in LINK_KWS:
+            self.fail("source or sink")
+
+        self.pos += 1
+        head = self.term()
+        self.semi()
+        return ASTs.BridgeLinkAST(head, link_type=LINK_KWS[start.text], parse_loc=self.loc(start))
+
+    def skip_body_ln(self) -> None:
+        self.ln()
+        return None
+
+    ##-- end declarations
+
+    ##-- structures
+    def structure(self, head:ASTs.InstitutionDefAST, body:list[Callable]) -> ASTs.InstitutionDefAST:
+        """ The body of an institution or bridge, as construct.institution """
+        while True:
+            for alt in body:
+                matched, elem = self.attempt(alt)
+                if matched:
+                    break
+            else:
+                return head
+
+            match elem:
+                case None:
+                    pass
+                case ASTs.FluentAST():
+                    head.fluents.append(elem)
+                case ASTs.EventAST():
+                    head.events.append(elem)
+                case ASTs.DomainSpecAST():
+                    head.types.append(elem)
+                case ASTs.RuleAST():
+                    head.rules.append(elem)
+                case ASTs.InitiallyAST():
+                    head.initial.append(elem)
+                case ASTs.BridgeLinkAST():
+                    head.links.append(elem)
+
+    def institution(self) -> ASTs.InstitutionDefAST:
+        start = self.tokens[self.pos]
+        self.word("institution")
+        head  = self.term()
+        self.semi()
+        inst  = ASTs.InstitutionDefAST(head, parse_loc=self.loc(start))
+        return self.structure(inst, [self.skip_body_ln, self.type_dec, self.event,
+                                     self.fluent, self.rule, self.initially])
+
+    def bridge(self) -> ASTs.BridgeDefAST:
+        start = self.tokens[self.pos]
+        self.word("bridge")
+        head  = self.term()
+        self.semi()
+        bridge = ASTs.BridgeDefAST(head, parse_loc=self.loc(start))
+        return self.structure(bridge, [self.link, self.type_dec, self.event,
+                                       self.fluent, self.rule, self.initially])
+
+    def domain_spec(self) -> ASTs.DomainSpecAST:
+        start = self.tokens[self.pos]
+        head  = self.term()
+        self.punct(":")
+        body  = [self.term()] + self.terms()
+        self.line_end()
+        return ASTs.DomainSpecAST(head, body, parse_loc=self.loc(start))
+
+    def fact(self) -> ASTs.InitiallyAST:
+        start   = self.tokens[self.pos]
+        negated = self.at_word("not")
+        if negated:
+            self.pos += 1
+        self.word("initially")
+        body = self.term()
+        self.word("in")
+        inst = self.term()
+        # The grammar parses, but doesn't keep, a situation's conditions
+        self.if_conds()
+        self.line_end()
+        if body.has_var:
+            self.fail("a ground fact")
+
+        return ASTs.InitiallyAST([body], conditions='', inst=inst, negated=negated, parse_loc=self.loc(start))
+
+    def query(self) -> ASTs.QueryAST:
+        start   = self.tokens[self.pos]
+        negated = self.at_word("not")
+        if negated:
+            self.pos += 1
+        self.word("observed")
+        head = self.term()
+        time = 0
+        if self.at_word("at"):
+            tok = self.tokens[self.pos + 1]
+            if tok.kind == "num" and tok.text.isdigit():
+                self.pos += 2
+                time = int(tok.text)
+
+        conditions = self.if_conds() or []
+        self.semi()
+        return ASTs.QueryAST(head, time=time, negated=negated, conditions=conditions, parse_loc=self.loc(start))
+
+    def one_or_more(self, rule:Callable, trailing_ln:bool=False) -> list:
+        """ The top level of a file: one or more of rule, then the end of the text """
+        try:
+            result = [rule()]
+            while True:
+                if trailing_ln:
+                    self.skip_ln()
+                matched, elem = self.attempt(rule)
+                if not matched:
+                    break
+                result.append(elem)
+
+            self.finish()
+        except _Backtrack:
+            raise self.error() from None
+
+        return result
+
+    ##-- end structures
+
+##-- interface implementation
+class InstalDescentParser(InstalParser_i):
+    """
+    The v2 DSL parser, as recursive descent over a regex tokenizer.
+    A faster alternative to InstalPyParser, with the same results
+    """
+
+    def _parse(self, rule:str, text:str, trailing_ln:bool=False) -> list[ASTs.InstalAST]:
+        state = DescentState(text)
+        try:
+            return state.one_or_more(getattr(state, rule), trailing_ln=trailing_ln)
+        except pp.ParseBaseException as err:
+            logging.warning(f"(Line {err.lineno} Column {err.col}) : Parser {rule} : {err.mark_input_line()}")
+            if SUPPRESS_PARSER_EXCEPTION_TRACE:
+                err.__traceback__ = None
+            raise err from err
+
+    @cached_parse
+    def parse_institution(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.InstitutionDefAST]:
+        """ Mainly for .ial's """
+        logging.debug("Parsing Institution, parse_source: %s", parse_source)
+        text, parse_source = maybe_read_path(text, parse_source)
+        with ASTs.InstalAST.manage_source(parse_source):
+            return self._parse("institution", text.strip(), trailing_ln=True)
+
+    @cached_parse
+    def parse_bridge(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.BridgeDefAST]:
+        """ Mainly for .iab's """
+        logging.debug("Parsing Bridge, parse_source: %s", parse_source)
+        text, parse_source = maybe_read_path(text, parse_source)
+        with ASTs.InstalAST.manage_source(parse_source):
+            return self._parse("bridge", text.strip(), trailing_ln=True)
+
+    @cached_parse
+    def parse_domain(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.DomainSpecAST]:
+        """ For .idc's """
+        logging.debug("Parsing Domain, parse_source: %s", parse_source)
+        text, parse_source = maybe_read_path(text, parse_source)
+        with ASTs.InstalAST.manage_source(parse_source):
+            return self._parse("domain_spec", text)
+
+    @cached_parse
+    def parse_situation(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.InitiallyAST]:
+        """ Mainly for .iaf's """
+        logging.debug("Parsing Situation, parse_source: %s", parse_source)
+        text, parse_source = maybe_read_path(text, parse_source)
+        with ASTs.InstalAST.manage_source(parse_source):
+            return self._parse("fact", text)
+
+    @cached_parse
+    def parse_query(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.QueryAST]:
+        """ Mainly for .iaq's """
+        logging.debug("Parsing Query, parse_source: %s", parse_source)
+        text, parse_source = maybe_read_path(text, parse_source)
+        with ASTs.InstalAST.manage_source(parse_source):
+            return self._parse("query", text)
+
+##-- end interface implementation
@@ -0,0 +1,194 @@
+#/usr/bin/env python3,
+"""
+A precompiled form of the institution and bridge grammars,
+producing the same ASTs as institution_parse_funcs and bridge_parse_funcs,
+for InstalPyParser(fast=True).
+
+The differences are only in how the grammar is built:
+- term values (var | name | num) are a single regex,
+- keyword alternatives (event, fluent, rule annotations) are single regexs,
+- rules are factored on their head term, so the head is parsed once,
+  instead of once for each of generation, inertial and transient rules,
+- conditions are factored on their first term, instead of backtracking
+  from a failed comparison,
+- keyword led declarations are tried before rules.
+
+Packrat caching is not enabled: every parse action builds a fresh ast,
+and once the alternatives are factored there is little backtracking for it to save.
+Measured, it made parsing slower.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import re
+
+import pyparsing as pp
+import instal.interfaces.ast as ASTs
+import instal.parser.v2.constructors as construct
+import instal.parser.v2.utils as PU
+import instal.parser.v2.institution_parse_funcs as IPF
+import instal.parser.v2.bridge_parse_funcs as BPF
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+##-- util imports
+s       = PU.s
+op      = PU.op
+zrm     = PU.zrm
+orm     = PU.orm
+s_kw    = PU.s_kw
+ln      = PU.ln
+comment = PU.comment
+semi    = PU.semi
+op_lits = PU.op_lits
+
+##-- end util imports
+
+##-- util
+# Matches pyparsing's Keyword: not preceded or followed by an identifier character
+IDENT_CHARS = re.escape(pp.Keyword.DEFAULT_KEYWORD_CHARS)
+
+def kw_regex(words:list[str]) -> pp.Regex:
+    """ A single regex equivalent to pp.MatchFirst(pp.Keyword(x) for x in words) """
+    alts = "|".join(re.escape(x) for x in words)
+    return pp.Regex(rf"(?<![{IDENT_CHARS}])(?:{alts})(?![{IDENT_CHARS}])")
+
+event_kws      = kw_regex([x.replace('_', ' ') for x in list(ASTs.EventEnum.__members__.keys()) + ["exo", "inst", "viol", "external"]])
+fluent_kws     = kw_regex([x.replace('_', ' ') for x in list(ASTs.FluentEnum.__members__.keys()) + ["x", "obl"]])
+rule_kws       = kw_regex(["generates", "xgenerates", "initiates", "terminates", "xinitiates", "xterminates"])
+not_kw         = kw_regex(["not"])
+
+##-- end util
+
+##-- term parser
+def term_value(string, loc, toks):
+    """
+    The same (is_var, value) pair as PU.var, PU.name and PU.num,
+    wrapped so the pair is a single token
+    """
+    match toks[0]:
+        case str() as val if val[0].isupper():
+            return [(True, val)]
+        case str() as val if val[0].islower() or val[0] == "_":
+            return [(False, val)]
+        case val:
+            return [(False, int(val))]
+
+value = pp.Regex(r"[A-Z][a-zA-Z0-9]*|[a-z_][a-zA-Z0-9_]*|[+-]?\d+")
+value.set_parse_action(term_value)
+value.set_name("term value")
+
+TERM      = pp.Forward()
+TERM.set_name("term")
+term_list = pp.delimited_list(op(ln) + TERM)
+term_list.set_name("Term Parameters")
+
+TERM  <<= value("value") + op(PU.lit("(") + term_list("params") + PU.lit(")"))
+TERM.set_parse_action(construct.term)
+TERM.set_name("term")
+
+##-- end term parser
+
+##-- conditions
+def condition(s, l, t):
+    if 'op' in t:
+        return ASTs.ConditionAST(t['head'], False, operator=t['op'], rhs=t['rhs'], parse_loc=(pp.lineno(l, s), pp.col(l, s)))
+
+    return ASTs.ConditionAST(t['head'], 'not' in t, parse_loc=(pp.lineno(l, s), pp.col(l, s)))
+
+# 'not' first, as PU.COMPARISON would parse it as a term.
+# The action is on each alternative, as a MatchFirst doesn't skip whitespace
+# before its actions, so would give the wrong parse_loc on continuation lines
+NEGATED     = not_kw("not") + TERM("head")
+NEGATED.set_parse_action(condition)
+COMPARISON  = TERM("head") + op(op_lits("op") + TERM("rhs"))
+COMPARISON.set_parse_action(condition)
+# Without an operator, PU.CONDITION would take 'not' as the keyword, and fail
+COMPARISON.add_condition(lambda s, l, t: t[0].operator is not None or t[0].head.value != "not")
+
+CONDITION   = NEGATED | COMPARISON
+CONDITION.set_name("condition")
+
+CONDITIONS  = pp.DelimitedList(op(ln) + CONDITION)
+CONDITIONS.set_name("Condition list")
+
+if_conds    = op(op(ln) + s_kw("if") + CONDITIONS)
+##-- end conditions
+
+##-- rules
+RULE        = (TERM("head")
+               + ((rule_kws("annotation") + term_list("body") + if_conds("conditions"))
+                  | (s_kw("when") + CONDITIONS("conditions")))
+               + semi)
+RULE.set_parse_action(construct.rule)
+RULE.set_name("rule")
+
+##-- end rules
+
+##-- types, fluents, events
+type_vals   = PU.s_lit(":") + orm(TERM)("body")
+TYPE_DEC    = s_kw("type") + TERM('head') + op(type_vals) + semi
+TYPE_DEC.add_parse_action(IPF.TYPE_DEC.parseAction[0])
+TYPE_DEC.set_name("type_dec")
+
+FLUENT      = op(fluent_kws)("annotation") + s_kw("fluent") + TERM("head") + semi
+FLUENT.set_parse_action(construct.fluent)
+FLUENT.set_name("fluent")
+
+EVENT       = event_kws('annotation')  + s_kw("event")  + TERM("head") + semi
+EVENT.set_parse_action(construct.event)
+EVENT.set_name("event")
+
+INITIALLY   = s_kw("initially") + term_list("body") + if_conds("conditions") + semi
+INITIALLY.set_parse_action(IPF.INITIALLY.parseAction[0])
+INITIALLY.set_name("initially")
+
+INSTITUTION = s_kw("institution") + TERM("head") + semi
+INSTITUTION.set_parse_action(IPF.INSTITUTION.parseAction[0])
+INSTITUTION.set_name("institution head")
+
+BRIDGE      = s_kw("bridge") + TERM("head") + semi
+BRIDGE.set_parse_action(BPF.BRIDGE.parseAction[0])
+
+BRIDGE_LINK = BPF.link_kws("link_type") + TERM("head") + semi
+BRIDGE_LINK.set_parse_action(BPF.BRIDGE_LINK.parseAction[0])
+##-- end types, fluents, events
+
+##-- top level parser entry points
+# Initially is tried before rules, as a rule would parse 'initially' as its head term
+institution_structure = (INSTITUTION('head')
+                         + zrm(ln
+                               | TYPE_DEC
+                               | EVENT
+                               | FLUENT
+                               | INITIALLY
+                               | RULE) ('body'))
+institution_structure.set_parse_action(construct.institution)
+institution_structure.set_name("Institution Structure")
+
+top_institution = orm(institution_structure + zrm(ln))
+top_institution.ignore(comment)
+top_institution.set_name("Institutions")
+top_institution.streamline()
+
+bridge_structure = (BRIDGE('head')
+                    + zrm(BRIDGE_LINK
+                          | TYPE_DEC
+                          | EVENT
+                          | FLUENT
+                          | INITIALLY
+                          | RULE)('body'))
+bridge_structure.set_parse_action(construct.institution)
+bridge_structure.set_name("Bridge Structure")
+
+top_bridge = orm(bridge_structure + zrm(ln))
+top_bridge.ignore(comment)
+top_bridge.set_name("Bridges")
+top_bridge.streamline()
+
+##-- end top level parser entry points
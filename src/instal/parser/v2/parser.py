@@ -19,12 +19,12 @@ from uuid import UUID, uuid1
 from weakref import ref
 
 import pyparsing as pp
-from instal.interfaces.parser import InstalParser_i
+from instal.interfaces.parser import InstalParser_i, cached_parse
 import instal.interfaces.ast as ASTs
 import instal.parser.v2.parse_funcs as PF
 import instal.parser.v2.institution_parse_funcs as IPF
 import instal.parser.v2.bridge_parse_funcs as BPF
-from instal.defaults import SUPPRESS_PARSER_EXCEPTION_TRACE
+from instal.defaults import SUPPRESS_PARSER_EXCEPTION_TRACE, FAST_PARSE
 from instal.util.misc import maybe_read_path
 
 if TYPE_CHECKING:
@@ -38,14 +38,26 @@ logging = logmod.getLogger(__name__)
 
 ##-- interface implementation
 class InstalPyParser(InstalParser_i):
+    """
+    The v2 DSL parser.
+    With fast=True, institutions and bridges are parsed with the precompiled
+    grammar of fast_parse_funcs, which produces the same asts.
+    Defaults to defaults.FAST_PARSE
+    """
 
+    def __init__(self, *, fast:None|bool=None, ast_cache=None):
+        super().__init__(ast_cache=ast_cache)
+        self.fast = FAST_PARSE if fast is None else fast
+
+
+    @cached_parse
     def parse_institution(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.InstitutionDefAST]:
         """ Mainly for .ial's """
         logging.debug("Parsing Institution, parse_source: %s", parse_source)
         text, parse_source = maybe_read_path(text, parse_source)
         with ASTs.InstalAST.manage_source(parse_source):
             try:
-                result = IPF.top_institution.parse_string(text.strip(), parse_all=True)[:]
+                result = self._top_institution().parse_string(text.strip(), parse_all=True)[:]
             except pp.ParseBaseException as err:
                 logging.warning(f"(Line {err.lineno} Column {err.col}) : Parser {err.parser_element} : {err.markInputline()}")
                 if SUPPRESS_PARSER_EXCEPTION_TRACE:
@@ -54,13 +66,14 @@ class InstalPyParser(InstalParser_i):
 
         return result
 
+    @cached_parse
     def parse_bridge(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.BridgeDefAST]:
         """ Mainly for .iab's """
         logging.debug("Parsing Bridge, parse_source: %s", parse_source)
         text, parse_source = maybe_read_path(text, parse_source)
         with ASTs.InstalAST.manage_source(parse_source):
             try:
-                result = BPF.top_bridge.parse_string(text.strip(), parse_all=True)[:]
+                result = self._top_bridge().parse_string(text.strip(), parse_all=True)[:]
             except pp.ParseBaseException as err:
                 logging.warning(f"(Line {err.lineno} Column {err.col}) : Parser {err.parser_element} : {err.markInputline()}")
                 if SUPPRESS_PARSER_EXCEPTION_TRACE:
@@ -69,6 +82,7 @@ class InstalPyParser(InstalParser_i):
 
         return result
 
+    @cached_parse
     def parse_domain(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.DomainSpecAST]:
         """ For .idc's """
         logging.debug("Parsing Domain, parse_source: %s", parse_source)
@@ -84,6 +98,7 @@ class InstalPyParser(InstalParser_i):
 
         return result
 
+    @cached_parse
     def parse_situation(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.InitiallyAST]:
         """ Mainly for .iaf's """
         logging.debug("Parsing Situation, parse_source: %s", parse_source)
@@ -99,6 +114,7 @@ class InstalPyParser(InstalParser_i):
 
         return result
 
+    @cached_parse
     def parse_query(self, text:str|pl.Path, *, parse_source:str=None) -> list[ASTs.QueryAST]:
         """ Mainly for .iaq's """
         logging.debug("Parsing Query, parse_source: %s", parse_source)
@@ -114,4 +130,18 @@ class InstalPyParser(InstalParser_i):
 
         return result
 
+    def _top_institution(self) -> pp.ParserElement:
+        if self.fast:
+            import instal.parser.v2.fast_parse_funcs as FPF
+            return FPF.top_institution
+
+        return IPF.top_institution
+
+    def _top_bridge(self) -> pp.ParserElement:
+        if self.fast:
+            import instal.parser.v2.fast_parse_funcs as FPF
+            return FPF.top_bridge
+
+        return BPF.top_bridge
+
 ##-- end interface implementation
@@ -0,0 +1,80 @@
+#/usr/bin/env python3
+"""
+A regex tokenizer for the v2 DSL, for the recursive descent parser.
+
+Tokens are the units the pyparsing grammar matches:
+vars, names, numbers, comparison operators and punctuation,
+with newlines kept as tokens, as they are significant in the DSL.
+
+Spaces, tabs and comments ( % ... up to and including the newline )
+are dropped, as the pyparsing grammar ignores them everywhere.
+Anything else is an 'error' token, for the parser to fail on.
+
+Names and vars written directly after a number, eg: the 'if' of '3if',
+are marked as glued. pyparsing Keywords need a word boundary before them,
+so glued tokens can be terms, but never keywords.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import re
+from dataclasses import dataclass
+from typing import Final
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+# Group order matters: comparison operators are longest first,
+# as in PU.op_lits
+TOKEN_RE : Final[re.Pattern] = re.compile(r"""
+ (?P<ws>[ \t]+)
+|(?P<comment>%[^\n]+\n)
+|(?P<nl>\n)
+|(?P<cr>\r)
+|(?P<var>[A-Z][a-zA-Z0-9]*)
+|(?P<name>[a-z_][a-zA-Z0-9_]*)
+|(?P<num>[+-]?\d+)
+|(?P<op><=|>=|<>|!=|<|>|==|=)
+|(?P<punct>[(),;.:])
+|(?P<error>.)
+""", re.VERBOSE)
+
+DROPPED    : Final[frozenset[str]] = frozenset(["ws", "comment"])
+WORD_KINDS : Final[frozenset[str]] = frozenset(["name", "var"])
+
+@dataclass(slots=True)
+class Token:
+    """ A token, with its position in the text as pyparsing would report it """
+    kind : str
+    text : str
+    loc  : int
+    line : int
+    col  : int
+    glued : bool = False
+
+    def __repr__(self):
+        return f"<{self.kind}:{self.text!r} {self.line}:{self.col}>"
+
+def tokenize(text:str) -> list[Token]:
+    """ The significant tokens of text, in order """
+    tokens    = []
+    line      = 1
+    last_nl   = -1
+    num_end   = None
+    for match in TOKEN_RE.finditer(text):
+        kind  = match.lastgroup
+        start = match.start()
+        if kind not in DROPPED:
+            glued = kind in WORD_KINDS and start == num_end
+            tokens.append(Token(kind, match.group(), start, line, start - last_nl, glued))
+            num_end = match.end() if kind == "num" else None
+
+        if kind == "nl" or kind == "comment":
+            line    += 1
+            last_nl  = match.end() - 1
+
+    return tokens
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+##-- end imports
+
+import asyncio
+from dataclasses import replace
+from importlib.resources import files
+
+import pytest
+from clingo import parse_term
+from instal import defaults
+from instal.compiler.domain_compiler import InstalDomainCompiler
+from instal.compiler.institution_compiler import InstalInstitutionCompiler
+from instal.compiler.query_compiler import InstalQueryCompiler
+from instal.interfaces.ast import RuleEnum
+from instal.parser.v2.parser import InstalPyParser
+from instal.solve.clingo_incremental_solver import ClingoIncrementalSolver
+from instal.solve.clingo_solver import ClingoSolver
+
+logging = logmod.root
+
+PROGRAM = """
+#program base.
+start(0).
+
+#program step(t).
+instant(t).
+count(t) :- instant(t).
+
+#program check(t).
+#external query(t).
+final(t) :- query(t).
+"""
+
+INSTITUTION = """institution test;
+type Agent;
+exo event go(Agent);
+inst event went(Agent);
+inst event arrived(Agent);
+fluent moving(Agent);
+go(Agent) generates went(Agent);
+went(Agent) generates arrived(Agent);
+went(Agent) initiates moving(Agent);
+arrived(Agent) terminates moving(Agent);
+initially power(went(alice)), permitted(went(alice)), power(arrived(alice)), permitted(arrived(alice));
+"""
+
+def solve_institution(delay:int, incremental:bool, horizon:int=4) -> list[list[str]]:
+    """
+    Compile and solve INSTITUTION, with its generation rules delayed,
+    returning the sorted holdsat atoms of each model, with its occurred atoms up to the horizon.
+    (one-shot solving also derives delayed events after its final instant,
+    which the incremental solver never grounds)
+    """
+    parser = InstalPyParser()
+    inst   = parser.parse_institution(INSTITUTION)[0]
+    rules  = [replace(x, delay=delay) if x.annotation is RuleEnum.generates else x for x in inst.rules]
+    text   = "\n".join([InstalInstitutionCompiler(incremental=incremental).compile([replace(inst, rules=rules)]),
+                        InstalDomainCompiler().compile(parser.parse_domain("Agent: alice\n")),
+                        InstalQueryCompiler().compile(parser.parse_query("observed go(alice) at 0\n"))])
+    prelude = files(defaults.STANDARD_PRELUDE_INCREMENTAL_loc if incremental else defaults.STANDARD_PRELUDE_loc)
+    prelude = sorted(x for x in prelude.iterdir() if x.suffix == defaults.COMPILED_EXT)
+    if incremental:
+        solver = ClingoIncrementalSolver(text, input_files=prelude, options=["-n", "0"], horizon=horizon)
+    else:
+        solver = ClingoSolver(text, input_files=prelude, options=["-n", "0", "-c", f"horizon={horizon}"])
+
+    solver.solve()
+    return sorted(sorted(str(x) for x in result.shown
+                         if x.name == "holdsat"
+                         or (x.name == "occurred" and x.arguments[-1].number <= horizon))
+                  for result in solver.results)
+
+class TestClingoIncrementalSolver:
+
+    def test_initial(self):
+        solver = ClingoIncrementalSolver(PROGRAM)
+        assert(isinstance(solver, ClingoIncrementalSolver))
+        assert(solver.ctl is not None)
+
+    def test_initial_grounding(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=3)
+        assert(solver.current_step == 3)
+
+    def test_basic_solve(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        count  = solver.solve()
+        assert(count == 1)
+        atoms  = solver.results[0].atoms
+        assert(parse_term("instant(2)") in atoms)
+        assert(parse_term("instant(3)") not in atoms)
+        assert(parse_term("final(2)") in atoms)
+
+    def test_extend(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        solver.extend()
+        assert(solver.current_step == 3)
+        solver.extend(2)
+        assert(solver.current_step == 5)
+
+    def test_solve_extends_horizon(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        solver.solve()
+        solver.solve(horizon=4)
+        assert(solver.current_step == 4)
+        atoms = solver.results[-1].atoms
+        assert(parse_term("instant(4)") in atoms)
+        assert(parse_term("final(4)") in atoms)
+        # The released query is no longer final:
+        assert(parse_term("final(2)") not in atoms)
+
+    def test_solve_shorter_horizon_is_fresh(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=4)
+        solver.solve()
+        solver.solve(horizon=1)
+        assert(solver.current_step == 1)
+        assert(len(solver.results) == 1)
+        assert(parse_term("instant(2)") not in solver.results[0].atoms)
+
+    def test_metadata(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        solver.solve()
+        assert(solver.metadata['mode'] == "incremental")
+        assert(solver.metadata['horizon'] == 2)
+
+    def test_reset_keeps_final_query(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        solver.solve()
+        solver.reset()
+        assert(not bool(solver.results))
+        solver.solve()
+        assert(parse_term("final(2)") in solver.results[0].atoms)
+
+    def test_iter_models(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        models = list(solver.iter_models(horizon=3))
+        assert(len(models) == 1)
+        assert(parse_term("final(3)") in models[0].atoms)
+        assert(not bool(solver.results))
+
+    def test_async_solve(self):
+        solver = ClingoIncrementalSolver(PROGRAM, horizon=2)
+        count  = asyncio.run(solver.async_solve(horizon=3))
+        assert(count == 1)
+        assert(solver.current_step == 3)
+        assert(parse_term("final(3)") in solver.results[0].atoms)
+
+class TestIncrementalEquivalence:
+
+    @pytest.mark.parametrize("delay", [0, 1, 2])
+    def test_matches_one_shot(self, delay):
+        one_shot    = solve_institution(delay, incremental=False)
+        incremental = solve_institution(delay, incremental=True)
+        assert(bool(one_shot))
+        assert(incremental == one_shot)
+
+    def test_delay_applied(self):
+        models = solve_institution(2, incremental=True)
+        assert(all("occurred(went(alice),test,0)" not in x for x in models))
+        assert(all("occurred(went(alice),test,2)" in x for x in models))
+
+    def test_fluents_hold_after_horizon(self):
+        models = solve_institution(0, incremental=True, horizon=4)
+        assert(all("holdsat(live(test),test,5)" in x for x in models))
+        assert(all(not x.startswith("occurred") or not x.endswith(",5)") for y in models for x in y))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+##-- end imports
+
+import pytest
+from clingo import Control, parse_term
+from instal.solve.clingo_program import ClingoProgram
+from instal.solve.clingo_solver import ClingoSolver
+from instal.solve.solver_pool import SolverPool
+
+logging = logmod.root
+
+PROGRAM = "#external testVal(1..3). a. b :- testVal(1)."
+
+class TestClingoProgram:
+
+    def test_initial(self):
+        program = ClingoProgram(PROGRAM)
+        assert(isinstance(program, ClingoProgram))
+        assert(bool(program.statements))
+        assert(bool(program.digest))
+
+    def test_digest(self):
+        assert(ClingoProgram(PROGRAM).digest == ClingoProgram(PROGRAM).digest)
+        assert(ClingoProgram(PROGRAM).digest != ClingoProgram("a.").digest)
+
+    def test_add_to(self):
+        ctl = Control()
+        ClingoProgram("a. b :- a.").add_to(ctl)
+        ctl.ground([("base", [])])
+        models = []
+        ctl.solve(on_model=lambda m: models.append(m.symbols(atoms=True)))
+        assert(set(models[0]) == {parse_term("a"), parse_term("b")})
+
+    def test_program_name(self):
+        ctl = Control()
+        ClingoProgram("a.", program_name="other").add_to(ctl)
+        ctl.ground([("base", [])])
+        models = []
+        ctl.solve(on_model=lambda m: models.append(m.symbols(atoms=True)))
+        assert(not bool(models[0]))
+
+    def test_files(self, tmp_path):
+        target = tmp_path / "test.lp"
+        target.write_text("c.")
+        program = ClingoProgram("a.", files=[target])
+        assert("c." in str(program))
+        assert("a." in str(program))
+
+    def test_solver(self):
+        solver = ClingoSolver(ClingoProgram(PROGRAM))
+        assert(solver.solve(["testVal(1)"]) == 1)
+        assert(parse_term("b") in solver.results[0].atoms)
+
+    def test_solver_fresh(self):
+        solver = ClingoSolver(ClingoProgram(PROGRAM))
+        solver.solve(["testVal(1)"])
+        solver.solve(fresh=True)
+        assert(parse_term("b") not in solver.results[0].atoms)
+
+    def test_pool(self):
+        pool    = SolverPool()
+        program = ClingoProgram(PROGRAM)
+        with pool.lease(program) as solver:
+            first = solver
+
+        with pool.lease(ClingoProgram(PROGRAM)) as solver:
+            assert(solver is first)
+
+    def test_pool_parses_text_once(self):
+        pool = SolverPool()
+        pool.warm(PROGRAM)
+        solvers = list(pool._idle[pool.key(PROGRAM)])
+        assert(len(solvers) == 2)
+        assert(isinstance(solvers[0].program, ClingoProgram))
+        assert(solvers[0].program is solvers[1].program)
+
+    def test_pool_profile_keeps_text(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM, profile=True) as solver:
+            assert(isinstance(solver.program, str))
+            assert(solver.profiler is not None)
+
+    def test_profile_rejected(self):
+        with pytest.raises(ValueError):
+            ClingoSolver(ClingoProgram(PROGRAM), profile=True)
@@ -14,9 +14,11 @@ from typing import (Any, Callable, ClassVar, Generic, Iterable, Iterator,
                     TypeVar, cast)
 ##-- end imports
 
+import asyncio
+import time
 import pytest
 from clingo import Control, parse_term, Function, Number
-from instal.solve.clingo_solver import ClingoSolver
+from instal.solve.clingo_solver import PRUNE_CAPTURED, ClingoSolver
 import instal.interfaces.solver as iSolve
 
 logging = logmod.root
@@ -25,7 +27,7 @@ class TestInstalClingoSolver:
 
     def test_initial(self):
         solver = ClingoSolver()
-        self.assert(isinstance(solver, ClingoSolver)
+        assert(isinstance(solver, ClingoSolver))
 
     def test_solver_initialisation(self):
         solver = ClingoSolver()
@@ -45,7 +47,7 @@ class TestInstalClingoSolver:
         count = solver.solve()
         assert(count == 1)
         model = solver.results[0]
-        assert(isinstance(model,iSolve.InstalModelResult)
+        assert(isinstance(model,iSolve.InstalModelResult))
         assert(all([str(x) in {"a","b","c","d","e"} for x in model.atoms]))
 
     def test_basic_fail(self):
@@ -147,7 +149,7 @@ class TestInstalClingoSolver:
         assert(True)
 
     def test_all_models(self):
-    	# Setup:
+        # Setup:
 
         # Pre-check:
 
@@ -157,6 +159,206 @@ class TestInstalClingoSolver:
 
         assert(True)
 
+    def test_iter_models(self):
+        solver = ClingoSolver("a. b. c. d. e :- a, b, c.")
+        models = list(solver.iter_models())
+        assert(len(models) == 1)
+        assert(isinstance(models[0], iSolve.InstalModelResult))
+        assert(parse_term("e") in models[0].atoms)
+        # Models aren't stored:
+        assert(not bool(solver.results))
+
+    def test_iter_models_all(self):
+        solver = ClingoSolver("{ a; b; c }.", options=['-n', 0])
+        count  = 0
+        for model in solver.iter_models():
+            count += 1
+            assert(isinstance(model, iSolve.InstalModelResult))
+
+        assert(count == 8)
+        assert(solver.current_answer == 8)
+
+    def test_iter_models_early_exit(self):
+        solver = ClingoSolver("{ a; b; c }.", options=['-n', 0])
+        models = solver.iter_models()
+        next(models)
+        models.close()
+        # The solver is still usable:
+        assert(solver.solve() == 8)
+
+    def test_iter_models_assignment(self):
+        solver = ClingoSolver("#external testVal. a.")
+        models = list(solver.iter_models(["testVal"]))
+        assert(parse_term("testVal") in models[0].atoms)
+
+    def test_reset(self):
+        solver = ClingoSolver("#external testVal. a.")
+        solver.solve(["testVal"])
+        solver.reset()
+        assert(not bool(solver.results))
+        solver.solve()
+        assert(parse_term("testVal") not in solver.results[0].atoms)
+
+    def test_reset_discards_regrounded(self):
+        solver = ClingoSolver("#program base. a. #program step(t). b(t).")
+        solver.solve(reground=[("step", [Number(1)])])
+        assert(parse_term("b(1)") in solver.results[0].atoms)
+        solver.reset()
+        assert(not bool(solver.regrounded))
+        solver.solve()
+        assert(parse_term("b(1)") not in solver.results[0].atoms)
+
+    def test_async_solve(self):
+        solver = ClingoSolver("a. b. c. d. e :- a, b, c.")
+        count  = asyncio.run(solver.async_solve())
+        assert(count == 1)
+        assert(parse_term("e") in solver.results[0].atoms)
+        assert(not solver.interrupted)
+
+    def test_async_solve_assignment(self):
+        solver = ClingoSolver("#external testVal. a.")
+        asyncio.run(solver.async_solve(["testVal"]))
+        assert(parse_term("testVal") in solver.results[0].atoms)
+
+    def test_async_solve_max_models(self):
+        solver = ClingoSolver("{ a; b; c }.", options=['-n', 0])
+        count  = asyncio.run(solver.async_solve(max_models=3))
+        assert(count == 3)
+        assert(solver.interrupted)
+
+    def test_async_solve_timeout(self):
+        # A pigeonhole problem clingo can't finish quickly:
+        solver = ClingoSolver("p(1..14). h(1..13). 1 { at(P, H) : h(H) } 1 :- p(P). :- at(P, H), at(Q, H), P < Q.")
+        start  = time.monotonic()
+        count  = asyncio.run(solver.async_solve(timeout=0.2))
+        assert(time.monotonic() - start < 5)
+        assert(count == 0)
+        assert(solver.interrupted)
+        # The solver is still usable:
+        solver.reset()
+        assert(solver.ctl is not None)
+
+    def test_async_solve_cancel(self):
+        solver = ClingoSolver("p(1..14). h(1..13). 1 { at(P, H) : h(H) } 1 :- p(P). :- at(P, H), at(Q, H), P < Q.")
+
+        async def run():
+            task = asyncio.create_task(solver.async_solve())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert(solver.interrupted)
+
+    def test_async_solve_concurrent(self):
+        solvers = [ClingoSolver("{ a; b }.", options=['-n', 0]) for x in range(3)]
+
+        async def run():
+            return await asyncio.gather(*(x.async_solve() for x in solvers))
+
+        assert(asyncio.run(run()) == [4, 4, 4])
+
+    def test_capture_shown(self):
+        solver = ClingoSolver("a. b. c :- a, b. #show c/0.")
+        solver.solve()
+        assert(solver.results[0].atoms == [parse_term("c")])
+        assert(solver.results[0].shown == [parse_term("c")])
+
+    def test_capture_full(self):
+        solver = ClingoSolver("a. b. c :- a, b. #show c/0.", capture=iSolve.CapturePolicy.full)
+        solver.solve()
+        assert(set(solver.results[0].atoms) == {parse_term(x) for x in "abc"})
+        assert(solver.results[0].shown == [parse_term("c")])
+
+    def test_capture_selected(self):
+        solver = ClingoSolver("#external testVal. a. b. c :- a, b. #show c/0.",
+                              capture=iSolve.CapturePolicy.selected,
+                              signatures=[("a", 0), ("testVal", 0)])
+        solver.solve()
+        assert(set(solver.results[0].atoms) == {parse_term("a"), parse_term("c")})
+        solver.solve(["testVal"])
+        assert(set(solver.results[-1].atoms) == {parse_term("a"), parse_term("c"), parse_term("testVal")})
+
+    def test_iter_models_lazy_atoms(self):
+        solver = ClingoSolver("a. b. c :- a, b. #show c/0.")
+        models = solver.iter_models()
+        first  = next(models)
+        assert(not first.loaded)
+        assert(set(first.atoms) == {parse_term(x) for x in "abc"})
+        assert(first.loaded)
+
+    def test_lazy_atoms_dataclass_functions(self):
+        solver = ClingoSolver("a. b. c :- a, b. #show c/0.")
+        first  = next(solver.iter_models())
+        copied = replace(first, number=5)
+        assert(first.loaded)
+        assert(copied.atoms == first.atoms)
+        assert(copied.number == 5)
+        assert(not hasattr(first, "not_a_field"))
+
+    def test_iter_models_settles_unloaded(self):
+        solver = ClingoSolver("a. b. c :- a, b. #show c/0.")
+        models = list(solver.iter_models())
+        assert(models[0].loaded)
+        assert(models[0].atoms == [parse_term("c")])
+
+    def test_timings(self):
+        solver = ClingoSolver("a. b :- a.")
+        assert({"load", "add", "ground"} <= set(solver.timings))
+        assert("solve" not in solver.timings)
+        solver.solve()
+        assert({"solve", "callback"} <= set(solver.timings))
+        assert(all(0 <= x for x in solver.timings.values()))
+
+    def test_statistics(self):
+        solver = ClingoSolver("{a;b;c}.", options=["-n", "0"])
+        assert(not bool(solver.statistics))
+        solver.solve()
+        assert(solver.statistics['models'] == 8)
+        assert({"choices", "conflicts", "rules", "solve_time"} <= set(solver.statistics))
+
+    def test_statistics_iter_models(self):
+        solver = ClingoSolver("{a;b}.", options=["-n", "0"])
+        models = list(solver.iter_models())
+        assert(solver.statistics['models'] == 4)
+        assert(all('found_at' in x.statistics for x in models))
+        assert(all(x.statistics['choices'] == solver.statistics['choices'] for x in models))
+
+    def test_iter_models_prunes_captured(self):
+        solver = ClingoSolver("{a;b;c;d;e;f;g;h}.", options=["-n", "0"])
+        count  = 0
+        for model in solver.iter_models():
+            count += 1
+            assert(len(solver._captured) <= PRUNE_CAPTURED)
+
+        assert(count == 256)
+
+    def test_result_statistics(self):
+        solver = ClingoSolver("{a;b}.", options=["-n", "0"])
+        solver.solve()
+        assert(all({"found_at", "choices", "conflicts", "solve_time"} <= set(x.statistics) for x in solver.results))
+        assert(solver.results[0].statistics['solve_time'] == solver.statistics['solve_time'])
+
+    def test_result_found_at(self):
+        solver = ClingoSolver("{a;b}.", options=["-n", "0"])
+        solver.solve()
+        found = [x.statistics['found_at'] for x in solver.results]
+        assert(found == sorted(found))
+
+    def test_reset_statistics(self):
+        solver = ClingoSolver("a.")
+        solver.solve()
+        solver.reset()
+        assert(not bool(solver.statistics))
+
+    def test_metadata_statistics(self):
+        solver = ClingoSolver("a.")
+        solver.solve()
+        metadata = solver.metadata
+        assert(metadata['statistics']['models'] == 1)
+        assert("ground" in metadata['timings'])
+
     @pytest.mark.skip(reason="TODO")
     def test_file_load(self):
         solver = ClingoSolver([])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+##-- end imports
+
+import pytest
+from clingo import Control, parse_term
+from instal.solve.clingo_solver import ClingoSolver
+from instal.solve.grounding_profiler import GroundingProfiler
+
+logging = logmod.root
+
+PROGRAM = """
+#show b/1. #show c/2. #show d/0.
+a(1..3).
+%@ test.ial:1:1
+% Translation of first
+b(X) :- a(X).
+%@ test.ial:5:1
+% Translation of second
+c(X, Y) :- a(X), a(Y).
+d :- a(_).
+"""
+
+class TestGroundingProfiler:
+
+    def test_initial(self):
+        profiler = GroundingProfiler(PROGRAM)
+        assert(isinstance(profiler, GroundingProfiler))
+        assert(bool(profiler.statements))
+
+    def test_blocks(self):
+        profiler = GroundingProfiler(PROGRAM)
+        assert(len(profiler.entries) == 3)
+        assert(profiler.entries[0].label == "(unattributed)")
+        assert(profiler.entries[1].label == "Translation of first")
+        assert(profiler.entries[1].source == "test.ial:1:1")
+        assert(profiler.entries[2].source == "test.ial:5:1")
+
+    def test_rule_counts(self):
+        profiler = GroundingProfiler(PROGRAM)
+        assert(profiler.entries[0].rules == 1)
+        assert(profiler.entries[1].rules == 1)
+        assert(profiler.entries[2].rules == 2)
+
+    def test_ground_counts(self):
+        ctl      = Control()
+        profiler = GroundingProfiler(PROGRAM)
+        profiler.add_to(ctl)
+        ctl.ground([("base", [])])
+        profiler.collect(ctl)
+        assert(profiler.entries[1].ground == 3)
+        assert(profiler.entries[1].atoms == 3)
+        # 9 instances of c(X,Y), and anonymous variables are projected out of d
+        assert(profiler.entries[2].ground == 10)
+        assert(profiler.entries[2].atoms == 10)
+
+    def test_program_unchanged(self):
+        ctl      = Control()
+        profiler = GroundingProfiler(PROGRAM)
+        profiler.add_to(ctl)
+        ctl.ground([("base", [])])
+        models = []
+        ctl.solve(on_model=lambda m: models.append(m.symbols(shown=True)))
+        assert(parse_term("d") in models[0])
+        assert(parse_term("c(1,3)") in models[0])
+        assert(not any(x.name.startswith("_instalProf") for x in models[0]))
+
+    def test_report_sorted(self):
+        ctl      = Control()
+        profiler = GroundingProfiler(PROGRAM)
+        profiler.add_to(ctl)
+        ctl.ground([("base", [])])
+        lines = profiler.report(ctl).splitlines()
+        assert("Translation of second" in lines[1])
+        assert("Translation of first" in lines[2])
+
+    def test_report_limit(self):
+        ctl      = Control()
+        profiler = GroundingProfiler(PROGRAM)
+        profiler.add_to(ctl)
+        ctl.ground([("base", [])])
+        lines = profiler.report(ctl, limit=1).splitlines()
+        assert("Translation of second" in lines[1])
+        assert(not any("Translation of first" in x for x in lines))
+
+    def test_solver_profile(self):
+        solver = ClingoSolver(PROGRAM, profile=True)
+        assert(solver.solve() == 1)
+        assert(solver.profiler is not None)
+        assert("test.ial:5:1" in solver.grounding_report())
+
+    def test_solver_no_profile(self):
+        solver = ClingoSolver(PROGRAM)
+        assert(solver.profiler is None)
+        with pytest.raises(ValueError):
+            solver.grounding_report()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+##-- end imports
+
+import pytest
+from clingo import Number, parse_term
+from instal.solve.clingo_solver import ClingoSolver
+from instal.solve.solver_pool import SolverPool
+
+logging = logmod.root
+
+PROGRAM = "#external testVal(1..3). a. b :- testVal(1)."
+
+class TestSolverPool:
+
+    def test_initial(self):
+        pool = SolverPool()
+        assert(isinstance(pool, SolverPool))
+        assert(len(pool) == 0)
+
+    def test_lease(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM) as solver:
+            assert(isinstance(solver, ClingoSolver))
+            assert(solver.solve(["testVal(1)"]) == 1)
+
+        assert(len(pool) == 1)
+
+    def test_lease_reuses_solver(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM) as solver:
+            first = solver
+
+        with pool.lease(PROGRAM) as solver:
+            assert(solver is first)
+
+    def test_lease_resets_externals(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM) as solver:
+            solver.solve(["testVal(1)"])
+            assert(parse_term("b") in solver.results[0].atoms)
+
+        with pool.lease(PROGRAM) as solver:
+            assert(not bool(solver.results))
+            solver.solve()
+            assert(parse_term("testVal(1)") not in solver.results[0].atoms)
+            assert(parse_term("b") not in solver.results[0].atoms)
+
+    def test_different_programs(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM) as solver:
+            first = solver
+
+        with pool.lease("a. b. c.") as solver:
+            assert(solver is not first)
+
+        assert(len(pool) == 2)
+
+    def test_different_options(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM, options=['-n', 1]) as solver:
+            first = solver
+
+        with pool.lease(PROGRAM, options=['-n', 0]) as solver:
+            assert(solver is not first)
+
+    def test_concurrent_leases(self):
+        pool = SolverPool(size=2)
+        with pool.lease(PROGRAM) as first:
+            with pool.lease(PROGRAM) as second:
+                assert(first is not second)
+
+        assert(len(pool) == 2)
+
+    def test_size_bound(self):
+        pool = SolverPool(size=1)
+        with pool.lease(PROGRAM) as first:
+            with pool.lease(PROGRAM) as second:
+                pass
+
+        assert(len(pool) == 1)
+
+    def test_warm(self):
+        pool = SolverPool(size=3)
+        pool.warm(PROGRAM)
+        assert(len(pool) == 3)
+        assert(SolverPool.key(PROGRAM) in pool)
+
+    def test_failed_solver_discarded(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM) as solver:
+            solver.ctl = None
+
+        assert(len(pool) == 0)
+
+    def test_clear(self):
+        pool = SolverPool()
+        pool.warm(PROGRAM)
+        pool.clear()
+        assert(len(pool) == 0)
+
+    def test_lease_iter_models(self):
+        pool = SolverPool()
+        with pool.lease(PROGRAM) as solver:
+            models = list(solver.iter_models(["testVal(1)"]))
+            assert(parse_term("b") in models[0].atoms)
+
+        with pool.lease(PROGRAM) as solver:
+            models = list(solver.iter_models())
+            assert(parse_term("b") not in models[0].atoms)
+
+    def test_lease_discards_regrounded(self):
+        pool    = SolverPool()
+        program = PROGRAM + " #program step(t). c(t)."
+        with pool.lease(program) as solver:
+            solver.solve(reground=[("step", [Number(1)])])
+            assert(parse_term("c(1)") in solver.results[0].atoms)
+
+        with pool.lease(program) as solver:
+            solver.solve()
+            assert(parse_term("c(1)") not in solver.results[0].atoms)
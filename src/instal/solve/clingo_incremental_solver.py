@@ -0,0 +1,108 @@
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+from dataclasses import InitVar, dataclass, field
+
+from typing import Iterator
+
+from clingo import Function, Number, Symbol
+from instal.interfaces.ast import InstalAST
+from instal.interfaces.solver import InstalModelResult
+from instal.solve.clingo_solver import ClingoSolver
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+@dataclass
+class ClingoIncrementalSolver(ClingoSolver):
+    """
+    A Clingo Solver for programs compiled with `incremental=True`,
+    against the incremental standard prelude.
+
+    Instead of grounding the entire horizon up front with `-c horizon=N`,
+    grounds `base` once, then `step(t)` and `check(t)` for each instant,
+    reusing the already grounded prefix when the horizon is extended.
+
+    The external `query(t)` marks the current final instant,
+    and is released when the next step is grounded.
+    """
+
+    horizon      : int = field(kw_only=True, default=2)
+    current_step : int = field(init=False, default=-1)
+
+    def __post_init__(self):
+        self.options = self.options or ['-n', 1]
+        super().__post_init__()
+
+    def __repr__(self):
+        return "[Clingo Incremental Solver: {}; Opts: {}; Horizon: {}; Models: {}]".format(self.ctl is not None,
+                                                                                          " ".join(str(x) for x in self.options),
+                                                                                          self.current_step,
+                                                                                          len(self.results))
+
+    def init_solver(self):
+        # Grounds 'base':
+        super().init_solver()
+        self.current_step = -1
+        self.extend(self.horizon + 1)
+
+    def extend(self, steps:int=1):
+        """
+        Ground the next `steps` instants,
+        moving the query(t) marker of the final instant forward
+        """
+        for _ in range(max(0, steps)):
+            if 0 <= self.current_step:
+                self.ctl.release_external(Function("query", [Number(self.current_step)]))
+
+            self.current_step += 1
+            parts = [("step", [Number(self.current_step)]),
+                     ("check", [Number(self.current_step)])]
+            logging.debug("Grounding Step: %s", self.current_step)
+            with self.timed("ground"):
+                self.ctl.cleanup()
+                self.ctl.ground(parts)
+            self.ctl.assign_external(Function("query", [Number(self.current_step)]), True)
+
+    def solve(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None, horizon:None|int=None) -> int:
+        """
+        Solve up to the horizon, extending the grounded program if necessary.
+        A horizon shorter than what has already been grounded requires a fresh solver.
+        """
+        self.ensure_horizon(horizon, fresh=fresh)
+        return super().solve(assignments, reground=reground)
+
+    def iter_models(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None, horizon:None|int=None) -> Iterator[InstalModelResult]:
+        self.ensure_horizon(horizon, fresh=fresh)
+        return super().iter_models(assignments, reground=reground)
+
+    async def async_solve(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None, *, horizon:None|int=None, timeout:None|float=None, max_models:None|int=None) -> int:
+        self.ensure_horizon(horizon, fresh=fresh)
+        return await super().async_solve(assignments, reground=reground, timeout=timeout, max_models=max_models)
+
+    def ensure_horizon(self, horizon:None|int=None, fresh:bool=False):
+        """
+        Ground up to the horizon, reinitialising if it is shorter than the current step
+        """
+        horizon = self.horizon if horizon is None else horizon
+        if fresh or self.ctl is None or horizon < self.current_step:
+            self.horizon = horizon
+            self.init_solver()
+
+        self.horizon = horizon
+        self.extend(self.horizon - self.current_step)
+
+    def reset(self):
+        super().reset()
+        if self.ctl is not None and 0 <= self.current_step:
+            self.ctl.assign_external(Function("query", [Number(self.current_step)]), True)
+
+    @property
+    def metadata(self):
+        data            = super().metadata
+        data['mode']    = "incremental"
+        data['horizon'] = self.current_step
+        return data
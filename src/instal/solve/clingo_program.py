@@ -0,0 +1,69 @@
+#/usr/bin/env python3
+"""
+A compiled program, held as clingo.ast statements instead of text.
+
+Compiled text is parsed by clingo once, then the statements are added
+to each Control with a ProgramBuilder, skipping the text parse
+when building multiple solvers (eg: in a SolverPool), or reinitialising one.
+
+The text compilers remain the source of programs (and of instalc output),
+as building clingo.ast nodes node by node from python is far slower
+than clingo parsing the equivalent text.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib as pl
+from dataclasses import InitVar, dataclass, field
+from hashlib import sha256
+
+from clingo import Control
+from clingo.ast import AST, ProgramBuilder, parse_files, parse_string
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+@dataclass
+class ClingoProgram:
+    """
+    Parsed clingo statements, and a digest of the text they came from.
+
+    Usage:
+        program = ClingoProgram(compiled_text)
+        solver  = ClingoSolver(program, ...)
+    """
+
+    text         : InitVar[None|str]       = None
+    files        : InitVar[list[pl.Path]]  = None
+    program_name : str                     = field(default="base", kw_only=True)
+
+    statements   : list[AST]               = field(init=False, default_factory=list, repr=False)
+    digest       : str                     = field(init=False, default="")
+
+    def __post_init__(self, text, files):
+        hashed = sha256(self.program_name.encode())
+        for path in files or []:
+            logging.debug("Clingo AST Parsing: %s", path)
+            hashed.update(path.read_bytes())
+            parse_files([str(path)], self.statements.append)
+
+        if text:
+            hashed.update(text.encode())
+            # Like ctl.add, statements before any #program directive are part of program_name
+            parse_string(f"#program {self.program_name}.\n{text}", self.statements.append)
+
+        self.digest = hashed.hexdigest()
+
+    def __len__(self):
+        return len(self.statements)
+
+    def __str__(self):
+        return "\n".join(str(x) for x in self.statements)
+
+    def add_to(self, ctl:Control):
+        with ProgramBuilder(ctl) as builder:
+            for statement in self.statements:
+                builder.add(statement)
@@ -2,24 +2,35 @@
 ##-- imports
 from __future__ import annotations
 
+import asyncio
 import warnings
 import logging as logmod
 import os
+from contextlib import contextmanager
 from itertools import cycle, chain
 import time
+import weakref
 from collections import defaultdict
 from dataclasses import InitVar, dataclass, field
 from functools import partial
 from pathlib import Path
-from typing import IO, List
+from typing import IO, Any, Final, Iterator, List
 
 import clingo
 import instal
 from clingo import Control, Function, Number, Symbol, parse_term
 from instal.interfaces.ast import (DomainSpecAST, InitiallyAST, InstalAST,
                                    QueryAST, TermAST)
-from instal.interfaces.solver import InstalModelResult, SolverWrapper_i
+from instal.interfaces.solver import (CapturePolicy, InstalModelResult,
+                                      SolverWrapper_i)
 from instal.compiler.util import CompileUtil
+from instal.solve.clingo_program import ClingoProgram
+from instal.solve.grounding_profiler import GroundingProfiler
+
+try:
+    import resource
+except ImportError:
+    resource = None
 ##-- end imports
 
 ##-- logging
@@ -27,6 +38,9 @@ logging       = logmod.getLogger(__name__)
 clingo_logger = logmod.getLogger(__name__ + ".ffi.clingo")
 ##-- end logging
 
+MODEL_STATISTICS : Final[tuple[str, ...]] = ("choices", "conflicts", "solve_time")
+PRUNE_CAPTURED   : Final[int]             = 64
+
 def clingo_intercept_logger(code, msg):
     """
     Intercepts messages from clingo, and controls
@@ -51,22 +65,121 @@ def model_cb(self, model:clingo.Model):
     NOTE: Clingo Models are destroyed/reallocated on exit of the callback,
     Which is why we don't just store the model itself
     """
-    self.results.append(InstalModelResult(model.symbols(atoms=True),
-                                          model.symbols(shown=True),
-                                          model.cost,
-                                          model.number,
-                                          model.optimality_proven,
-                                          model.type))
+    with self.timed("callback"):
+        self.results.append(self.capture_model(model))
+
+def clingo_statistics(ctl:None|Control) -> dict[str, Any]:
+    """
+    Summarise the statistics of a Control's last solve,
+    and the peak memory of the process
+    """
+    if ctl is None:
+        return {}
+
+    try:
+        stats     = ctl.statistics
+        summary   = stats['summary']
+        solvers   = stats['solving']['solvers']
+        lp        = stats['problem']['lp']
+        generator = stats['problem']['generator']
+    except (KeyError, RuntimeError):
+        return {}
+
+    result = {
+        "models"      : int(summary['models']['enumerated']),
+        "total_time"  : summary['times']['total'],
+        "cpu_time"    : summary['times']['cpu'],
+        "solve_time"  : summary['times']['solve'],
+        "sat_time"    : summary['times']['sat'],
+        "unsat_time"  : summary['times']['unsat'],
+        "choices"     : int(solvers['choices']),
+        "conflicts"   : int(solvers['conflicts']),
+        "restarts"    : int(solvers['restarts']),
+        "rules"       : int(lp['rules']),
+        "atoms"       : int(lp['atoms']),
+        "bodies"      : int(lp['bodies']),
+        "variables"   : int(generator['vars']),
+        "constraints" : int(generator['constraints']),
+    }
+    if resource is not None:
+        # kilobytes on linux, bytes on macos
+        result['max_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return result
+
+def model_to_result(model:clingo.Model, capture:CapturePolicy=CapturePolicy.full, selected:list[Symbol]=None, lazy:bool=False) -> InstalModelResult:
+    """
+    Copy the data of a clingo Model, which is only valid
+    during its callback or iteration step.
+
+    lazy=True defers copying the atoms until they are accessed,
+    which is only valid until the model is released.
+    """
+    shown  = list(model.symbols(shown=True))
+    loader = None
+    match capture:
+        case _ if lazy:
+            atoms  = None
+            loader = lambda: list(model.symbols(atoms=True))
+        case CapturePolicy.full:
+            atoms = list(model.symbols(atoms=True))
+        case CapturePolicy.selected:
+            atoms = select_atoms(model, shown, selected or [])
+        case CapturePolicy.shown:
+            atoms = shown
+
+    return InstalModelResult(atoms,
+                             shown,
+                             model.cost,
+                             model.number,
+                             model.optimality_proven,
+                             model.type,
+                             loader=loader)
+
+def select_atoms(model:clingo.Model, shown:list[Symbol], selected:list[Symbol]) -> list[Symbol]:
+    """ The shown atoms, plus the candidate `selected` atoms true in the model """
+    found = set(shown)
+    return shown + [x for x in selected if x not in found and model.contains(x)]
 
 @dataclass
 class ClingoSolver(SolverWrapper_i):
     """
-    An Oracle that uses Clingo as the solver
+    An Oracle that uses Clingo as the solver.
+    The program can be text, or a ClingoProgram of pre-parsed statements.
+
+    `capture` controls which atoms of each model are copied into results:
+    by default only the shown atoms, as the full model includes
+    every instant, type guard etc, and is rarely needed.
+    With CapturePolicy.selected, atoms of the (name, arity) `signatures` are also captured.
+
+    profile=True instruments the program to attribute its grounding
+    to the DSL declarations it was compiled from. See `grounding_report`.
+    Only text programs can be profiled, as a ClingoProgram has lost the source markers.
+
+    `timings` records the seconds spent loading files, adding the program,
+    grounding (cumulative since initialisation), solving and in model callbacks
+    (for the last solve). For iter_models, solving includes the consumer's time between models.
+    `statistics` summarises clingo's statistics of the last solve.
+    Each result records when it was `found_at`, in seconds since the start of its solve,
+    and the MODEL_STATISTICS of the solve that found it.
+    Clingo only provides those once a solve finishes, so they are added to results then.
     """
 
     options      : list[str]    = field(kw_only=True, default_factory=list)
     ctl          : None|Control = field(init=False, default=None)
     program_name : str          = field(kw_only=True, default="base")
+    interrupted  : bool         = field(init=False, default=False)
+
+    capture      : CapturePolicy         = field(kw_only=True, default=CapturePolicy.shown)
+    signatures   : list[tuple[str, int]] = field(kw_only=True, default_factory=list)
+    _selected    : list[Symbol]          = field(init=False, default_factory=list, repr=False)
+
+    profile      : bool                   = field(kw_only=True, default=False)
+    profiler     : None|GroundingProfiler = field(init=False, default=None, repr=False)
+    _solve_start : float                  = field(init=False, default=0.0, repr=False)
+    _captured    : list[weakref.ref]      = field(init=False, default_factory=list, repr=False)
+    _prune_at    : int                    = field(init=False, default=PRUNE_CAPTURED, repr=False)
+    regrounded   : list[tuple]            = field(init=False, default_factory=list, repr=False)
 
     def __post_init__(self):
         if not self.program and bool(self.input_files):
@@ -83,17 +196,31 @@ class ClingoSolver(SolverWrapper_i):
                                                                   len(self.results))
     def init_solver(self):
         self.results      = []
+        self.timings      = {}
+        self.statistics   = {}
+        self.regrounded   = []
+        if self.profile and isinstance(self.program, ClingoProgram):
+            raise ValueError("Profiling requires a text program, not a ClingoProgram")
+
         default_grounding = [(self.program_name, [])]
         self.ctl          = Control([str(x) for x in self.options], logger=clingo_intercept_logger)
 
-        for path in self.input_files:
-            logging.debug("Clingo Loading: %s", path)
-            assert(path.exists())
-            self.ctl.load(str(path))
+        with self.timed("load"):
+            for path in self.input_files:
+                logging.debug("Clingo Loading: %s", path)
+                assert(path.exists())
+                self.ctl.load(str(path))
 
         try:
-            if self.program:
-                self.ctl.add(self.program_name, [], self.program)
+            with self.timed("add"):
+                match self.program:
+                    case ClingoProgram():
+                        self.program.add_to(self.ctl)
+                    case str() if bool(self.program) and self.profile:
+                        self.profiler = GroundingProfiler(self.program, program_name=self.program_name)
+                        self.profiler.add_to(self.ctl)
+                    case str() if bool(self.program):
+                        self.ctl.add(self.program_name, [], self.program)
 
         except Exception as err:
             logging.exception("Clingo Failed to add Program")
@@ -101,10 +228,119 @@ class ClingoSolver(SolverWrapper_i):
             raise err
 
         logging.debug("Initial Grounding of Program: %s", default_grounding)
-        self.ctl.ground(default_grounding)
+        with self.timed("ground"):
+            self.ctl.ground(default_grounding)
         logging.info("Clingo initialization complete")
 
     def solve(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None) -> int:
+        self.prepare(assignments, fresh=fresh, reground=reground)
+
+        with self.solving():
+            try:
+                on_model_cb = partial(model_cb, self)
+                logging.info("Running Program")
+                self.ctl.solve(on_model=on_model_cb)
+            except Exception as err:
+                logging.warning("Clingo ran into a problem: %s", err)
+                self.ctl = None
+
+        logging.info("There are %s answer sets", len(self.results))
+        return len(self.results)
+
+    def iter_models(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None) -> Iterator[InstalModelResult]:
+        """
+        Solve, yielding each model as it is found instead of storing them in self.results,
+        so enumerating many models uses constant memory.
+        Closing the iterator early cancels the search.
+
+        Until the iterator advances, a result's full atoms are available on access.
+        Afterwards they are whatever the capture policy captures.
+        """
+        self.prepare(assignments, fresh=fresh, reground=reground)
+        self.current_answer = 0
+        with self.solving():
+            try:
+                logging.info("Running Program, yielding models")
+                with self.ctl.solve(yield_=True) as handle:
+                    for model in handle:
+                        self.current_answer = model.number
+                        # The full atoms can be requested while the model is current:
+                        with self.timed("callback"):
+                            result = self.capture_model(model, lazy=True)
+                        try:
+                            yield result
+                        finally:
+                            result.settle(partial(self._settle_atoms, model, result))
+            except Exception as err:
+                logging.warning("Clingo ran into a problem: %s", err)
+                self.ctl = None
+
+        logging.info("Yielded %s answer sets", self.current_answer)
+
+    async def async_solve(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None, *, timeout:None|float=None, max_models:None|int=None) -> int:
+        """
+        Solve in clingo's background thread, awaiting completion without blocking the event loop.
+
+        timeout    : wall clock seconds before the search is cancelled.
+        max_models : stop the search after this many models.
+
+        Models found before a timeout or budget stop are kept in self.results,
+        and self.interrupted is set.
+        Cancelling the awaiting task cancels the search, then propagates.
+        """
+        self.prepare(assignments, fresh=fresh, reground=reground)
+        self.interrupted = False
+        loop             = asyncio.get_running_loop()
+        finished         = loop.create_future()
+        found            = 0
+
+        def on_model(model:clingo.Model) -> bool:
+            nonlocal found
+            found += 1
+            self.current_answer = model.number
+            with self.timed("callback"):
+                self.results.append(self.capture_model(model))
+            if max_models is not None and max_models <= found:
+                logging.info("Model budget reached: %s", max_models)
+                self.interrupted = True
+                return False
+
+            return True
+
+        def on_finish(result:clingo.SolveResult):
+            # Called from clingo's solving thread
+            loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(result))
+
+        with self.solving():
+            try:
+                logging.info("Running Program asynchronously")
+                with self.ctl.solve(on_model=on_model, on_finish=on_finish, async_=True) as handle:
+                    try:
+                        await asyncio.wait_for(asyncio.shield(finished), timeout)
+                    except TimeoutError:
+                        logging.info("Solve timed out after %ss, cancelling", timeout)
+                        self.interrupted = True
+                        handle.cancel()
+                        await finished
+                    except asyncio.CancelledError:
+                        logging.info("Solve cancelled")
+                        self.interrupted = True
+                        handle.cancel()
+                        raise
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                logging.warning("Clingo ran into a problem: %s", err)
+                self.ctl = None
+
+        logging.info("There are %s answer sets", len(self.results))
+        return len(self.results)
+
+    def prepare(self, assignments:list[str|InstalAST|Symbol|tuple[bool, Symbol]]=None, fresh:bool=False, reground:list[tuple]=None):
+        """
+        Ready the solver for solving:
+        initialising if necessary, regrounding, and assigning externals
+        """
         assignments = assignments or []
 
         if fresh or self.ctl is None:
@@ -112,8 +348,15 @@ class ClingoSolver(SolverWrapper_i):
 
         if bool(reground):
             logging.debug("Grounding Program: %s", reground)
-            self.ctl.cleanup()
-            self.ctl.ground(reground)
+            with self.timed("ground"):
+                self.ctl.cleanup()
+                self.ctl.ground(reground)
+            self.regrounded += reground
+
+        if self.capture is CapturePolicy.selected:
+            self._selected = [atom.symbol
+                              for sig in self.signatures
+                              for atom in self.ctl.symbolic_atoms.by_signature(*sig)]
 
         for sym in assignments:
             logging.debug("assigning: %s", sym)
@@ -130,17 +373,88 @@ class ClingoSolver(SolverWrapper_i):
                 case _:
                     raise Exception("Unrecognized situation fact")
 
+
+    @contextmanager
+    def solving(self):
+        """
+        Time a solve, and collect clingo's statistics of it afterwards
+        """
+        self.timings['solve']    = 0.0
+        self.timings['callback'] = 0.0
+        self._solve_start        = time.perf_counter()
+        self._captured           = []
+        self._prune_at           = PRUNE_CAPTURED
         try:
-            on_model_cb = partial(model_cb, self)
-            logging.info("Running Program")
-            self.ctl.solve(on_model=on_model_cb)
-        except Exception as err:
-            logging.warning("Clingo ran into a problem: %s", err)
-            self.ctl = None
+            with self.timed("solve"):
+                yield
+        finally:
+            self.statistics = clingo_statistics(self.ctl)
+            self._add_model_statistics()
+
+    def grounding_report(self, limit:None|int=None) -> str:
+        """ The grounding profile of the program, when solving with profile=True """
+        if self.profiler is None:
+            raise ValueError("Grounding Reports require a text program and profile=True")
+
+        return self.profiler.report(self.ctl, limit=limit)
+
+    def capture_model(self, model:clingo.Model, lazy:bool=False) -> InstalModelResult:
+        """ Copy a model into a result, according to the capture policy """
+        result = model_to_result(model, self.capture, self._selected, lazy=lazy)
+        result.statistics['found_at'] = time.perf_counter() - self._solve_start
+        # weak, so iter_models doesn't keep the results it yields
+        self._captured.append(weakref.ref(result))
+        if self._prune_at <= len(self._captured):
+            # Drop the results already discarded, so streaming stays in constant memory
+            self._captured = [x for x in self._captured if x() is not None]
+            self._prune_at = max(PRUNE_CAPTURED, 2 * len(self._captured))
+
+        return result
+
+    def _add_model_statistics(self):
+        """ Copy the solve's statistics into the results it found, once clingo provides them """
+        summary = {k : self.statistics[k] for k in MODEL_STATISTICS if k in self.statistics}
+        for ref in self._captured:
+            match ref():
+                case None:
+                    pass
+                case result:
+                    result.statistics.update(summary)
+
+        self._captured = []
+
+    def _settle_atoms(self, model:clingo.Model, result:InstalModelResult) -> list[Symbol]:
+        match self.capture:
+            case CapturePolicy.full:
+                return list(model.symbols(atoms=True))
+            case CapturePolicy.selected:
+                return select_atoms(model, result.shown, self._selected)
+            case _:
+                return result.shown
+
+    def reset(self):
+        """
+        Return the solver to its state after initial grounding:
+        every #external is assigned false, and results are discarded.
+        Parts grounded by `reground` can't be removed from a control,
+        so if there are any, the control is rebuilt instead
+        """
+        if bool(self.regrounded):
+            logging.info("Rebuilding solver, to discard regrounded parts: %s", self.regrounded)
+            self.init_solver()
 
-        logging.info("There are %s answer sets", len(self.results))
-        return len(self.results)
+        self.results        = []
+        self.current_answer = 0
+        self.cycle          = 0
+        self.observations   = []
+        self.interrupted    = False
+        self.statistics     = {}
+        if self.ctl is None:
+            return
 
+        for atom in self.ctl.symbolic_atoms:
+            if atom.is_external:
+                self.ctl.assign_external(atom.symbol, False)
 
     @property
     def metadata(self):
@@ -151,6 +465,9 @@ class ClingoSolver(SolverWrapper_i):
             "mode"           : "multi_shot",
             "current_result" : self.current_answer,
             "result_size"    : len(self.results),
+            "interrupted"    : self.interrupted,
+            "timings"        : dict(self.timings),
+            "statistics"     : dict(self.statistics),
             "version"        : instal.__version__,
             "clingo_version" : clingo.__version__
         }
@@ -0,0 +1,197 @@
+#/usr/bin/env python3
+"""
+Attribution of grounding size back to the instal DSL.
+
+Compiled programs are divided into blocks, by the comments the compiler
+writes before each translated declaration and rule:
+`%@ {source}:{line}:{col}` (see InstalCompiler_i.insert_source),
+and the pattern headings (`% Translation of ...`, `% Event: ...` etc).
+
+Every rule of the program is instrumented with two extra rules sharing its body:
+_instalProf(Block, Rule, (Vars))  : one atom per ground instance of the rule.
+_instalProfHead(Block, Head)      : one atom per distinct ground head.
+
+After grounding, counting those atoms gives the ground rules and atoms
+each block, and so each DSL declaration, is responsible for.
+Instrumentation roughly doubles grounding work, so it is only for profiling.
+The profiling atoms are hidden by the #show directives of the instal preludes.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import re
+from dataclasses import InitVar, dataclass, field
+
+from clingo import Control, Number
+from clingo import Function as SymFunction
+from clingo.ast import (AST, ASTType, Function, Literal, ProgramBuilder,
+                        Rule, Sign, SymbolicAtom, SymbolicTerm, Transformer,
+                        Variable, parse_string)
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+PROF_RULE : str = "_instalProf"
+PROF_HEAD : str = "_instalProfHead"
+
+SOURCE_RE  = re.compile(r"^%@\s+(.+)$")
+HEADING_RE = re.compile(r"^%+\s*((?:Translation of|inertial fluent:|noninertial/transient fluent:|obligation fluent:"
+                        r"|Event:|initially:|Type Definition Guard:|Type Grounding Sub Program:|Basic Fact for"
+                        r"|Compiled|Query of).*?)\s*%?$")
+
+@dataclass
+class ProfileEntry:
+    """ The grounding attributed to a single block of compiled text """
+    label  : str
+    source : None|str = field(default=None)
+    rules  : int      = field(default=0)
+    ground : int      = field(default=0)
+    atoms  : int      = field(default=0)
+
+class _VarCollector(Transformer):
+    """ Collects the global variables of body literals """
+
+    def __init__(self):
+        self.found : dict[str, None] = {}
+
+    def visit_Variable(self, node):
+        if node.name != "_":
+            self.found[node.name] = None
+
+        return node
+
+@dataclass
+class GroundingProfiler:
+    """
+    Instruments a compiled program for profiling.
+
+    Usage:
+        profiler = GroundingProfiler(compiled_text)
+        profiler.add_to(ctl)
+        ctl.ground(...)
+        print(profiler.report(ctl))
+    """
+
+    text         : InitVar[str]
+    program_name : str                = field(default="base", kw_only=True)
+
+    entries      : list[ProfileEntry] = field(init=False, default_factory=list)
+    statements   : list[AST]          = field(init=False, default_factory=list, repr=False)
+    _lines       : list[int]          = field(init=False, default_factory=list, repr=False)
+
+    def __post_init__(self, text):
+        self._split_blocks(text)
+        rule_count = 0
+
+        def on_statement(stmt:AST):
+            nonlocal rule_count
+            self.statements.append(stmt)
+            if stmt.ast_type != ASTType.Rule:
+                return
+
+            # offset by the #program directive prepended below
+            block = self._block_of(stmt.location.begin.line - 1)
+            self.entries[block].rules += 1
+            self.statements += self._instrument(stmt, block, rule_count)
+            rule_count += 1
+
+        parse_string(f"#program {self.program_name}.\n{text}", on_statement)
+
+    def add_to(self, ctl:Control):
+        with ProgramBuilder(ctl) as builder:
+            for statement in self.statements:
+                builder.add(statement)
+
+    def collect(self, ctl:Control) -> list[ProfileEntry]:
+        """
+        Count the profiling atoms of the ground program into the entries.
+        Can be called after each grounding, eg: of incremental steps
+        """
+        for entry in self.entries:
+            entry.ground = 0
+            entry.atoms  = 0
+
+        for atom in ctl.symbolic_atoms.by_signature(PROF_RULE, 3):
+            self.entries[atom.symbol.arguments[0].number].ground += 1
+
+        for atom in ctl.symbolic_atoms.by_signature(PROF_HEAD, 2):
+            self.entries[atom.symbol.arguments[0].number].atoms += 1
+
+        return self.entries
+
+    def report(self, ctl:None|Control=None, *, limit:None|int=None) -> str:
+        """
+        A table of blocks, sorted by the number of ground rules they produced.
+        """
+        if ctl is not None:
+            self.collect(ctl)
+
+        entries = sorted((x for x in self.entries if bool(x.rules)), key=lambda x: (-x.ground, -x.atoms))
+        total   = sum(x.ground for x in entries) or 1
+        result  = []
+        result.append(f"{'Ground':>10} {'%':>6} {'Atoms':>10} {'Rules':>6}  Source : Translation")
+        for entry in entries[:limit]:
+            result.append(f"{entry.ground:>10} {100 * entry.ground / total:>6.2f} {entry.atoms:>10} {entry.rules:>6}  {entry.source or 'n/a'} : {entry.label}")
+
+        if ctl is not None:
+            lp = self.statistics(ctl)
+            if bool(lp):
+                result.append("")
+                result.append("Clingo lp statistics (including profiling rules): " + ", ".join(f"{k}={v:g}" for k,v in sorted(lp.items())))
+
+        return "\n".join(result)
+
+    def statistics(self, ctl:Control) -> dict[str, float]:
+        try:
+            return {k : v for k,v in ctl.statistics['problem']['lp'].items() if isinstance(v, (int, float))}
+        except (KeyError, RuntimeError):
+            return {}
+
+    def _split_blocks(self, text:str):
+        """
+        Map each line of the text to a block,
+        starting a new block at each source marker or heading
+        """
+        self.entries.append(ProfileEntry("(unattributed)"))
+        pending_source = None
+        for line in text.splitlines():
+            line = line.strip()
+            match SOURCE_RE.match(line), HEADING_RE.match(line):
+                case None, None:
+                    pass
+                case source, None:
+                    pending_source = source[1]
+                case _, heading:
+                    self.entries.append(ProfileEntry(heading[1], source=pending_source))
+                    pending_source = None
+
+            self._lines.append(len(self.entries) - 1)
+
+    def _block_of(self, line:int) -> int:
+        if 0 < line <= len(self._lines):
+            return self._lines[line - 1]
+
+        return 0
+
+    def _instrument(self, rule:AST, block:int, index:int) -> list[AST]:
+        loc       = rule.location
+        collector = _VarCollector()
+        for lit in rule.body:
+            if lit.ast_type == ASTType.Literal:
+                collector(lit)
+
+        match rule.head:
+            case x if x.ast_type == ASTType.Literal and x.sign == Sign.NoSign and x.atom.ast_type == ASTType.SymbolicAtom:
+                head_term = x.atom.symbol
+            case _:
+                head_term = SymbolicTerm(loc, SymFunction("none"))
+
+        block_t   = SymbolicTerm(loc, Number(block))
+        variables = Function(loc, "", [Variable(loc, x) for x in collector.found], 0)
+        prof      = Function(loc, PROF_RULE, [block_t, SymbolicTerm(loc, Number(index)), variables], 0)
+        prof_head = Function(loc, PROF_HEAD, [block_t, head_term], 0)
+        return [Rule(loc, Literal(loc, Sign.NoSign, SymbolicAtom(prof)), rule.body),
+                Rule(loc, Literal(loc, Sign.NoSign, SymbolicAtom(prof_head)), rule.body)]
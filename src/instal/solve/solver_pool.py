@@ -0,0 +1,145 @@
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import InitVar, dataclass, field
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterator
+
+from instal.solve.clingo_program import ClingoProgram
+from instal.solve.clingo_solver import ClingoSolver
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+@lru_cache(maxsize=256)
+def _file_digest(path:Path, mtime:int, size:int) -> bytes:
+    """ A file's content hash, cached while its mtime and size are unchanged """
+    return sha256(path.read_bytes()).digest()
+
+@dataclass
+class SolverPool:
+    """
+    A Pool of initialised and grounded solvers,
+    keyed by a hash of the program, input files, options, and solver class.
+
+    As queries only differ by the #external's they assign,
+    a leased solver can be reused after calling its `reset`,
+    avoiding reloading the prelude and regrounding for each query.
+    Text programs are parsed into a ClingoProgram once per key,
+    so the text is only parsed once, however many solvers are built
+    (or rebuilt, on reset after regrounding) for it.
+    Except when profiling, which instruments the text.
+
+    Usage:
+        pool = SolverPool(size=4)
+        with pool.lease(program, input_files=files) as solver:
+            solver.solve(query)
+            ...
+    """
+
+    size  : int                            = field(default=2)
+    _idle     : dict[str, deque[ClingoSolver]] = field(init=False, default_factory=lambda: defaultdict(deque))
+    _programs : dict[str, ClingoProgram]       = field(init=False, default_factory=dict)
+    _lock     : threading.Lock                 = field(init=False, default_factory=threading.Lock)
+
+    def __len__(self):
+        return sum(len(x) for x in self._idle.values())
+
+    def __contains__(self, key:str):
+        return bool(self._idle.get(key, None))
+
+    @staticmethod
+    def key(program:None|str|ClingoProgram, input_files:list[Path]=None, options:list=None, solver_cls:type=ClingoSolver, **kwargs) -> str:
+        """
+        The hash identifying a grounded program.
+        Input files are hashed by content, not path
+        """
+        hashed = sha256()
+        hashed.update(solver_cls.__qualname__.encode())
+        hashed.update(" ".join(str(x) for x in options or []).encode())
+        hashed.update(repr(sorted(kwargs.items())).encode())
+        match program:
+            case ClingoProgram():
+                hashed.update(program.digest.encode())
+            case _:
+                hashed.update((program or "").encode())
+        for path in input_files or []:
+            stat = path.stat()
+            hashed.update(_file_digest(path, stat.st_mtime_ns, stat.st_size))
+
+        return hashed.hexdigest()
+
+    def warm(self, program:None|str|ClingoProgram, *, input_files:list[Path]=None, options:list=None, solver_cls:type=ClingoSolver, **kwargs):
+        """
+        Fill the idle pool of a program up to `size`
+        """
+        key     = self.key(program, input_files, options, solver_cls, **kwargs)
+        with self._lock:
+            missing = self.size - len(self._idle[key])
+
+        for _ in range(missing):
+            self._release(key, self._build(key, program, input_files, options, solver_cls, **kwargs))
+
+    @contextmanager
+    def lease(self, program:None|str|ClingoProgram, *, input_files:list[Path]=None, options:list=None, solver_cls:type=ClingoSolver, **kwargs) -> Iterator[ClingoSolver]:
+        """
+        Lease a grounded solver for the program, building one if none are idle.
+        On exit the solver is reset and returned to the pool
+        """
+        key    = self.key(program, input_files, options, solver_cls, **kwargs)
+        solver = self._acquire(key)
+        if solver is None:
+            solver = self._build(key, program, input_files, options, solver_cls, **kwargs)
+
+        try:
+            yield solver
+        finally:
+            self._release(key, solver)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+            self._programs.clear()
+
+    def _build(self, key, program, input_files, options, solver_cls, **kwargs) -> ClingoSolver:
+        logging.info("Building pooled solver: %s", solver_cls.__qualname__)
+        program = self._parsed(key, program, **kwargs)
+        return solver_cls(program, input_files=list(input_files or []), options=list(options or []), **kwargs)
+
+    def _parsed(self, key:str, program:None|str|ClingoProgram, **kwargs) -> None|str|ClingoProgram:
+        """ The ClingoProgram of a text program, parsed on first use """
+        match program:
+            case str() if bool(program) and not kwargs.get("profile", False):
+                with self._lock:
+                    if key not in self._programs:
+                        self._programs[key] = ClingoProgram(program, program_name=kwargs.get("program_name", "base"))
+
+                    return self._programs[key]
+            case _:
+                return program
+
+    def _acquire(self, key:str) -> None|ClingoSolver:
+        with self._lock:
+            if bool(self._idle.get(key, None)):
+                return self._idle[key].popleft()
+
+        return None
+
+    def _release(self, key:str, solver:ClingoSolver):
+        if solver.ctl is None:
+            # The solver errored, so it can't be reused
+            logging.info("Discarding failed pooled solver")
+            return
+
+        solver.reset()
+        with self._lock:
+            if len(self._idle[key]) < self.size:
+                self._idle[key].append(solver)
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Builders of models and traces, shared by the trace tests
+"""
+##-- imports
+from __future__ import annotations
+
+from clingo import parse_term as cpt
+from instal.interfaces.solver import InstalModelResult
+from instal.trace.trace import InstalTrace
+##-- end imports
+
+def build_model(*terms:str, number:int=1) -> InstalModelResult:
+    """ A model whose shown atoms are the parsed terms """
+    return InstalModelResult(atoms=[],
+                             shown=[cpt(x) for x in terms],
+                             cost=1,
+                             number=number,
+                             optimal=False,
+                             type="test")
+
+def make_trace(*terms:str, number:int=1, steps:int=3) -> InstalTrace:
+    """ A trace of `steps` + 1 states, built from a model of the terms """
+    return InstalTrace.from_model(build_model(*terms, number=number), steps=steps)
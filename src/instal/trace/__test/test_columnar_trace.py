@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib
+from importlib.resources import files
+##-- end imports
+
+import pytest
+np = pytest.importorskip("numpy")
+
+from clingo import parse_term as cpt
+from instal.interfaces.ast import TermAST
+from instal.interfaces.solver import InstalModelResult
+from instal.trace.columnar_trace import ColumnarTrace
+from instal.trace.trace import InstalTrace
+
+##-- data
+data_path = files("instal.trace.__test.__data")
+data_file = data_path / "trace_0.json"
+data_text = data_file.read_text()
+##-- end data
+
+def build_model(*terms:str) -> InstalModelResult:
+    return InstalModelResult(atoms=[],
+                             shown=[cpt(x) for x in terms],
+                             cost=1,
+                             number=1,
+                             optimal=False,
+                             type="test")
+
+class TestColumnarTrace:
+
+    def test_load_from_json(self):
+        trace = ColumnarTrace.from_json(json.loads(data_text))
+        assert(trace is not None)
+        assert(len(trace) == 4)
+
+    def test_build_from_model_events(self):
+        model = build_model("occurred(something, 1)",
+                            "occurred(other, 2)",
+                            "occurred(else, 3)")
+        trace = ColumnarTrace.from_model(model, steps=3)
+        assert(len(trace) == 4)
+        for state in trace:
+            if state.timestep == 0:
+                continue
+            assert(state.occurred)
+
+    def test_build_from_model_holdsat(self):
+        model = build_model("holdsat(perm(something), 0)",
+                            "holdsat(perm(other), 0)",
+                            "holdsat(perm(else), 0)")
+        trace = ColumnarTrace.from_model(model, steps=1)
+        assert(len(trace) == 2)
+        assert(len(trace[0].holdsat['perm']) == 3)
+        assert(len(trace[1].holdsat['perm']) == 0)
+
+    def test_interning(self):
+        model = build_model(*[f"holdsat(perm(something), {x})" for x in range(10)])
+        trace = ColumnarTrace.from_model(model, steps=9)
+        assert(len(trace._terms) == 1)
+        assert(trace._members.shape == (1, 10))
+        assert(trace._members.all())
+
+    def test_contains(self):
+        model = build_model("holdsat(perm(something), 0)",
+                            "occurred(else, 1)")
+        trace = ColumnarTrace.from_model(model, steps=2)
+        assert("holdsat(perm(something), 0)" in trace)
+        assert(cpt("occurred(else, 1)") in trace)
+        assert(TermAST("occurred", params=[TermAST("else"), TermAST(1)]) in trace)
+        assert("holdsat(perm(something), 1)" not in trace)
+        assert("occurred(else, 5)" not in trace)
+        assert("occurred(blah, 1)" not in trace)
+
+    def test_from_trace(self):
+        trace    = InstalTrace.from_json(json.loads(data_text))
+        columnar = ColumnarTrace.from_trace(trace)
+        assert(len(columnar) == len(trace))
+        for orig, conv in zip(trace, columnar):
+            assert(orig.timestep == conv.timestep)
+            assert(set(str(x) for x in orig) == set(str(x) for x in conv))
+
+    def test_json_matches_trace(self):
+        trace    = InstalTrace.from_json(json.loads(data_text))
+        columnar = ColumnarTrace.from_json(json.loads(data_text))
+        orig     = json.loads(trace.to_json_str(version=1))
+        conv     = json.loads(columnar.to_json_str(version=1))
+        assert(orig['metadata'] == conv['metadata'])
+        for x, y in zip(orig['states'], conv['states']):
+            assert(x['timestep'] == y['timestep'])
+            assert(sorted(x['occurred']) == sorted(y['occurred']))
+            assert(sorted(x['observed']) == sorted(y['observed']))
+            for group in x['holdsat']:
+                assert(sorted(x['holdsat'][group]) == sorted(y['holdsat'][group]))
+
+    def test_json_roundtrip(self):
+        columnar = ColumnarTrace.from_json(json.loads(data_text))
+        again    = ColumnarTrace.from_json(json.loads(columnar.to_json_str()))
+        assert(columnar.to_json_str() == again.to_json_str())
+
+    def test_filter(self):
+        model    = build_model("holdsat(perm(something), 0)",
+                               "holdsat(perm(something), 1)",
+                               "holdsat(pow(something), 1)",
+                               "occurred(else, 1)",
+                               "occurred(else, 2)")
+        trace    = ColumnarTrace.from_model(model, steps=2)
+        filtered = trace.filter(["perm", "occurred"], ["pow"], start=1)
+        assert(len(filtered) == 2)
+        assert(filtered.timesteps == [1, 2])
+        assert("holdsat(perm(something), 1)" in filtered)
+        assert("holdsat(perm(something), 0)" not in filtered)
+        assert("holdsat(pow(something), 1)" not in filtered)
+        assert("occurred(else, 2)" in filtered)
+
+    def test_fluent_intervals(self):
+        model     = build_model("holdsat(perm(something), 0)",
+                                "holdsat(perm(something), 1)",
+                                "holdsat(pow(other), 1)",
+                                "holdsat(pow(other), 2)",
+                                "occurred(else, 1)")
+        trace     = ColumnarTrace.from_model(model, steps=2)
+        intervals = {str(x[0].params[0]) : (x[1], x[2]) for x in trace.fluent_intervals()}
+        assert(intervals == {"perm(something)" : (0, 1), "pow(other)" : (1, 2)})
+
+    def test_fluent_intervals_match_trace(self):
+        trace    = InstalTrace.from_json(json.loads(data_text))
+        columnar = ColumnarTrace.from_trace(trace)
+        expected = sorted((str(x[0]), x[1], x[2]) for x in trace.fluent_intervals())
+        result   = sorted((str(x[0]), x[1], x[2]) for x in columnar.fluent_intervals())
+        assert(expected == result)
+
+    def test_fluent_intervals_toggling(self):
+        model     = build_model("holdsat(perm(a), 0)",
+                                "holdsat(perm(a), 1)",
+                                "holdsat(perm(a), 3)",
+                                "holdsat(pow(b), 2)")
+        trace     = ColumnarTrace.from_model(model, steps=3)
+        intervals = [(str(x[0]), x[1], x[2]) for x in trace.fluent_intervals()]
+        assert(intervals == [("holdsat(perm(a),0)", 0, 1), ("holdsat(pow(b),2)", 2, 2), ("holdsat(perm(a),3)", 3, 3)])
+        assert(trace.intervals.holds("holdsat(perm(a))", 3))
+        assert(not trace.intervals.holds("holdsat(perm(a))", 2))
+
+    def test_last(self):
+        model = build_model("occurred(else, 2)")
+        trace = ColumnarTrace.from_model(model, steps=2)
+        assert(trace.last().timestep == 2)
+        assert(bool(trace.last().occurred))
+
+    def test_json_v2(self):
+        trace    = InstalTrace.from_json(json.loads(data_text))
+        columnar = ColumnarTrace.from_json(json.loads(trace.to_json_str(version=2)))
+        for orig, conv in zip(trace, columnar):
+            assert(set(str(x) for x in orig) == set(str(x) for x in conv))
+
+        assert(columnar.to_json_str(version=2) == trace.to_json_str(version=2))
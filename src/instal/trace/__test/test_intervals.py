@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import random
+from importlib.resources import files
+##-- end imports
+
+import pytest
+from instal.trace.__test.helpers import make_trace
+from instal.trace.intervals import FluentInterval, FluentIntervalIndex, interval_key
+from instal.trace.trace import InstalTrace
+from instal.trace.util import string_to_term
+
+##-- data
+data_path = files("instal.trace.__test.__data")
+data_text = (data_path / "trace_0.json").read_text()
+##-- end data
+
+logging = logmod.root
+
+# perm(a) toggles off at 2 and back on at 3, pow(b) holds from 1
+TOGGLING = ["holdsat(perm(a),i,0)", "holdsat(perm(a),i,1)",
+            "holdsat(perm(a),i,3)", "holdsat(perm(a),i,4)",
+            "holdsat(pow(b),i,1)", "holdsat(pow(b),i,2)", "holdsat(pow(b),i,3)",
+            "occurred(e,i,2)"]
+
+def brute_holding(trace, step:int) -> set[str]:
+    return {interval_key(x) for x in trace[step].fluents}
+
+class TestFluentIntervals:
+
+    def test_initial(self):
+        index = FluentIntervalIndex()
+        assert(len(index) == 0)
+        assert(index.holding(0) == [])
+        assert(index.first_held("holdsat(perm(a),i)") is None)
+
+    def test_interval_key(self):
+        assert(interval_key("holdsat(perm(a), i, 3)") == "holdsat(perm(a),i)")
+        assert(interval_key(string_to_term("holdsat(perm(a),i,3)")) == "holdsat(perm(a),i)")
+
+    def test_toggling(self):
+        trace = make_trace(*TOGGLING, steps=5)
+        found = [(interval_key(x.term), x.start, x.end) for x in trace.intervals]
+        assert(found == [("holdsat(perm(a),i)", 0, 1), ("holdsat(pow(b),i)", 1, 3), ("holdsat(perm(a),i)", 3, 4)])
+
+    def test_interval_terms_are_timed(self):
+        trace = make_trace(*TOGGLING, steps=5)
+        assert([str(x.term) for x in trace.intervals.intervals_of("holdsat(perm(a),i)")] == ["holdsat(perm(a),i,0)", "holdsat(perm(a),i,3)"])
+
+    def test_holding(self):
+        trace = make_trace(*TOGGLING, steps=5)
+        assert({interval_key(x.term) for x in trace.intervals.holding(2)} == {"holdsat(pow(b),i)"})
+        assert({interval_key(x.term) for x in trace.intervals.holding(3)} == {"holdsat(perm(a),i)", "holdsat(pow(b),i)"})
+        assert(trace.intervals.holding(5) == [])
+
+    def test_first_held(self):
+        index = make_trace(*TOGGLING, steps=5).intervals
+        assert(index.first_held("holdsat(perm(a),i)") == 0)
+        assert(index.first_held("holdsat(pow(b), i)") == 1)
+        assert(index.first_held(string_to_term("holdsat(pow(b),i,3)")) == 1)
+        assert(index.first_held("holdsat(perm(c),i)") is None)
+
+    def test_holds(self):
+        index = make_trace(*TOGGLING, steps=5).intervals
+        assert([index.holds("holdsat(perm(a),i)", x) for x in range(6)] == [True, True, False, True, True, False])
+
+    def test_overlapping(self):
+        index = make_trace(*TOGGLING, steps=5).intervals
+        assert([(x.start, x.end) for x in index.overlapping(2, 2)] == [(1, 3)])
+        assert([(x.start, x.end) for x in index.overlapping(2, 3)] == [(1, 3), (3, 4)])
+        assert(index.overlapping(3, 2) == [])
+
+    def test_cached(self):
+        trace = make_trace(*TOGGLING, steps=5)
+        assert(trace.intervals is trace.intervals)
+
+    def test_fluent_intervals(self):
+        trace     = make_trace(*TOGGLING, steps=5)
+        intervals = trace.fluent_intervals()
+        assert(len(intervals) == 3)
+        for term, start, end in intervals:
+            assert(start <= end)
+
+    def test_json_trace_matches_states(self):
+        trace = InstalTrace.from_json(json.loads(data_text))
+        for step in trace.timesteps:
+            assert({interval_key(x.term) for x in trace.intervals.holding(step)} == brute_holding(trace, step))
+
+    def test_random_intervals(self):
+        gen       = random.Random(3)
+        intervals = []
+        for i in range(200):
+            start = gen.randint(0, 100)
+            intervals.append(FluentInterval(string_to_term(f"holdsat(f{i},0)"), start, start + gen.randint(0, 20)))
+
+        index = FluentIntervalIndex(intervals)
+        for _ in range(50):
+            start = gen.randint(-5, 125)
+            end   = start + gen.randint(0, 10)
+            expected = sorted(str(x.term) for x in intervals if x.start <= end and x.end >= start)
+            assert(sorted(str(x.term) for x in index.overlapping(start, end)) == expected)
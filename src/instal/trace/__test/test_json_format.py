@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+from importlib.resources import files
+##-- end imports
+
+import pytest
+from instal.trace.__test.helpers import make_trace
+from instal.trace.json_format import delta_states, json_version, load_terms
+from instal.trace.trace import InstalTrace
+
+##-- data
+data_path = files("instal.trace.__test.__data")
+data_text = (data_path / "trace_0.json").read_text()
+##-- end data
+
+logging = logmod.root
+
+def state_strs(trace) -> list[list[str]]:
+    return [sorted(str(x) for x in state) for state in trace]
+
+# perm(a) is terminated at 2 and reinitiated at 3
+TOGGLING = ["holdsat(perm(a),i,0)", "holdsat(perm(a),i,1)", "holdsat(perm(a),i,3)",
+            "holdsat(pow(b),i,1)", "holdsat(pow(b),i,2)", "holdsat(pow(b),i,3)",
+            "occurred(e,i,2)", "observed(e,2)"]
+
+class TestTraceJson:
+
+    def test_versions(self):
+        assert(json_version(json.loads(data_text)) == 1)
+        assert(json_version({"version": 2}) == 2)
+        with pytest.raises(ValueError):
+            json_version({"version": 99})
+
+    def test_deltas(self):
+        states = delta_states(make_trace(*TOGGLING))
+        assert([x['initiated'] for x in states] == [["holdsat(perm(a),i,0)"], ["holdsat(pow(b),i,1)"], [], ["holdsat(perm(a),i,3)"]])
+        # Terminated fluents are stamped with the last step they held
+        assert([x['terminated'] for x in states] == [[], [], ["holdsat(perm(a),i,1)"], []])
+        assert(states[2]['occurred'] == ["occurred(e,i,2)"])
+        assert(states[2]['observed'] == ["observed(e,2)"])
+
+    def test_round_trip(self):
+        trace  = make_trace(*TOGGLING)
+        loaded = InstalTrace.from_json(json.loads(trace.to_json_str(version=2)))
+        assert(state_strs(trace) == state_strs(loaded))
+
+    def test_v1_to_v2(self):
+        trace  = InstalTrace.from_json(json.loads(data_text))
+        as_v2  = trace.to_json_str(version=2)
+        loaded = InstalTrace.from_json(json.loads(as_v2))
+        assert(json.loads(as_v2)['version'] == 2)
+        assert(state_strs(trace) == state_strs(loaded))
+
+    def test_v2_is_smaller(self):
+        # 50 fluents which all hold for 50 steps
+        trace = make_trace(*[f"holdsat(perm(a{x}),i,{y})" for x in range(50) for y in range(51)], steps=50)
+        assert(len(trace.to_json_str(version=2)) * 10 < len(trace.to_json_str(version=1)))
+
+    def test_load_terms_versions_agree(self):
+        trace = InstalTrace.from_json(json.loads(data_text))
+        v1    = sorted((x, str(y)) for x, y in load_terms(json.loads(trace.to_json_str(version=1))))
+        v2    = sorted((x, str(y)) for x, y in load_terms(json.loads(trace.to_json_str(version=2))))
+        assert(v1 == v2)
+
+    def test_filename(self):
+        loaded = json.loads(make_trace(*TOGGLING).to_json_str("trace_0.json", version=2))
+        assert(loaded['metadata']['filename'] == "trace_0.json")
+
+    def test_bad_version(self):
+        with pytest.raises(ValueError):
+            make_trace(*TOGGLING).to_json_str(version=5)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+from importlib.resources import files
+##-- end imports
+
+import pytest
+from instal.trace.jsonl import (JsonlTraceReader, JsonlTraceWriter, load_trace,
+                                stream_filter, write_jsonl)
+from instal.trace.trace import InstalTrace
+
+##-- data
+data_path = files("instal.trace.__test.__data")
+data_text = (data_path / "trace_0.json").read_text()
+##-- end data
+
+logging = logmod.root
+
+def state_strs(trace) -> list[list[str]]:
+    return [sorted(str(x) for x in state) for state in trace]
+
+@pytest.fixture
+def trace():
+    return InstalTrace.from_json(json.loads(data_text))
+
+@pytest.fixture
+def jsonl_path(trace, tmp_path):
+    path = tmp_path / "trace_0.jsonl"
+    write_jsonl(trace, path, path.name)
+    return path
+
+class TestJsonlTrace:
+
+    def test_write(self, trace, jsonl_path):
+        lines = jsonl_path.read_text().splitlines()
+        assert(len(lines) == len(trace) + 1)
+        assert(json.loads(lines[0])['metadata']['filename'] == "trace_0.jsonl")
+        assert(all(x.startswith('{"timestep":') for x in lines[1:]))
+
+    def test_metadata(self, trace, jsonl_path):
+        assert(JsonlTraceReader(jsonl_path).metadata['model_length'] == trace.metadata['model_length'])
+
+    def test_not_jsonl(self, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text('{"metadata": {}}\n')
+        with pytest.raises(ValueError):
+            JsonlTraceReader(path).metadata
+
+    def test_round_trip(self, trace, jsonl_path):
+        loaded = JsonlTraceReader(jsonl_path).load()
+        assert(loaded.timesteps == trace.timesteps)
+        assert(state_strs(loaded) == state_strs(trace))
+
+    def test_range(self, trace, jsonl_path):
+        reader = JsonlTraceReader(jsonl_path)
+        assert([x['timestep'] for x in reader.states(1, 2)] == [1, 2])
+        assert([x['timestep'] for x in reader.states(2)] == [2, 3])
+        assert(state_strs(reader.load(1, 2)) == state_strs(trace)[1:3])
+
+    def test_seeks_to_recorded_offsets(self, jsonl_path):
+        reader = JsonlTraceReader(jsonl_path)
+        list(reader.states())
+        assert(sorted(reader._offsets) == [0, 1, 2, 3])
+        with open(jsonl_path, 'rb') as f:
+            f.seek(reader._offsets[2])
+            assert(json.loads(f.readline())['timestep'] == 2)
+
+        assert([x['timestep'] for x in reader.states(3, 3)] == [3])
+
+    def test_writer(self, trace, tmp_path):
+        path = tmp_path / "written.jsonl"
+        with JsonlTraceWriter(path, {"model_length": 1}) as writer:
+            writer.write_state(trace[0])
+            writer.write_state(trace[1].to_json())
+
+        assert(state_strs(JsonlTraceReader(path).load()) == state_strs(trace)[:2])
+
+    def test_stream_filter(self, trace, jsonl_path, tmp_path):
+        target   = tmp_path / "filtered.jsonl"
+        count    = stream_filter(jsonl_path, target, ["perm"], [], start=1, end=2)
+        expected = trace.filter(["perm"], [], start=1, end=2)
+        assert(count == 2)
+        assert(state_strs(load_trace(target)) == state_strs(expected))
+
+    def test_load_trace(self, trace, jsonl_path, tmp_path):
+        json_path = tmp_path / "trace_0.json"
+        json_path.write_text(data_text)
+        assert(state_strs(load_trace(json_path)) == state_strs(load_trace(jsonl_path)))
+        with pytest.raises(ValueError):
+            load_trace(tmp_path / "trace.txt")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+from importlib.resources import files
+##-- end imports
+
+import pytest
+np = pytest.importorskip("numpy")
+
+from clingo import parse_term as cpt
+from instal.interfaces.solver import InstalModelResult
+from instal.trace.columnar_trace import ColumnarTrace
+from instal.trace.mapped_trace import MappedTrace, TermTable, write_binary
+from instal.trace.trace import InstalTrace
+
+##-- data
+data_path = files("instal.trace.__test.__data")
+data_text = (data_path / "trace_0.json").read_text()
+##-- end data
+
+logging = logmod.root
+
+def state_strs(trace) -> list[list[str]]:
+    return [sorted(str(x) for x in state) for state in trace]
+
+@pytest.fixture
+def trace():
+    return InstalTrace.from_json(json.loads(data_text))
+
+@pytest.fixture
+def mapped(trace, tmp_path):
+    path = tmp_path / "trace_0.itb"
+    write_binary(trace, path)
+    return MappedTrace.open(path)
+
+class TestMappedTrace:
+
+    def test_open(self, trace, mapped):
+        assert(isinstance(mapped._members, np.memmap) or isinstance(mapped._members.base, np.memmap))
+        assert(len(mapped) == len(trace))
+        assert(mapped.metadata == trace.metadata)
+
+    def test_not_binary(self, tmp_path):
+        path = tmp_path / "bad.itb"
+        path.write_bytes(b"not a trace")
+        with pytest.raises(ValueError):
+            MappedTrace.open(path)
+
+    def test_states(self, trace, mapped):
+        assert(state_strs(mapped) == state_strs(trace))
+        assert(sorted(str(x) for x in mapped[2]) == sorted(str(x) for x in trace[2]))
+
+    def test_terms_parsed_lazily(self, mapped):
+        assert(all(x is None for x in mapped._terms._parsed))
+        mapped[0]
+        assert(any(x is not None for x in mapped._terms._parsed))
+
+    def test_contains(self, mapped):
+        assert("holdsat(live(basic),basic,0)" in mapped)
+        assert("holdsat(live(basic),basic,10)" not in mapped)
+
+    def test_range_filter_is_a_view(self, trace, mapped):
+        filtered = mapped.filter([], [], start=1, end=2)
+        assert(np.shares_memory(filtered._members, mapped._members))
+        assert(filtered.timesteps == [1, 2])
+        assert(state_strs(filtered) == state_strs(trace.filter([], [], start=1, end=2)))
+
+    def test_filter(self, mapped, tmp_path):
+        columnar = ColumnarTrace.from_json(json.loads(data_text))
+        expected = columnar.filter(["perm"], ["null"], start=1)
+        filtered = mapped.filter(["perm"], ["null"], start=1)
+        assert(isinstance(filtered._terms, TermTable))
+        assert(state_strs(filtered) == state_strs(expected))
+
+    def test_fluent_intervals(self, trace, mapped):
+        expected = sorted((str(x[0]), x[1], x[2]) for x in trace.fluent_intervals())
+        assert(sorted((str(x[0]), x[1], x[2]) for x in mapped.fluent_intervals()) == expected)
+
+    def test_json(self, trace, mapped):
+        assert(mapped.to_json_str(version=2) == trace.to_json_str(version=2))
+
+    def test_empty(self, tmp_path):
+        model = InstalModelResult(atoms=[], shown=[], cost=1, number=1, optimal=False, type="test")
+        path  = tmp_path / "empty.itb"
+        write_binary(InstalTrace.from_model(model, steps=2), path)
+        mapped = MappedTrace.open(path)
+        assert(len(mapped) == 3)
+        assert(state_strs(mapped) == [[], [], []])
@@ -52,6 +52,19 @@ class TestTrace:
                 continue
             assert(state.occurred)
 
+    def test_from_model_statistics(self):
+        model = InstalModelResult(atoms=[],
+                                  shown=[cpt("occurred(something, 1)")],
+                                  cost=1,
+                                  number=1,
+                                  optimal=False,
+                                  type="test",
+                                  statistics={"found_at": 0.5})
+        trace = InstalTrace.from_model(model, steps=1, metadata={"statistics" : {"models": 1}})
+        loaded = json.loads(trace.to_json_str())
+        assert(loaded['metadata']['model_statistics'] == {"found_at": 0.5})
+        assert(loaded['metadata']['statistics'] == {"models": 1})
+
     def test_build_from_model_holdsat(self):
         model = InstalModelResult(atoms=[],
                                   shown=[cpt("holdsat(perm(something), 0)"),
@@ -87,7 +100,7 @@ class TestTrace:
     def test_equivalence(self):
         """ Check a trace loads and saves without changing anything """
         trace = InstalTrace.from_json(json.loads(data_text))
-        as_json = trace.to_json_str()
+        as_json = trace.to_json_str(version=1)
 
         reconstructed = as_json.split("\n")
         for orig, loaded in zip(data_text.split("\n"), reconstructed):
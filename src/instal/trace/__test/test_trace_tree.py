@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+##-- end imports
+
+import pytest
+from instal.interfaces.trace import TREE_ROOT
+from instal.trace.__test.helpers import make_trace
+from instal.trace.trace import InstalTrace
+from instal.trace.trace_tree import InstalTraceTree
+
+logging = logmod.root
+
+COMMON = ["holdsat(perm(a), 0)", "observed(a, 0)", "occurred(a, 1)"]
+
+class TestTraceTree:
+
+    def test_initial(self):
+        tree = InstalTraceTree()
+        assert(tree.start == TREE_ROOT)
+        assert(len(tree) == 0)
+        assert(tree.node_count == 0)
+
+    def test_single_trace(self):
+        tree = InstalTraceTree.from_traces([make_trace(*COMMON)])
+        assert(len(tree) == 1)
+        assert(tree.node_count == 4)
+        assert(not bool(tree.branch_points()))
+
+    def test_shared_prefix(self):
+        first  = make_trace(*COMMON, "observed(b, 1)", "occurred(b, 2)", number=1)
+        second = make_trace(*COMMON, "observed(c, 1)", "occurred(c, 2)", number=2)
+        tree   = InstalTraceTree.from_traces([first, second])
+        assert(len(tree) == 2)
+        # Only timestep 0 is shared, as they diverge in their observations at 1
+        assert(tree.node_count == 7)
+        assert(len(tree.branch_points()) == 1)
+
+    def test_identical_traces_merge(self):
+        tree = InstalTraceTree.from_traces([make_trace(*COMMON, number=1), make_trace(*COMMON, number=2)])
+        assert(len(tree) == 2)
+        assert(tree.node_count == 4)
+
+    def test_divergent_first_state(self):
+        tree = InstalTraceTree.from_traces([make_trace("holdsat(perm(a), 0)"), make_trace("holdsat(perm(b), 0)")])
+        assert(tree.branch_points() == [TREE_ROOT])
+
+    def test_rebuild_traces(self):
+        first  = make_trace(*COMMON, "observed(b, 1)", number=1)
+        second = make_trace(*COMMON, "observed(c, 1)", number=2)
+        tree   = InstalTraceTree.from_traces([first, second])
+        rebuilt = list(tree)
+        assert(len(rebuilt) == 2)
+        assert([x.metadata['current_result'] for x in rebuilt] == [1, 2])
+        for original, copy in zip([first, second], rebuilt):
+            assert(isinstance(copy, InstalTrace))
+            assert([str(x) for x in original[1]] == [str(x) for x in copy[1]])
+
+    def test_rebuilt_states_are_shared(self):
+        tree = InstalTraceTree.from_traces([make_trace(*COMMON, "observed(b, 1)"), make_trace(*COMMON, "observed(c, 1)")])
+        first, second = list(tree)
+        assert(first[0] is second[0])
+        assert(first[1] is not second[1])
+
+    def test_differences(self):
+        tree   = InstalTraceTree.from_traces([make_trace(*COMMON, "observed(b, 1)"), make_trace(*COMMON, "observed(c, 1)")])
+        branch = tree.branch_points()[0]
+        diffs  = tree.differences(branch)
+        assert(sorted(x for y in diffs.values() for x in y) == ["observed(b,1)", "observed(c,1)"])
+
+    def test_path(self):
+        tree  = InstalTraceTree()
+        end   = tree.add_trace(make_trace(*COMMON))
+        assert([x.timestep for x in tree.path(end)] == [0, 1, 2, 3])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+##-- end imports
+
+import pytest
+from clingo import parse_term as cpt
+from instal.interfaces.ast import TermAST
+from instal.parser.v2.utils import TERM
+from instal.trace.util import string_to_term, symbol_to_term
+
+TERMS = ["a",
+         "3",
+         "f(-2)",
+         "holdsat(perm(x),inst,3)",
+         "occurred(null,minimalRules,0)",
+         "holdsat(deontic(power,instMultiVar(first,second)),minimalRules,2)",
+         ]
+
+class TestSymbolToTerm:
+
+    @pytest.mark.parametrize("text", TERMS)
+    def test_matches_parser(self, text):
+        expected = TERM.parse_string(text)[0]
+        result   = symbol_to_term(cpt(text))
+        assert(isinstance(result, TermAST))
+        assert(result == expected)
+        assert(str(result) == str(expected))
+
+    def test_number(self):
+        result = symbol_to_term(cpt("f(3)"))
+        assert(result.params[0].value == 3)
+        assert(isinstance(result.params[0].value, int))
+
+    def test_string(self):
+        result = symbol_to_term(cpt('f("a string")'))
+        assert(str(result) == 'f("a string")')
+
+    def test_negative_function(self):
+        result = symbol_to_term(cpt("-f(a)"))
+        assert(str(result) == "-f(a)")
+
+    def test_memo(self):
+        memo   = {}
+        first  = symbol_to_term(cpt("holdsat(perm(x),inst,1)"), memo)
+        second = symbol_to_term(cpt("holdsat(perm(x),inst,2)"), memo)
+        assert(first is not second)
+        assert(first.params[0] is second.params[0])
+        assert(symbol_to_term(cpt("holdsat(perm(x),inst,1)"), memo) is first)
+
+    def test_string_to_term(self):
+        assert(string_to_term("holdsat(perm(x),inst,3)") == TERM.parse_string("holdsat(perm(x),inst,3)")[0])
+
+    def test_interned_without_memo(self):
+        first  = symbol_to_term(cpt("holdsat(live(inst),inst,1)"))
+        second = string_to_term("holdsat(live(inst),inst,1)")
+        assert(first is second)
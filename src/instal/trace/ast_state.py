@@ -10,6 +10,7 @@ from clingo import Symbol
 from instal.interfaces.solver import InstalModelResult
 from instal.interfaces.trace import State_i
 from instal.parser.v2.utils import TERM
+from instal.trace.util import symbol_to_term
 
 ##-- end imports
 
@@ -77,7 +78,7 @@ class InstalASTState(State_i):
             case iAST.TermAST():
                 pass
             case Symbol():
-                term = TERM.parse_string(str(term))[0]
+                term = symbol_to_term(term)
 
 
         try:
@@ -103,8 +104,13 @@ class InstalASTState(State_i):
     def check(self, conditions) -> bool:
         return False
     def insert(self, term:str|Symbol|iAST.TermAST):
-        if not isinstance(term, iAST.TermAST):
-            term = TERM.parse_string(str(term))[0]
+        match term:
+            case iAST.TermAST():
+                pass
+            case Symbol():
+                term = symbol_to_term(term)
+            case _:
+                term = TERM.parse_string(str(term))[0]
 
         assert(isinstance(term, iAST.TermAST))
         try:
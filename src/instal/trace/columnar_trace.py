@@ -0,0 +1,335 @@
+#/usr/bin/env python3
+"""
+A Columnar representation of a trace.
+
+Instead of a State_i per timestep, each holding every term true at that step,
+each distinct term is interned once, without its timestep,
+and membership is a boolean matrix of [term x timestep].
+
+States are only constructed when indexed or iterated.
+
+Requires numpy (the `columnar` optional dependency).
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import re
+import sys
+from dataclasses import InitVar, dataclass, field
+from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
+                    Iterable, Iterator, Mapping, Match, MutableMapping,
+                    Protocol, Sequence, Tuple, TypeAlias, TypeGuard, TypeVar,
+                    cast, final, overload, runtime_checkable)
+
+import numpy as np
+import instal.interfaces.ast as iAST
+from clingo import Symbol, SymbolType
+from instal import defaults
+from instal.defaults import STATE_HOLDSAT_GROUPS
+from instal.interfaces.solver import InstalModelResult
+from instal.interfaces.trace import State_i, Trace_i
+from instal.parser.v2.utils import TERM
+from instal.trace.ast_state import InstalASTState
+from instal.trace.intervals import FluentInterval, FluentIntervalIndex
+from instal.trace.json_format import dumps_delta, load_terms
+from instal.trace.util import string_to_term, symbol_to_term
+
+if TYPE_CHECKING:
+    # tc only imports
+    pass
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+NON_FLUENT_GROUPS : Final[tuple[str, ...]] = ("occurred", "observed", "rest")
+
+@dataclass
+class ColumnarTrace(Trace_i):
+    """ A Trace of Instal Model time steps, stored by term instead of by state.
+
+    _terms    : the interned terms, minus their final timestep parameter
+    _groups   : for each term, its holdsat group, or occurred/observed/rest
+    _prefixes : for each term, its string form up to the timestep, for fast printing
+    _members  : bool array of [term, timestep - _start]
+    """
+    state_constructor : ClassVar[State_i] = InstalASTState
+
+    _terms    : list[iAST.TermAST]         = field(init=False, default_factory=list)
+    _groups   : list[str]                  = field(init=False, default_factory=list)
+    _prefixes : list[str]                  = field(init=False, default_factory=list)
+    _lookup   : dict[str, int]             = field(init=False, default_factory=dict)
+    _members  : np.ndarray                 = field(init=False, default=None)
+    _start    : int                        = field(init=False, default=0)
+    _memo     : dict[Symbol, iAST.TermAST] = field(init=False, default_factory=dict, repr=False)
+
+    def __post_init__(self, states):
+        states     = list(states)
+        timesteps  = [x.timestep for x in states]
+        self._start = min(timesteps, default=0)
+        width       = (max(timesteps) - self._start + 1) if bool(states) else 0
+        rows, cols  = [], []
+        for state in states:
+            for term in state:
+                rows.append(self._intern(self._as_term(term)))
+                cols.append(state.timestep - self._start)
+
+        self._members = np.zeros((len(self._terms), width), dtype=bool)
+        self._members[rows, cols] = True
+
+    @staticmethod
+    def from_json(json:dict, filename:str=None) -> ColumnarTrace:
+        """ Load a trace from json of any version, see instal.trace.json_format """
+        metadata = json['metadata']
+        trace    = ColumnarTrace([], metadata=metadata)
+        width    = metadata['model_length'] + 1
+        trace._build(list(load_terms(json, trace._memo)), width)
+        return trace
+
+    @staticmethod
+    def from_model(model:InstalModelResult, steps:int=1, sources:list[str]=None, metadata:dict=None) -> ColumnarTrace:
+        """
+        Given a model, construct a trace
+        """
+        metadata                   = metadata or {}
+        metadata['cost']           = model.cost
+        metadata['current_result'] = model.number
+        metadata['optimal']        = model.optimal
+        metadata['model_length']   = steps
+        metadata['model_statistics'] = dict(model.statistics)
+        metadata['instal_files']   = [str(x) for x in sources or []]
+        metadata['institutions']   = []
+
+        i_set : set[str] = set()
+        cells = []
+        for term in model.shown:
+            if term.name == "institution":
+                i_set.add(str(term.arguments[0]))
+                continue
+            if term.name == "bridge":
+                # Untimed links between institutions
+                continue
+
+            match term.arguments[-1]:
+                case Symbol() as x if x.type == SymbolType.Number and x.number <= steps:
+                    cells.append((x.number, term))
+                case _:
+                    raise Exception("Unexpected Term in Trace", term)
+
+        metadata['institutions'] += list(i_set)
+        trace = ColumnarTrace([], metadata=metadata)
+        trace._build(cells, steps + 1)
+        return trace
+
+    @staticmethod
+    def from_trace(trace:Trace_i) -> ColumnarTrace:
+        """ Convert any other trace to a columnar one """
+        return ColumnarTrace(list(trace), metadata=trace.metadata.copy())
+
+    def __getitem__(self, index:int) -> State_i:
+        col = index - self._start
+        if not (0 <= col < self._members.shape[1]):
+            raise KeyError(index)
+
+        state = self.state_constructor(index)
+        for row in np.flatnonzero(self._members[:, col]):
+            state.insert(self._timed(row, index))
+
+        return state
+
+    def __iter__(self) -> Iterator[State_i]:
+        for step in self.timesteps:
+            yield self[step]
+
+    def __len__(self) -> int:
+        return self._members.shape[1]
+
+    def __contains__(self, term:str|Symbol|iAST.TermAST) -> bool:
+        """ Test whether a timestamped term is in the trace """
+        term = self._as_term(term)
+        try:
+            col = int(term.params[-1].value) - self._start
+        except (ValueError, IndexError):
+            return False
+
+        row = self._lookup.get(str(self._timeless(term)), None)
+        if row is None or not (0 <= col < self._members.shape[1]):
+            return False
+
+        return bool(self._members[row, col])
+
+    def __repr__(self) -> str:
+        result = []
+        result.append(f"----- Instal Trace {self.metadata['current_result']} of {self.metadata['result_size']}.")
+        result.append(f"Cost  : {self.metadata['cost']}")
+        result.append(f"Length: {self.metadata['model_length']}")
+        result.append("")
+        for state in self:
+            result.append(str(state))
+
+        return "\n".join(result)
+
+    def contextual_iter(self) -> iter[tuple]:
+        states : list = list(self)
+        return zip(range(len(self)),
+                   states,
+                   [None] + states,
+                   states[1:] + [None])
+
+    def last(self) -> State_i:
+        return self[self._start + len(self) - 1]
+
+    @property
+    def timesteps(self) -> list[int]:
+        return list(range(self._start, self._start + len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """ The size of the membership matrix """
+        return self._members.nbytes
+
+    def check(self, conditions:list) -> bool:
+        return all(x in self for x in conditions)
+
+    def to_json_str(self, filename=None, version:None|int=None) -> str:
+        """ Write the trace as json. Defaults to instal.defaults.TRACE_JSON_VERSION """
+        match version or defaults.TRACE_JSON_VERSION:
+            case 2:
+                return dumps_delta(self, filename)
+            case 1:
+                pass
+            case x:
+                raise ValueError("Unrecognised Trace Json Version", x)
+
+        states = []
+        for col, step in enumerate(self.timesteps):
+            state_dict = {
+                "timestep" : step,
+                "occurred" : [],
+                "observed" : [],
+                "holdsat"  : {x : [] for x in STATE_HOLDSAT_GROUPS},
+                "rest"     : [],
+            }
+            for row in np.flatnonzero(self._members[:, col]):
+                term_s = f"{self._prefixes[row]}{step})"
+                match self._groups[row]:
+                    case str() as group if group in NON_FLUENT_GROUPS:
+                        state_dict[group].append(term_s)
+                    case group:
+                        state_dict['holdsat'][group].append(term_s)
+
+            states.append(state_dict)
+
+        trace_obj = {
+            "metadata" : self.metadata,
+            "states"   : states,
+            }
+        if filename is not None:
+            trace_obj['metadata']['filename'] = str(filename)
+
+        return json.dumps(trace_obj, sort_keys=True, indent=4)
+
+    def filter(self, allow:list[str], reject:list[str], start:None|int=None, end:None|int=None) -> Trace_i:
+        """
+        Filter terms by regex, and timesteps by range.
+        Unlike InstalTrace, the regexs are tested against terms without their timestep
+        """
+        logging.info("Filtering")
+        start      = self._start if start is None else max(start, self._start)
+        end        = end if (end is not None and end > -1) else sys.maxsize
+        end        = min(end, self._start + len(self) - 1)
+
+        allow_re   = re.compile("|".join(allow)) if bool(allow) else None
+        reject_re  = re.compile("|".join(reject)) if bool(reject) else None
+        rows       = [i for i, term in enumerate(self._terms)
+                      if (not allow_re or allow_re.search(str(term)))
+                      and (not reject_re or not reject_re.search(str(term)))]
+
+        filtered           = ColumnarTrace([], metadata=self.metadata.copy())
+        filtered._terms    = [self._terms[x] for x in rows]
+        filtered._groups   = [self._groups[x] for x in rows]
+        filtered._prefixes = [self._prefixes[x] for x in rows]
+        filtered._lookup   = {str(x) : i for i, x in enumerate(filtered._terms)}
+        filtered._start    = start
+        filtered._members  = self._members[rows, (start - self._start):max(0, end - self._start + 1)]
+        return filtered
+
+    def _build_intervals(self) -> FluentIntervalIndex:
+        """
+        Build the interval index from the membership matrix,
+        where each run of a fluent's row is an interval
+        """
+        rows     = np.array([i for i, x in enumerate(self._groups) if x not in NON_FLUENT_GROUPS], dtype=int)
+        if not bool(rows.size) or not bool(len(self)):
+            return FluentIntervalIndex()
+
+        active   = np.pad(self._members[rows], ((0, 0), (1, 1))).astype(np.int8)
+        changes  = np.diff(active, axis=1)
+        # Row major, so each row's starts and ends pair up in order
+        s_rows, starts = np.nonzero(changes == 1)
+        _, ends        = np.nonzero(changes == -1)
+
+        intervals = []
+        for row, start, end in zip(rows[s_rows], starts, ends):
+            start = int(start) + self._start
+            end   = int(end) - 1 + self._start
+            intervals.append(FluentInterval(self._timed(row, start), start, end))
+
+        return FluentIntervalIndex(intervals)
+
+    def _build(self, cells:list[tuple[int, Any]], width:int):
+        """ Build the membership matrix from (timestep, term) pairs """
+        self._start = 0
+        rows, cols  = [], []
+        for step, term in cells:
+            rows.append(self._intern(self._as_term(term)))
+            cols.append(step)
+
+        self._members = np.zeros((len(self._terms), width), dtype=bool)
+        self._members[rows, cols] = True
+
+    def _as_term(self, term:str|Symbol|iAST.TermAST) -> iAST.TermAST:
+        match term:
+            case iAST.TermAST():
+                pass
+            case Symbol():
+                term = symbol_to_term(term, self._memo)
+            case str():
+                term = string_to_term(term, self._memo)
+            case _:
+                term = TERM.parse_string(str(term))[0]
+
+        assert(isinstance(term, iAST.TermAST))
+        return term
+
+    def _timeless(self, term:iAST.TermAST) -> iAST.TermAST:
+        return iAST.TermAST.intern(term.value, params=term.params[:-1])
+
+    def _timed(self, row:int, step:int) -> iAST.TermAST:
+        term = self._terms[row]
+        return iAST.TermAST.intern(term.value, params=term.params + [iAST.TermAST.intern(step)])
+
+    def _intern(self, term:iAST.TermAST) -> int:
+        timeless = self._timeless(term)
+        key      = str(timeless)
+        if key in self._lookup:
+            return self._lookup[key]
+
+        match term.value:
+            case "holdsat" if term.params[0].value in STATE_HOLDSAT_GROUPS:
+                group = term.params[0].value
+            case "holdsat":
+                group = "other"
+            case "occurred" | "observed":
+                group = term.value
+            case _:
+                group = "rest"
+
+        self._lookup[key] = len(self._terms)
+        self._terms.append(timeless)
+        self._groups.append(group)
+        self._prefixes.append(term.value + "(" + "".join(f"{x}," for x in timeless.params))
+        return self._lookup[key]
@@ -0,0 +1,205 @@
+#/usr/bin/env python3
+"""
+An index of the intervals over which fluents hold in a trace.
+
+Each fluent is keyed by its holdsat term without its timestep,
+eg: holdsat(perm(a),inst), and can have several disjoint intervals,
+if it is terminated and later re-initiated.
+
+Intervals are inclusive of both ends,
+and are stored in a static centered interval tree,
+so point and range queries take O(log n + k),
+while per-fluent queries bisect that fluent's sorted intervals.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
+
+import instal.interfaces.ast as iAST
+from instal.trace.util import string_to_term, timeless_str
+
+if TYPE_CHECKING:
+    from instal.interfaces.trace import Trace_i
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+class FluentInterval(NamedTuple):
+    """ A fluent, as its timestamped term at the start of the interval, and the steps it holds over """
+    term  : iAST.TermAST
+    start : int
+    end   : int
+
+def interval_key(term:str|iAST.TermAST) -> str:
+    """ The key of a fluent: its term without its final timestep parameter """
+    if isinstance(term, str):
+        term = string_to_term(term)
+
+    return timeless_str(term)
+
+@dataclass
+class _IntervalNode:
+    """ A node of a centered interval tree.
+    Every interval in the node contains its center.
+    """
+    center   : int
+    by_start : list[FluentInterval]
+    by_end   : list[FluentInterval]
+    left     : None|_IntervalNode = None
+    right    : None|_IntervalNode = None
+
+    @staticmethod
+    def build(intervals:list[FluentInterval]) -> None|_IntervalNode:
+        if not bool(intervals):
+            return None
+
+        points        = sorted(y for x in intervals for y in (x.start, x.end))
+        center        = points[len(points) // 2]
+        left, right   = [], []
+        here          = []
+        for interval in intervals:
+            if interval.end < center:
+                left.append(interval)
+            elif interval.start > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        return _IntervalNode(center,
+                             sorted(here, key=lambda x: x.start),
+                             sorted(here, key=lambda x: x.end, reverse=True),
+                             _IntervalNode.build(left),
+                             _IntervalNode.build(right))
+
+    def overlapping(self, start:int, end:int, results:list[FluentInterval]):
+        """ Add every interval in the subtree which overlaps [start, end] to results """
+        node = self
+        while node is not None:
+            if end < node.center:
+                # Every interval here ends at or after the center, so check their starts
+                for interval in node.by_start:
+                    if interval.start > end:
+                        break
+                    results.append(interval)
+                node = node.left
+            elif start > node.center:
+                # Every interval here starts at or before the center, so check their ends
+                for interval in node.by_end:
+                    if interval.end < start:
+                        break
+                    results.append(interval)
+                node = node.right
+            else:
+                results += node.by_start
+                if node.left is not None:
+                    node.left.overlapping(start, end, results)
+                node = node.right
+
+@dataclass
+class FluentIntervalIndex:
+    """
+    Usage:
+        index = trace.intervals
+        index.holding(3)           # fluents which hold at step 3
+        index.first_held("holdsat(perm(a),inst)")
+        index.overlapping(2, 5)    # intervals which hold at any step in [2, 5]
+    """
+
+    intervals : list[FluentInterval]       = field(default_factory=list)
+
+    _by_key   : dict[str, list[FluentInterval]] = field(init=False, default_factory=dict, repr=False)
+    _starts   : dict[str, list[int]]            = field(init=False, default_factory=dict, repr=False)
+    _root     : None|_IntervalNode              = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        self.intervals = sorted(self.intervals, key=lambda x: (x.start, str(x.term)))
+        for interval in self.intervals:
+            self._by_key.setdefault(interval_key(interval.term), []).append(interval)
+
+        for key, intervals in self._by_key.items():
+            self._starts[key] = [x.start for x in intervals]
+
+        self._root = _IntervalNode.build(self.intervals)
+
+    @staticmethod
+    def from_trace(trace:Trace_i) -> FluentIntervalIndex:
+        """
+        Build the index in a single pass over the trace's states.
+        A fluent's interval continues while it holds in consecutive states of the trace
+        """
+        results  = []
+        # key -> [term, start, end] of the fluent's current interval
+        tracking : dict[str, list] = {}
+        previous = None
+        for state in sorted(trace, key=lambda x: x.timestep):
+            curr_time = state.timestep
+            for fluent in state.fluents:
+                key = interval_key(fluent)
+                match tracking.get(key, None):
+                    case [_, _, end] as current if end == previous:
+                        current[-1] = curr_time
+                    case [term, start, end]:
+                        results.append(FluentInterval(term, start, end))
+                        tracking[key] = [fluent, curr_time, curr_time]
+                    case None:
+                        tracking[key] = [fluent, curr_time, curr_time]
+
+            previous = curr_time
+
+        results += [FluentInterval(*x) for x in tracking.values()]
+        return FluentIntervalIndex(results)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def __iter__(self) -> Iterator[FluentInterval]:
+        return iter(self.intervals)
+
+    def keys(self) -> Iterable[str]:
+        return self._by_key.keys()
+
+    def intervals_of(self, fluent:str|iAST.TermAST) -> list[FluentInterval]:
+        """ All the intervals of a single fluent, in order """
+        return self._by_key.get(self._key(fluent), [])
+
+    def first_held(self, fluent:str|iAST.TermAST) -> None|int:
+        """ The first step a fluent holds at, or None """
+        match self.intervals_of(fluent):
+            case [first, *_]:
+                return first.start
+            case _:
+                return None
+
+    def holds(self, fluent:str|iAST.TermAST, step:int) -> bool:
+        """ Test a single fluent at a step """
+        key = self._key(fluent)
+        if key not in self._starts:
+            return False
+
+        pos = bisect_right(self._starts[key], step) - 1
+        return pos >= 0 and self._by_key[key][pos].end >= step
+
+    def holding(self, step:int) -> list[FluentInterval]:
+        """ The intervals of every fluent which holds at a step """
+        return self.overlapping(step, step)
+
+    def overlapping(self, start:int, end:int) -> list[FluentInterval]:
+        """ Every interval which holds at any step in [start, end], ordered by start """
+        results = []
+        if self._root is not None and start <= end:
+            self._root.overlapping(start, end, results)
+
+        results.sort(key=lambda x: (x.start, str(x.term)))
+        return results
+
+    def _key(self, fluent:str|iAST.TermAST) -> str:
+        if isinstance(fluent, str) and fluent in self._by_key:
+            return fluent
+
+        return interval_key(fluent)
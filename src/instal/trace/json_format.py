@@ -0,0 +1,127 @@
+#/usr/bin/env python3
+"""
+Reading and writing the versions of trace json.
+
+Version 1 (unversioned files) stores every term of every state:
+    {"metadata": {}, "states": [{"timestep", "holdsat": {group: []}, "occurred", "observed", "rest"}]}
+
+Version 2 stores fluents as deltas between consecutive states,
+and is written without indentation:
+    {"version": 2, "metadata": {}, "states": [{"timestep", "initiated", "terminated", "occurred", "observed", "rest"}]}
+
+Terms remain timestamped strings, as in version 1.
+`initiated` fluents are timestamped at the step they start holding,
+`terminated` fluents at the last step they held.
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+from typing import TYPE_CHECKING, Any, Final, Iterable, Iterator
+
+import instal.interfaces.ast as iAST
+from clingo import Symbol
+from instal.trace.util import string_to_term, timeless_str
+
+if TYPE_CHECKING:
+    from instal.interfaces.trace import State_i, Trace_i
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+JSON_VERSIONS  : Final[tuple[int, ...]] = (1, 2)
+EVENT_GROUPS   : Final[tuple[str, ...]] = ("occurred", "observed", "rest")
+
+def json_version(data:dict) -> int:
+    version = data.get("version", 1)
+    if version not in JSON_VERSIONS:
+        raise ValueError("Unrecognised Trace Json Version", version)
+
+    return version
+
+def delta_states(states:Iterable[State_i]) -> list[dict]:
+    """ Convert states into version 2 state dicts, each relative to the state before it """
+    results = []
+    held    : dict[str, str] = {}
+    for state in sorted(states, key=lambda x: x.timestep):
+        current = {timeless_str(x) : str(x) for x in state.fluents}
+        results.append({
+            "timestep"   : state.timestep,
+            "initiated"  : sorted(v for k, v in current.items() if k not in held),
+            "terminated" : sorted(v for k, v in held.items() if k not in current),
+            "occurred"   : sorted(str(x) for x in state.occurred),
+            "observed"   : sorted(str(x) for x in state.observed),
+            "rest"       : sorted(str(x) for x in state.rest),
+        })
+        held = current
+
+    return results
+
+def dumps_delta(trace:Trace_i, filename=None) -> str:
+    trace_obj = {
+        "version"  : 2,
+        "metadata" : trace.metadata,
+        "states"   : delta_states(trace),
+    }
+    if filename is not None:
+        trace_obj['metadata']['filename'] = str(filename)
+
+    return json.dumps(trace_obj, sort_keys=True, separators=(",", ":"))
+
+def load_terms(data:dict, memo:None|dict[Symbol, iAST.TermAST]=None) -> Iterator[tuple[int, iAST.TermAST]]:
+    """
+    Read the (timestep, term) pairs of a trace json of any version.
+    Version 2 fluents are parsed once, when initiated,
+    and re-timestamped for each step they hold in.
+    """
+    memo = {} if memo is None else memo
+    match json_version(data):
+        case 1:
+            for state_dict in data['states']:
+                yield from state_terms(state_dict, memo)
+        case 2:
+            held : dict[str, iAST.TermAST] = {}
+            step_terms : dict[int, iAST.TermAST] = {}
+            for state_dict in data['states']:
+                assert(isinstance(state_dict, dict))
+                step = state_dict['timestep']
+                for term_s in state_dict.get('terminated', []):
+                    held.pop(timeless_str(string_to_term(term_s, memo)), None)
+
+                for term_s in state_dict.get('initiated', []):
+                    term = string_to_term(term_s, memo)
+                    held[timeless_str(term)] = term
+
+                if step not in step_terms:
+                    step_terms[step] = iAST.TermAST.intern(step)
+
+                for term in held.values():
+                    yield step, _retime(term, step_terms[step])
+
+                for group in EVENT_GROUPS:
+                    for term_s in state_dict.get(group, []):
+                        yield step, string_to_term(term_s, memo)
+
+def state_terms(state_dict:dict, memo:None|dict[Symbol, iAST.TermAST]=None) -> Iterator[tuple[int, iAST.TermAST]]:
+    """ Read the (timestep, term) pairs of a single version 1 state dict """
+    assert(isinstance(state_dict, dict))
+    step = state_dict['timestep']
+    for k,v in state_dict.items():
+        if k == "timestep":
+            continue
+        if k == "holdsat" and isinstance(v, dict):
+            terms = [y for x in v.values() for y in x]
+        else:
+            terms = v
+
+        for term in terms:
+            yield step, string_to_term(term, memo)
+
+def _retime(term:iAST.TermAST, step:iAST.TermAST) -> iAST.TermAST:
+    if term.params[-1].value == step.value:
+        return term
+
+    return iAST.TermAST.intern(term.value, params=term.params[:-1] + [step])
@@ -0,0 +1,183 @@
+#/usr/bin/env python3
+"""
+JSON Lines traces: a header line of {"format": "jsonl", "metadata": {}},
+followed by a line per state, in timestep order,
+each the version 1 state dict of instal.trace.json_format.
+
+States are written and read one at a time, so traces don't have to fit in memory.
+Each state line starts with its timestep, so the reader can
+skip lines outside of a range without parsing them as json,
+and records the offset of each line to seek to later ranges directly.
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib as pl
+import re
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any, Final, Iterable, Iterator
+
+from instal.trace.json_format import state_terms
+from instal.trace.trace import InstalTrace
+
+if TYPE_CHECKING:
+    from instal.interfaces.trace import State_i, Trace_i
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+JSONL_EXT     : Final[str]   = ".jsonl"
+JSONL_FORMAT  : Final[str]   = "jsonl"
+STEP_RE       : Final[re.Pattern] = re.compile(rb'\{"timestep":(-?\d+)')
+
+@dataclass
+class JsonlTraceWriter:
+    """
+    Usage:
+        with JsonlTraceWriter(path, trace.metadata) as writer:
+            for state in trace:
+                writer.write_state(state)
+    """
+    path     : pl.Path
+    metadata : dict = field(default_factory=dict)
+
+    _file    : None|IO = field(init=False, default=None, repr=False)
+
+    def __enter__(self) -> JsonlTraceWriter:
+        self._file = open(self.path, 'w')
+        self._file.write(json.dumps({"format": JSONL_FORMAT, "metadata": self.metadata}, sort_keys=True))
+        self._file.write("\n")
+        return self
+
+    def __exit__(self, *args):
+        self._file.close()
+        self._file = None
+
+    def write_state(self, state:State_i|dict):
+        state_dict = state if isinstance(state, dict) else state.to_json()
+        # The timestep goes first, for JsonlTraceReader to check without parsing
+        line       = {"timestep": state_dict['timestep']}
+        line.update(state_dict)
+        self._file.write(json.dumps(line, separators=(",", ":")))
+        self._file.write("\n")
+
+def write_jsonl(trace:Trace_i, path:pl.Path, filename=None):
+    """ Write a trace as json lines, a state at a time """
+    metadata = trace.metadata
+    if filename is not None:
+        metadata['filename'] = str(filename)
+
+    with JsonlTraceWriter(path, metadata) as writer:
+        for state in trace:
+            writer.write_state(state)
+
+@dataclass
+class JsonlTraceReader:
+    """
+    Usage:
+        reader = JsonlTraceReader(path)
+        reader.metadata
+        for state in reader.iter_states(start=5, end=10): ...
+        trace = reader.load(start=5, end=10)
+    """
+    path     : pl.Path
+
+    _metadata : None|dict     = field(init=False, default=None, repr=False)
+    _offsets  : dict[int, int] = field(init=False, default_factory=dict, repr=False)
+
+    @property
+    def metadata(self) -> dict:
+        if self._metadata is None:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+
+            if header.get("format", None) != JSONL_FORMAT:
+                raise ValueError("Not a JSON Lines Trace", self.path)
+
+            self._metadata = header['metadata']
+
+        return self._metadata
+
+    def states(self, start:None|int=None, end:None|int=None) -> Iterator[dict]:
+        """ Iterate the state dicts with timesteps in [start, end], reading the file a line at a time """
+        start = start or 0
+        end   = end if (end is not None and end > -1) else None
+        with open(self.path, 'rb') as f:
+            offset = self._seek(f, start)
+            for line in f:
+                line_offset = offset
+                offset     += len(line)
+                step        = self._line_step(line)
+                if step is None:
+                    continue
+
+                self._offsets.setdefault(step, line_offset)
+                if step < start:
+                    continue
+                if end is not None and step > end:
+                    break
+
+                yield json.loads(line)
+
+    def iter_states(self, start:None|int=None, end:None|int=None) -> Iterator[State_i]:
+        """ The states in [start, end], built a line at a time """
+        memo = {}
+        for state_dict in self.states(start, end):
+            state = InstalTrace.state_constructor(state_dict['timestep'])
+            for _, term in state_terms(state_dict, memo):
+                state.insert(term)
+
+            yield state
+
+    def load(self, start:None|int=None, end:None|int=None) -> Trace_i:
+        """ Load the states in [start, end] as an InstalTrace """
+        return InstalTrace(list(self.iter_states(start, end)), metadata=self.metadata.copy())
+
+    def _seek(self, f:IO, start:int) -> int:
+        """ Seek to the nearest recorded line at or before start, or past the header """
+        known = [x for x in self._offsets if x <= start]
+        if bool(known):
+            f.seek(self._offsets[max(known)])
+        else:
+            f.seek(0)
+            f.readline()
+
+        return f.tell()
+
+    def _line_step(self, line:bytes) -> None|int:
+        match STEP_RE.match(line):
+            case None:
+                return None
+            case x:
+                return int(x[1])
+
+def stream_filter(source:pl.Path, target:pl.Path, allow:list[str], reject:list[str], start:None|int=None, end:None|int=None) -> int:
+    """
+    Filter a json lines trace into another, a state at a time,
+    as InstalTrace.filter would. Returns the number of states written
+    """
+    reader = JsonlTraceReader(source)
+    count  = 0
+    with JsonlTraceWriter(target, reader.metadata) as writer:
+        for state in reader.iter_states(start, end):
+            writer.write_state(state.filter(allow, reject) if allow or reject else state)
+            count += 1
+
+    return count
+
+def load_trace(path:pl.Path, start:None|int=None, end:None|int=None) -> Trace_i:
+    """
+    Load a trace from .json or .jsonl.
+    Only json lines traces skip the states outside of [start, end] while reading
+    """
+    match path.suffix:
+        case x if x == JSONL_EXT:
+            return JsonlTraceReader(path).load(start, end)
+        case ".json":
+            return InstalTrace.from_json(json.loads(path.read_text()))
+        case _:
+            raise ValueError("Unrecognised Trace File Type", path)
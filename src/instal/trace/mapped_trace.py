@@ -0,0 +1,181 @@
+#/usr/bin/env python3
+"""
+A binary trace container, opened as a memory mapped ColumnarTrace.
+
+Layout, little endian:
+    magic    : b"INSTALTB"
+    header   : version, term count, step count, start step, metadata length, group names length, table length, members offset
+    metadata : utf-8 json
+    names    : the group names, utf-8, newline separated
+    table    : the interned terms without their timestep, utf-8, newline separated
+    groups   : a byte per term, its index in the group names
+    members  : a fixed width row of a byte per term, for each step, at an 8 byte aligned offset
+
+Opening reads the header, metadata and table,
+while the membership rows stay on disk, mapped as the transpose of ColumnarTrace._members.
+Terms are only parsed when a state or interval needs them,
+so opening, indexing states, and filtering by range don't copy the trace.
+
+Requires numpy (the `columnar` optional dependency).
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib as pl
+import re
+import struct
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Final
+
+import numpy as np
+import instal.interfaces.ast as iAST
+from instal.defaults import STATE_HOLDSAT_GROUPS
+from instal.interfaces.trace import Trace_i
+from instal.trace.columnar_trace import NON_FLUENT_GROUPS, ColumnarTrace
+from instal.trace.util import string_to_term
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+BINARY_EXT     : Final[str]             = ".itb"
+MAGIC          : Final[bytes]           = b"INSTALTB"
+BINARY_VERSION : Final[int]             = 1
+HEADER         : Final[struct.Struct]   = struct.Struct("<IIIiQQQQ")
+GROUPS         : Final[tuple[str, ...]] = tuple(STATE_HOLDSAT_GROUPS) + NON_FLUENT_GROUPS
+
+class TermTable(Sequence):
+    """ The interned terms of a binary trace, parsed on first access """
+
+    def __init__(self, strings:list[str], memo:dict=None):
+        self.strings = strings
+        self._memo   = {} if memo is None else memo
+        self._parsed : list[None|iAST.TermAST] = [None] * len(strings)
+
+    def __getitem__(self, index:int) -> iAST.TermAST:
+        if self._parsed[index] is None:
+            self._parsed[index] = string_to_term(self.strings[index], self._memo)
+
+        return self._parsed[index]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def subset(self, rows:list[int]) -> TermTable:
+        table = TermTable([self.strings[x] for x in rows], self._memo)
+        table._parsed = [self._parsed[x] for x in rows]
+        return table
+
+def write_binary(trace:Trace_i, path:pl.Path):
+    """ Write any trace as a binary trace """
+    if not isinstance(trace, ColumnarTrace):
+        trace = ColumnarTrace.from_trace(trace)
+
+    strings  = [str(x) for x in trace._terms]
+    table    = "\n".join(strings).encode()
+    metadata = json.dumps(trace.metadata, sort_keys=True).encode()
+    names    = "\n".join(GROUPS).encode()
+    groups   = bytes(GROUPS.index(x) for x in trace._groups)
+    before   = len(MAGIC) + HEADER.size + len(metadata) + len(names) + len(table) + len(groups)
+    offset   = before + (-before % 8)
+    steps    = trace._members.shape[1]
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(BINARY_VERSION, len(strings), steps, trace._start, len(metadata), len(names), len(table), offset))
+        f.write(metadata)
+        f.write(names)
+        f.write(table)
+        f.write(groups)
+        f.write(bytes(offset - before))
+        # A row per step
+        np.ascontiguousarray(trace._members.T, dtype=np.uint8).tofile(f)
+
+@dataclass
+class MappedTrace(ColumnarTrace):
+    """ A ColumnarTrace whose membership matrix is a read only memory map of a binary trace file.
+
+    Usage:
+        write_binary(trace, path)
+        trace = MappedTrace.open(path)
+        trace[3]
+        trace.filter([], [], start=2, end=5)
+        trace.fluent_intervals()
+    """
+    path : None|pl.Path = field(init=False, default=None)
+
+    @staticmethod
+    def open(path:pl.Path) -> MappedTrace:
+        path = pl.Path(path)
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("Not a Binary Instal Trace", path)
+
+            version, n_terms, n_steps, start, meta_len, names_len, table_len, offset = HEADER.unpack(f.read(HEADER.size))
+            if version != BINARY_VERSION:
+                raise ValueError("Unrecognised Binary Trace Version", version)
+
+            metadata = json.loads(f.read(meta_len))
+            names    = f.read(names_len).decode().split("\n")
+            strings  = f.read(table_len).decode().split("\n") if bool(n_terms) else []
+            groups   = f.read(n_terms)
+
+        trace           = MappedTrace([], metadata=metadata)
+        trace.path      = path
+        trace._terms    = TermTable(strings, trace._memo)
+        trace._groups   = [names[x] for x in groups]
+        trace._prefixes = [_prefix(x) for x in strings]
+        trace._lookup   = {x : i for i, x in enumerate(strings)}
+        trace._start    = start
+        if bool(n_terms) and bool(n_steps):
+            trace._members = np.memmap(path, dtype=bool, mode='r', offset=offset, shape=(n_steps, n_terms)).T
+        else:
+            trace._members = np.zeros((n_terms, n_steps), dtype=bool)
+
+        return trace
+
+    def filter(self, allow:list[str], reject:list[str], start:None|int=None, end:None|int=None) -> Trace_i:
+        """
+        Filter as ColumnarTrace does, without parsing the terms.
+        A filter of only a range of timesteps remains a view of the file
+        """
+        logging.info("Filtering")
+        start      = self._start if start is None else max(start, self._start)
+        end        = end if (end is not None and end > -1) else sys.maxsize
+        end        = min(end, self._start + len(self) - 1)
+        cols       = slice(start - self._start, max(0, end - self._start + 1))
+
+        filtered         = MappedTrace([], metadata=self.metadata.copy())
+        filtered.path    = self.path
+        filtered._start  = start
+        if not (allow or reject):
+            filtered._terms, filtered._groups     = self._terms, self._groups
+            filtered._prefixes, filtered._lookup  = self._prefixes, self._lookup
+            filtered._members                     = self._members[:, cols]
+            return filtered
+
+        allow_re   = re.compile("|".join(allow)) if bool(allow) else None
+        reject_re  = re.compile("|".join(reject)) if bool(reject) else None
+        rows       = [i for i, term in enumerate(self._terms.strings)
+                      if (not allow_re or allow_re.search(term))
+                      and (not reject_re or not reject_re.search(term))]
+
+        filtered._terms    = self._terms.subset(rows)
+        filtered._groups   = [self._groups[x] for x in rows]
+        filtered._prefixes = [self._prefixes[x] for x in rows]
+        filtered._lookup   = {x : i for i, x in enumerate(filtered._terms.strings)}
+        filtered._members  = self._members[rows, cols]
+        return filtered
+
+def _prefix(term_s:str) -> str:
+    """ The string of a timeless term, ready for a timestep and closing paren """
+    if term_s.endswith(")"):
+        return term_s[:-1] + ","
+
+    return term_s + "("
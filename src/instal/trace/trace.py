@@ -21,10 +21,13 @@ from uuid import UUID, uuid1
 from weakref import ref
 
 import instal.interfaces.ast as iAST
+from instal import defaults
 from clingo import Symbol, SymbolType
 from instal.interfaces.solver import InstalModelResult
 from instal.interfaces.trace import State_i, Trace_i
 from instal.trace.ast_state import InstalASTState
+from instal.trace.json_format import dumps_delta, load_terms
+from instal.trace.util import string_to_term, symbol_to_term
 
 if TYPE_CHECKING:
     # tc only imports
@@ -44,25 +47,14 @@ class InstalTrace(Trace_i):
 
     @staticmethod
     def from_json(json : List[Dict],filename : str = None) -> "InstalStateTrace":
+        """ Load a trace from json of any version, see instal.trace.json_format """
         metadata  = json['metadata']
         trace_len = metadata['model_length']
 
         states   = [InstalTrace.state_constructor(i)
                     for i in range(trace_len + 1)]
-        for state_dict in json['states']:
-            assert(isinstance(state_dict, dict))
-            step = state_dict['timestep']
-            state = states[step]
-            for k,v in state_dict.items():
-                if k == "timestep":
-                    continue
-                if k == "holdsat" and isinstance(v, dict):
-                    terms = [y for x in v.values() for y in x]
-                else:
-                    terms = v
-
-                for term in terms:
-                    state.insert(term)
+        for step, term in load_terms(json):
+            states[step].insert(term)
 
         # Wrap as a trace
         trace = InstalTrace(states, metadata=metadata)
@@ -78,16 +70,21 @@ class InstalTrace(Trace_i):
         metadata['current_result'] = model.number
         metadata['optimal']        = model.optimal
         metadata['model_length']   = steps
+        metadata['model_statistics'] = dict(model.statistics)
         metadata['instal_files']   = [str(x) for x in sources or []]
         metadata['institutions']  = []
 
         i_set : set[str] = set()
         states   = [InstalTrace.state_constructor(i)
                     for i in range(steps + 1)]
+        memo     = {}
         for term in model.shown:
             if term.name == "institution":
                 i_set.add(str(term.arguments[0]))
                 continue
+            if term.name == "bridge":
+                # Untimed links between institutions
+                continue
 
             # Get the step
             match term.arguments[-1]:
@@ -101,7 +98,7 @@ class InstalTrace(Trace_i):
                     raise Exception("Unexpected Term in Trace", term)
 
             # add to appropriate state
-            state.insert(term)
+            state.insert(symbol_to_term(term, memo))
 
         # Wrap as a trace
         metadata['institutions'] += list(i_set)
@@ -123,7 +120,16 @@ class InstalTrace(Trace_i):
         # Used for test cases.
         pass
 
-    def to_json_str(self, filename=None) -> str:
+    def to_json_str(self, filename=None, version:None|int=None) -> str:
+        """ Write the trace as json. Defaults to instal.defaults.TRACE_JSON_VERSION """
+        match version or defaults.TRACE_JSON_VERSION:
+            case 2:
+                return dumps_delta(self, filename)
+            case 1:
+                pass
+            case x:
+                raise ValueError("Unrecognised Trace Json Version", x)
+
         trace_obj = {
             "metadata" : self.metadata,
             "states"   : [s.to_json() for s in self]
@@ -148,25 +154,3 @@ class InstalTrace(Trace_i):
         filtered_trace  = InstalTrace(filtered_states, metadata=self.metadata.copy())
 
         return filtered_trace
-
-    def fluent_intervals(self) -> list[tuple[str, int, int]]:
-        """
-        Convert the Trace's individual timesteps
-        into a set of intervals for each fluent.
-        [fluent: TermAST, stepOn:int, stepOff:int]
-        """
-        results  = []
-        # dict to track when a fluent enters and exits
-        tracking : dict[str, list] = {}
-
-        for state in self:
-            curr_time = state.timestep
-            for fluent in state.fluents:
-                key = str(fluent.params[0])
-                match key in tracking:
-                    case False:
-                        tracking[key] = [fluent, curr_time, curr_time]
-                    case True:
-                        tracking[key][-1] = curr_time
-
-        return list(tracking.values())
@@ -0,0 +1,61 @@
+#/usr/bin/env python3
+"""
+A Tree of InstalTraces, sharing the common prefixes of states
+between the answer sets of a solver.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib as pl
+from dataclasses import dataclass
+from typing import ClassVar, Iterable
+
+from instal.interfaces.solver import SolverWrapper_i
+from instal.interfaces.trace import Trace_i, TraceTree_i
+from instal.trace.trace import InstalTrace
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+@dataclass
+class InstalTraceTree(TraceTree_i):
+    """
+    Usage:
+        tree = InstalTraceTree.from_solver(solver, steps)
+        for node in tree.branch_points():
+            print(tree.differences(node))
+
+        traces = list(tree)
+    """
+    trace_constructor : ClassVar[type[Trace_i]] = InstalTrace
+
+    @staticmethod
+    def from_traces(traces:Iterable[Trace_i]) -> InstalTraceTree:
+        tree = InstalTraceTree()
+        for trace in traces:
+            tree.add_trace(trace)
+
+        return tree
+
+    @staticmethod
+    def from_solver(solver:SolverWrapper_i, steps:int, sources:list[pl.Path]=None) -> InstalTraceTree:
+        """
+        Merge each of a solver's results into a tree,
+        as util.batch.traces_from_solver would build them.
+        Each trace is built and merged in turn,
+        so only the tree's states are kept
+        """
+        tree = InstalTraceTree()
+        for result in solver.results:
+            trace = InstalTrace.from_model(result,
+                                           steps=steps + 1,
+                                           metadata=solver.metadata.copy(),
+                                           sources=sources)
+            tree.add_trace(trace)
+
+        logging.info("Merged %s traces into %s states", len(tree), tree.node_count)
+        return tree
@@ -0,0 +1,69 @@
+#/usr/bin/env python3
+"""
+Conversion of clingo Symbols to TermASTs,
+without rendering and reparsing them through the pyparsing grammar.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+
+from clingo import Symbol, SymbolType, parse_term
+import instal.interfaces.ast as iAST
+
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+def symbol_to_term(sym:Symbol, memo:None|dict[Symbol, iAST.TermAST]=None) -> iAST.TermAST:
+    """
+    Convert a clingo Symbol to a TermAST, recursing over its arguments.
+    TermASTs are frozen, so the memo can share converted subterms
+    between every symbol converted with it.
+    eg: the fluent and institution of holdsat(F, I, T) across every T.
+    """
+    if memo is not None and sym in memo:
+        return memo[sym]
+
+    match sym.type:
+        case SymbolType.Number:
+            term = iAST.TermAST.intern(sym.number)
+        case SymbolType.Function:
+            name = sym.name if sym.positive else f"-{sym.name}"
+            term = iAST.TermAST.intern(name, params=[symbol_to_term(x, memo) for x in sym.arguments])
+        case _:
+            # Strings, #inf, #sup
+            term = iAST.TermAST.intern(str(sym))
+
+    if memo is not None:
+        memo[sym] = term
+
+    return term
+
+def string_to_term(text:str, memo:None|dict[Symbol, iAST.TermAST]=None) -> iAST.TermAST:
+    """
+    Convert the string of a ground term to a TermAST,
+    using clingo's term parser instead of the instal grammar
+    """
+    return symbol_to_term(parse_term(text), memo)
+
+def timeless_str(term:iAST.TermAST|Symbol) -> str:
+    """
+    The string of a term without its final timestep parameter,
+    eg: holdsat(perm(a),inst,3) -> holdsat(perm(a),inst).
+    Terms without a timestep are returned whole.
+    """
+    match term:
+        case Symbol() if term.type == SymbolType.Function and bool(term.arguments) and term.arguments[-1].type == SymbolType.Number:
+            name, params = (term.name if term.positive else f"-{term.name}"), term.arguments[:-1]
+        case iAST.TermAST(params=[*params, last]) if isinstance(last.value, int) or str(last.value).isdigit():
+            name = term.value
+        case _:
+            return str(term)
+
+    if not bool(params):
+        return name
+
+    return name + "(" + ",".join(str(x) for x in params) + ")"
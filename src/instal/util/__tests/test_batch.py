@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib
+from importlib.resources import files
+##-- end imports
+
+import pytest
+
+from instal import defaults
+from instal.interfaces.parser import InstalParser_i
+from instal.parser.v2.parser import InstalPyParser
+from instal.compiler.institution_compiler import InstalInstitutionCompiler
+from instal.solve.clingo_solver import ClingoSolver
+from instal.trace.jsonl import JsonlTraceReader
+from instal.util.batch import iter_traces, run_batch, traces_from_solver, write_traces
+from instal.util.compilation import load_parser
+
+logging = logmod.root
+
+data_path = files("instal.__tests.model_logic.__data")
+
+@pytest.fixture(scope="module")
+def program():
+    parser   = InstalPyParser()
+    compiler = InstalInstitutionCompiler()
+    inst     = parser.parse_institution(data_path / "minimal_rules.ial")
+    return "\n".join([compiler.load_prelude(), compiler.compile(inst)])
+
+class TestBatch:
+
+    def test_load_parser(self):
+        parser = load_parser()
+        assert(isinstance(parser, InstalParser_i))
+
+    def test_traces_from_solver(self, program):
+        solver = ClingoSolver(program, options=['-n', 1, '-c', 'horizon=2'])
+        solver.solve(InstalPyParser().parse_query("observed basicExEvent at 0"))
+        traces = traces_from_solver(solver, 2)
+        assert(len(traces) == 1)
+        assert(len(traces[0]) == 4)
+
+    def test_iter_traces(self, program):
+        solver = ClingoSolver(program, options=['-n', 0, '-c', 'horizon=1'])
+        traces = iter_traces(solver, [], 1)
+        assert(not isinstance(traces, list))
+        count  = 0
+        for trace in traces:
+            count += 1
+            assert(len(trace) == 3)
+
+        assert(1 < count)
+        assert(not bool(solver.results))
+
+    def test_iter_traces_metadata(self, program):
+        solver = ClingoSolver(program, options=['-n', 0, '-c', 'horizon=1'])
+        for trace in iter_traces(solver, [], 1):
+            assert("statistics" not in trace.metadata)
+            assert("solve" not in trace.metadata['timings'])
+            assert("ground" in trace.metadata['timings'])
+
+    def test_write_traces_streamed(self, program, tmp_path):
+        solver  = ClingoSolver(program, options=['-n', 0, '-c', 'horizon=1'])
+        written = write_traces(iter_traces(solver, [], 1), tmp_path / "out")
+        assert(1 < len(written))
+        assert(all(x.exists() for x in written))
+
+    def test_write_traces(self, program, tmp_path):
+        solver = ClingoSolver(program, options=['-n', 1, '-c', 'horizon=2'])
+        solver.solve()
+        written = write_traces(traces_from_solver(solver, 2), tmp_path / "out", as_json=True)
+        assert(len(written) == 1)
+        assert(written[0].name == "trace_0.json")
+        assert("states" in json.loads(written[0].read_text()))
+
+    def test_write_traces_jsonl(self, program, tmp_path):
+        solver  = ClingoSolver(program, options=['-n', 0, '-c', 'horizon=1'])
+        written = write_traces(iter_traces(solver, [], 1), tmp_path / "out", as_jsonl=True)
+        assert(1 < len(written))
+        assert(all(x.suffix == ".jsonl" for x in written))
+        assert(len(JsonlTraceReader(written[0]).load()) == 3)
+
+    def test_run_batch(self, program, tmp_path):
+        queries = []
+        # events are observed at 0..horizon-1
+        for i in range(2):
+            query = tmp_path / f"query_{i}{defaults.QUERY_EXT}"
+            query.write_text(f"observed basicExEventWithParam(first) at {i}")
+            queries.append(query)
+
+        results = run_batch(queries, program,
+                            output=tmp_path / "out",
+                            steps=2,
+                            options=['-n', 1, '-c', 'horizon=2'],
+                            workers=2,
+                            as_json=True)
+
+        assert(all(results[x] == 1 for x in queries))
+        for i, query in enumerate(queries):
+            trace = json.loads((tmp_path / "out" / query.stem / "trace_0.json").read_text())
+            observed = [x for state in trace['states'] for x in state['observed']]
+            assert(f"observed(basicExEventWithParam(first),{i})" in observed)
+
+    def test_run_batch_stream(self, program, tmp_path):
+        query = tmp_path / f"query{defaults.QUERY_EXT}"
+        query.write_text("observed basicExEventWithParam(first) at 0")
+        results = run_batch([query], program,
+                            output=tmp_path / "out",
+                            steps=2,
+                            options=['-n', 2, '-c', 'horizon=2'],
+                            workers=1,
+                            stream=True)
+        assert(results[query] == 2)
+        assert(len(list((tmp_path / "out" / query.stem).iterdir())) == 2)
+
+    def test_run_batch_failure(self, program, tmp_path):
+        query = tmp_path / f"bad{defaults.QUERY_EXT}"
+        query.write_text("observed bad(( at 0")
+
+        results = run_batch([query], program, output=tmp_path / "out", steps=2, workers=1)
+        assert(results[query] is None)
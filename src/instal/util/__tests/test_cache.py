@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import os
+import pathlib
+from importlib.resources import files
+##-- end imports
+
+import pytest
+
+import instal.parser.v2.institution_parse_funcs as IPF
+import instal.util.cache as cache_mod
+from instal.parser.v2.parser import InstalPyParser
+from instal.util.cache import ASTCache, CompileCache
+
+logging = logmod.root
+
+data_path = files("instal.__tests.model_logic.__data")
+
+@pytest.fixture
+def source(tmp_path):
+    target = tmp_path / "test.ial"
+    target.write_text("institution test;")
+    return target
+
+class TestCompileCache:
+
+    def test_initial(self, tmp_path):
+        cache = CompileCache(tmp_path / "cache")
+        assert(isinstance(cache, CompileCache))
+        assert(len(cache) == 0)
+
+    def test_key_stable(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        assert(cache.key(source) == cache.key(source))
+
+    def test_key_content(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        first = cache.key(source)
+        source.write_text("institution other;")
+        assert(first != cache.key(source))
+
+    def test_key_parser(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        assert(cache.key(source) != cache.key(source, "some.other.Parser"))
+
+    def test_key_options(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        assert(cache.key(source, incremental=False) != cache.key(source, incremental=True))
+
+    def test_key_templates(self, tmp_path, source, monkeypatch):
+        cache = CompileCache(tmp_path / "cache")
+        first = cache.key(source)
+        monkeypatch.setattr(cache_mod, "resource_digest", lambda *locs: "changed")
+        assert(first != cache.key(source))
+
+    def test_resource_digest(self):
+        digest = cache_mod.resource_digest("instal.__data.compilation_templates.v2")
+        assert(digest == cache_mod.resource_digest("instal.__data.compilation_templates.v2"))
+        assert(digest != cache_mod.resource_digest("instal.__data.compilation_templates.v1"))
+
+    def test_key_cwd(self, tmp_path, source, monkeypatch):
+        cache = CompileCache(tmp_path / "cache")
+        monkeypatch.chdir(tmp_path)
+        first = cache.key(source)
+        (tmp_path / "sub").mkdir()
+        monkeypatch.chdir(tmp_path / "sub")
+        assert(first != cache.key(source))
+
+    def test_key_outside_cwd(self, tmp_path, source, monkeypatch):
+        cache = CompileCache(tmp_path / "cache")
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        monkeypatch.chdir(tmp_path / "a")
+        first = cache.key(source)
+        monkeypatch.chdir(tmp_path / "b")
+        assert(first == cache.key(source))
+
+    def test_miss(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        assert(cache.get(cache.key(source)) is None)
+        assert(cache.misses == 1)
+
+    def test_put_get(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        key   = cache.key(source)
+        cache.put(key, "a. b. c.")
+        assert(key in cache)
+        assert(cache.get(key) == "a. b. c.")
+        assert(cache.hits == 1)
+
+    def test_persistent(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        key   = cache.key(source)
+        cache.put(key, "a. b. c.")
+
+        other = CompileCache(tmp_path / "cache")
+        assert(other.get(key) == "a. b. c.")
+
+    def test_eviction_lru(self, tmp_path):
+        cache = CompileCache(tmp_path / "cache", max_size=35)
+        keys  = [f"{x:02}" * 32 for x in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, "a" * 10)
+            path = cache._path(key)
+            os.utime(path, (i, i))
+
+        # Use the oldest, so the middle entry is least recently used:
+        cache.get(keys[0])
+        cache.put("ff" * 32, "b" * 10)
+        assert(keys[0] in cache)
+        assert(keys[1] not in cache)
+        assert(len(cache) == 3)
+
+    def test_eviction_scans_only_when_over(self, tmp_path, monkeypatch):
+        cache   = CompileCache(tmp_path / "cache", max_size=25)
+        scans   = []
+        entries = cache._entries
+        monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+        cache.put("01" * 32, "a" * 10)
+        cache.put("02" * 32, "a" * 10)
+        cache.put("02" * 32, "a" * 10)
+        assert(len(scans) == 1)
+        cache.put("03" * 32, "a" * 10)
+        assert(len(scans) == 2)
+        assert(cache._size <= 25)
+
+    def test_clear(self, tmp_path, source):
+        cache = CompileCache(tmp_path / "cache")
+        cache.put(cache.key(source), "a. b. c.")
+        cache.clear()
+        assert(len(cache) == 0)
+
+class TestASTCache:
+
+    def test_initial(self, tmp_path):
+        cache = ASTCache(tmp_path / "cache")
+        assert(isinstance(cache, ASTCache))
+        assert(len(cache) == 0)
+
+    def test_key_parse_fn(self, tmp_path, source):
+        cache = ASTCache(tmp_path / "cache")
+        assert(cache.key(source, "parse_institution") != cache.key(source, "parse_bridge"))
+
+    def test_put_get(self, tmp_path, source):
+        cache = ASTCache(tmp_path / "cache")
+        key   = cache.key(source, "parse_institution")
+        asts  = InstalPyParser().parse_institution(data_path / "minimal_rules.ial")
+        cache.put(key, asts)
+        loaded = cache.get(key)
+        assert(loaded == asts)
+        assert(loaded[0].parse_source == asts[0].parse_source)
+        assert(loaded[0].parse_loc == asts[0].parse_loc)
+
+    def test_corrupt_entry(self, tmp_path, source):
+        cache = ASTCache(tmp_path / "cache")
+        key   = cache.key(source, "parse_institution")
+        cache._write(key, b"not a pickle")
+        assert(cache.get(key) is None)
+        assert(key not in cache)
+
+    def test_parser_uses_cache(self, tmp_path, mocker):
+        cache  = ASTCache(tmp_path / "cache")
+        parser = InstalPyParser(ast_cache=cache)
+        target = pathlib.Path(data_path / "minimal_rules.ial")
+        first  = parser.parse_institution(target)
+        assert(cache.misses == 1)
+        assert(len(cache) == 1)
+
+        spy    = mocker.spy(IPF.top_institution, "parse_string")
+        second = parser.parse_institution(target)
+        assert(cache.hits == 1)
+        assert(spy.call_count == 0)
+        assert(first == second)
+
+    def test_parser_strings_not_cached(self, tmp_path):
+        cache  = ASTCache(tmp_path / "cache")
+        parser = InstalPyParser(ast_cache=cache)
+        parser.parse_institution("institution test;")
+        assert(len(cache) == 0)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib
+from importlib.resources import files
+##-- end imports
+
+import pytest
+
+from instal.compiler.institution_compiler import InstalInstitutionCompiler
+from instal.util.cache import CompileCache
+from instal.util.compilation import compile_target
+
+logging = logmod.root
+
+data_path = files("instal.__tests.model_logic.__data")
+
+@pytest.fixture
+def targets():
+    names = ["minimal_inst.ial", "minimal_events.ial", "minimal_fluents.ial", "minimal_rules.ial"]
+    return [pathlib.Path(data_path / x) for x in names]
+
+class TestCompileTarget:
+
+    def test_basic(self, targets):
+        result = compile_target(targets)
+        assert(len(result) == len(targets))
+        assert(all(isinstance(x, str) for x in result))
+
+    def test_with_prelude(self, targets):
+        result = compile_target(targets, with_prelude=True)
+        # The prelude is only added once:
+        assert(len(result) == len(targets) + 1)
+        assert(result[0] == InstalInstitutionCompiler().load_prelude())
+
+    def test_unrecognized(self, targets, tmp_path):
+        other = tmp_path / "blah.txt"
+        other.write_text("blah")
+        result = compile_target(targets + [other])
+        assert(len(result) == len(targets))
+
+    def test_error(self, targets, tmp_path):
+        bad = tmp_path / "bad.ial"
+        bad.write_text("institution bad(;")
+        assert(compile_target(targets + [bad]) == [])
+
+    def test_parallel_matches_serial(self, targets):
+        serial   = compile_target(targets, with_prelude=True)
+        parallel = compile_target(targets, with_prelude=True, workers=2)
+        assert(serial == parallel)
+
+    def test_parallel_error(self, targets, tmp_path):
+        bad = tmp_path / "bad.ial"
+        bad.write_text("institution bad(;")
+        assert(compile_target(targets + [bad], workers=2) == [])
+
+    def test_parallel_with_cache(self, targets, tmp_path):
+        cache    = CompileCache(tmp_path / "cache")
+        serial   = compile_target(targets[:2], with_prelude=True, cache=cache)
+        parallel = compile_target(targets, with_prelude=True, cache=cache, workers=2)
+        assert(cache.hits == 2)
+        assert(parallel[:3] == serial)
+        assert(parallel == compile_target(targets, with_prelude=True))
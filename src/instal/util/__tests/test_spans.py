@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+
+"""
+##-- imports
+from __future__ import annotations
+
+import json
+import logging as logmod
+import pathlib
+import threading
+##-- end imports
+
+import pytest
+
+from instal.solve.clingo_solver import ClingoSolver
+from instal.util import spans
+
+logging = logmod.root
+
+class CollectingSink(spans.SpanSink_i):
+
+    def __init__(self):
+        self.records = []
+        self.closed  = False
+
+    def record(self, span):
+        self.records.append(span)
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def sink():
+    sink = CollectingSink()
+    spans.set_sink(sink)
+    yield sink
+    spans.set_sink(None)
+
+class TestSpans:
+
+    def test_disabled(self):
+        assert(spans.get_sink() is None)
+        with spans.span("test") as sp:
+            sp.set(val=2)
+
+        assert(spans.span("test") is spans.span("other"))
+
+    def test_record(self, sink):
+        with spans.span("test", val=1) as sp:
+            sp.set(other=2)
+
+        assert(len(sink.records) == 1)
+        assert(sink.records[0].name == "test")
+        assert(sink.records[0].attrs == {"val": 1, "other": 2})
+        assert(0 <= sink.records[0].duration)
+
+    def test_nesting(self, sink):
+        with spans.span("outer"):
+            with spans.span("inner"):
+                pass
+
+        assert([x.name for x in sink.records] == ["inner", "outer"])
+        assert([x.depth for x in sink.records] == [1, 0])
+
+    def test_error(self, sink):
+        with pytest.raises(KeyError):
+            with spans.span("test"):
+                raise KeyError()
+
+        assert(sink.records[0].attrs['error'] == "KeyError")
+        with spans.span("after"):
+            pass
+
+        assert(sink.records[1].depth == 0)
+
+    def test_depth_per_thread(self, sink):
+        def worker():
+            with spans.span("thread"):
+                pass
+
+        with spans.span("outer"):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            with spans.span("inner"):
+                pass
+
+        assert({x.name : x.depth for x in sink.records} == {"thread": 0, "inner": 1, "outer": 0})
+
+    def test_set_sink_closes(self, sink):
+        spans.set_sink(CollectingSink())
+        assert(sink.closed)
+
+    def test_set_sink_no_close(self, sink):
+        spans.set_sink(CollectingSink(), close=False)
+        assert(not sink.closed)
+
+    def test_solver_phases(self, sink):
+        solver = ClingoSolver("a.")
+        solver.solve()
+        names = [x.name for x in sink.records]
+        assert({"solver.load", "solver.add", "solver.ground", "solver.solve"} <= set(names))
+
+    def test_jsonl(self, tmp_path):
+        spans.set_sink(spans.build_sink("jsonl", tmp_path))
+        with spans.span("test", val=1):
+            pass
+        spans.set_sink(None)
+        lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+        assert(len(lines) == 1)
+        assert(json.loads(lines[0])['attrs'] == {"val": 1})
+
+    def test_chrome(self, tmp_path):
+        spans.set_sink(spans.build_sink("chrome", tmp_path))
+        with spans.span("solver.test"):
+            pass
+        spans.set_sink(None)
+        events = json.loads((tmp_path / "spans.json").read_text())['traceEvents']
+        assert(len(events) == 1)
+        assert(events[0]['ph'] == "X")
+        assert(events[0]['cat'] == "solver")
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            spans.build_sink("blah", tmp_path)
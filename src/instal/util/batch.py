@@ -0,0 +1,155 @@
+#/usr/bin/env python3
+"""
+Utilities for running many queries against a single compiled program.
+
+The program is compiled once, then each worker process of a ProcessPoolExecutor
+warms its own SolverPool with a grounded solver in its initializer.
+The pool parses the program text into a ClingoProgram once per worker,
+so rebuilding the solver (eg: after clingo fails) doesn't parse it again.
+Each query leases that solver, so is only an assignment of externals and a solve,
+with the resulting traces written to disk by the worker as it completes.
+The pool resets the solver between queries, and replaces it if clingo failed.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import pathlib as pl
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
+                    Iterable, Iterator, Mapping, Match, MutableMapping,
+                    Protocol, Sequence, Tuple, TypeAlias, TypeGuard, TypeVar,
+                    cast, final, overload, runtime_checkable)
+
+from instal import defaults
+from instal.interfaces.parser import InstalParser_i
+from instal.solve.clingo_solver import ClingoSolver
+from instal.solve.solver_pool import SolverPool
+from instal.trace.jsonl import JSONL_EXT, write_jsonl
+from instal.trace.trace import InstalTrace
+from instal.util.compilation import load_parser
+from instal.util.spans import set_sink, span
+
+if TYPE_CHECKING:
+    # tc only imports
+    from instal.interfaces.solver import SolverWrapper_i
+    from instal.interfaces.trace import Trace_i
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+# Timings which are incomplete until a solve finishes
+STREAMED_TIMINGS : Final[tuple[str, ...]] = ("solve", "callback")
+
+# Per-process state, set by the pool initializer
+_worker_pool   : None|SolverPool      = None
+_worker_args   : dict[str, Any]       = {}
+_worker_parser : None|InstalParser_i  = None
+
+def traces_from_solver(solver:SolverWrapper_i, steps:int, sources:list[pl.Path]=None) -> list[Trace_i]:
+    """
+    Convert each result of a solver to a trace.
+    Traces include the state after the final step,
+    so are `steps + 1` long
+    """
+    with span("trace.from_model", models=len(solver.results)):
+        return [InstalTrace.from_model(result,
+                                       steps=steps + 1,
+                                       metadata=solver.metadata.copy(),
+                                       sources=sources)
+                for result in solver.results]
+
+def iter_traces(solver:SolverWrapper_i, assignments:list, steps:int, sources:list[pl.Path]=None) -> Iterator[Trace_i]:
+    """
+    Solve, converting each model to a trace as it is found,
+    without storing the models in the solver.
+    As the solve is still running, the metadata of each trace
+    has no solve statistics, or timings of the solve itself
+    """
+    for result in solver.iter_models(assignments):
+        metadata = solver.metadata.copy()
+        metadata.pop("statistics", None)
+        metadata['timings'] = {k:v for k,v in metadata.get("timings", {}).items() if k not in STREAMED_TIMINGS}
+        with span("trace.from_model", model=result.number):
+            trace = InstalTrace.from_model(result,
+                                           steps=steps + 1,
+                                           metadata=metadata,
+                                           sources=sources)
+        yield trace
+
+def write_traces(traces:Iterable[Trace_i], output:pl.Path, as_json:bool=False, as_jsonl:bool=False) -> list[pl.Path]:
+    """
+    Write traces as output/trace_[num].{txt|json|jsonl}
+    Traces can be an iterator, in which case each is written as it arrives.
+    json lines traces are written a state at a time.
+    """
+    ext     : str = JSONL_EXT if as_jsonl else (".json" if as_json else ".txt")
+    written : list[pl.Path] = []
+    logging.info("Writing Traces to %s/trace_[num]%s", output, ext)
+    output.mkdir(parents=True, exist_ok=True)
+    for i, trace in enumerate(traces):
+        current_filename = f"trace_{i}{ext}"
+        with span("trace.write", filename=current_filename):
+            match ext:
+                case ".txt":
+                    (output / current_filename).write_text(repr(trace))
+                case ".json":
+                    (output / current_filename).write_text(trace.to_json_str(current_filename))
+                case _:
+                    write_jsonl(trace, output / current_filename, current_filename)
+
+        written.append(output / current_filename)
+
+    return written
+
+def _init_worker(solver_cls:type, program:str, input_files:list[pl.Path], options:list, solver_kwargs:dict, parser_import:str):
+    global _worker_pool, _worker_args, _worker_parser
+    logging.info("Initialising Batch Worker")
+    set_sink(None, close=False)
+    _worker_parser = load_parser(parser_import)
+    _worker_pool   = SolverPool(size=1)
+    _worker_args   = dict(program=program, input_files=input_files, options=options, solver_cls=solver_cls, **solver_kwargs)
+    _worker_pool.warm(**_worker_args)
+
+def _run_query(query:pl.Path, output:pl.Path, steps:int, as_json:bool, sources:list[pl.Path], stream:bool=False, as_jsonl:bool=False) -> tuple[pl.Path, int]:
+    """
+    Solve a single query with the worker's grounded solver,
+    and write its traces to output/{query stem}/
+    """
+    assignments = _worker_parser.parse_query(query)[:]
+    with _worker_pool.lease(**_worker_args) as solver:
+        if stream:
+            written = write_traces(iter_traces(solver, assignments, steps, sources), output / query.stem, as_json=as_json, as_jsonl=as_jsonl)
+            return query, len(written)
+
+        count       = solver.solve(assignments)
+        traces      = traces_from_solver(solver, steps, sources)
+        write_traces(traces, output / query.stem, as_json=as_json, as_jsonl=as_jsonl)
+        return query, count
+
+def run_batch(queries:list[pl.Path], program:str, *, output:pl.Path, steps:int, input_files:list[pl.Path]=None, options:list=None, solver_cls:type=ClingoSolver, solver_kwargs:dict=None, workers:None|int=None, as_json:bool=False, as_jsonl:bool=False, sources:list[pl.Path]=None, parser_import:str=defaults.PARSER, stream:bool=False) -> dict[pl.Path, None|int]:
+    """
+    Solve each query file against the same program,
+    spread over a pool of `workers` processes (defaults to the cpu count).
+    stream=True writes each trace as its model is found, instead of after solving.
+
+    Returns a dict of query path -> number of models, or None if the query failed.
+    """
+    logging.info("Running Batch of %s queries", len(queries))
+    results  : dict[pl.Path, None|int] = {}
+    initargs = (solver_cls, program, list(input_files or []), list(options or []), solver_kwargs or {}, parser_import)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        futures = {pool.submit(_run_query, query, output, steps, as_json, sources, stream, as_jsonl): query for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                _, count       = future.result()
+                results[query] = count
+                logging.info("Query Complete: %s : %s models", query.name, count)
+            except Exception as err:
+                results[query] = None
+                logging.error("Query Failed: %s : %s", query.name, err)
+
+    return results
@@ -0,0 +1,238 @@
+#/usr/bin/env python3
+"""
+Persistent, content addressed caches of compiled and parsed instal files.
+
+Entries are keyed on the content of the source file, and everything else
+that determines what it produces (parser, the contents of the compilation templates and prelude,
+instal version, and the working directory paths are written relative to).
+Entries are stored as individual files, and evicted least recently used first,
+when the cache exceeds its size bound.
+"""
+##-- imports
+from __future__ import annotations
+
+import logging as logmod
+import os
+import pathlib as pl
+import pickle
+import zlib
+from dataclasses import InitVar, dataclass, field
+from functools import cache
+from hashlib import sha256
+from importlib.resources import files
+from tempfile import NamedTemporaryFile
+from typing import Any, ClassVar
+
+import instal
+from instal import defaults
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+@cache
+def resource_digest(*locs:str) -> str:
+    """
+    A hash of the contents of package data directories (eg: compilation templates),
+    computed once per process
+    """
+    hashed = sha256()
+    queue  = [files(x) for x in locs]
+    while bool(queue):
+        current = queue.pop(0)
+        if current.is_dir():
+            queue += sorted(current.iterdir(), key=lambda x: x.name)
+            continue
+
+        hashed.update(current.name.encode())
+        hashed.update(b"\0")
+        hashed.update(current.read_bytes())
+
+    return hashed.hexdigest()
+
+@dataclass
+class FileCache_i:
+    """
+    The shared storage of the caches:
+    entries are stored as {root}/{key[:2]}/{key}{ext}
+
+    Uses file mtimes to track recency of use, so eviction is LRU.
+    The total size is scanned once, then tracked as entries are written,
+    so the cache directory is only rescanned when evicting.
+    Entries written by other processes are only counted on the next scan.
+    """
+    ext      : ClassVar[str] = ".bin"
+
+    root     : pl.Path = field(default_factory=lambda: pl.Path(defaults.CACHE_loc).expanduser())
+    max_size : int     = field(default_factory=lambda: int(defaults.CACHE_MAX_SIZE))
+
+    hits     : int     = field(init=False, default=0)
+    misses   : int     = field(init=False, default=0)
+    _size    : None|int = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        self.root = pl.Path(self.root).expanduser().resolve()
+
+    def __contains__(self, key:str):
+        return self._path(key).exists()
+
+    def __len__(self):
+        return len(self._entries())
+
+    def _hash(self, target:pl.Path, *parts:str) -> str:
+        hashed = sha256()
+        for part in [str(target), *parts, instal.__version__]:
+            hashed.update(part.encode())
+            hashed.update(b"\0")
+
+        hashed.update(target.read_bytes())
+        return hashed.hexdigest()
+
+    def _read(self, key:str) -> None|bytes:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # Mark as recently used:
+        os.utime(path)
+        self.hits += 1
+        return data
+
+    def _write(self, key:str, data:bytes):
+        path = self._path(key)
+        if self._size is None:
+            self._size = sum(x[1] for x in self._entries())
+
+        try:
+            self._size -= path.stat().st_size
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename, so concurrent readers never see a partial entry
+        with NamedTemporaryFile("wb", dir=path.parent, delete=False, suffix=".tmp") as tmp:
+            tmp.write(data)
+
+        os.replace(tmp.name, path)
+        self._size += len(data)
+        if self.max_size < self._size:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache is under its max_size
+        """
+        entries    = self._entries()
+        total      = sum(x[1] for x in entries)
+        self._size = total
+        if total <= self.max_size:
+            return
+
+        logging.info("%s over size (%s > %s), evicting", self.__class__.__name__, total, self.max_size)
+        for path, size, _ in sorted(entries, key=lambda x: x[2]):
+            if total <= self.max_size:
+                break
+
+            path.unlink(missing_ok=True)
+            total -= size
+
+        self._size = total
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            path.unlink(missing_ok=True)
+
+        self._size = 0
+
+    def _path(self, key:str) -> pl.Path:
+        return self.root / key[:2] / f"{key}{self.ext}"
+
+    def _entries(self) -> list[tuple[pl.Path, int, float]]:
+        entries = []
+        if not self.root.exists():
+            return entries
+
+        for path in self.root.glob(f"*/*{self.ext}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+@dataclass
+class CompileCache(FileCache_i):
+    """
+    Maps source files to their compiled logic programs.
+    """
+    ext : ClassVar[str] = defaults.COMPILED_EXT
+
+    def key(self, target:pl.Path, parser_import:str=defaults.PARSER, **kwargs) -> str:
+        """
+        Build the key for a target, from its content, location, and how it is compiled.
+        The location is included because compiled output records its source.
+        Sources under the working directory are recorded relative to it, so it is included for them.
+        kwargs are additional compilation options (eg: incremental=True)
+        """
+        cwd = pl.Path.cwd()
+        return self._hash(target,
+                          parser_import,
+                          resource_digest(defaults.COMP_DATA_loc,
+                                          defaults.STANDARD_PRELUDE_loc,
+                                          defaults.STANDARD_PRELUDE_INCREMENTAL_loc),
+                          str(cwd) if target.absolute().is_relative_to(cwd) else "",
+                          repr(sorted(kwargs.items())))
+
+    def get(self, key:str) -> None|str:
+        data = self._read(key)
+        return None if data is None else data.decode()
+
+    def put(self, key:str, text:str):
+        self._write(key, text.encode())
+
+@dataclass
+class ASTCache(FileCache_i):
+    """
+    Maps source files to the ASTs parsed from them,
+    stored as zlib compressed pickles.
+
+    ASTs keep their parse_source and parse_loc,
+    so validators and compilers can use them as if freshly parsed.
+    """
+    ext : ClassVar[str] = ".ast"
+
+    root : pl.Path = field(default_factory=lambda: pl.Path(defaults.AST_CACHE_loc).expanduser())
+
+    def key(self, target:pl.Path, parse_fn:str) -> str:
+        """
+        Build the key for a target, from its content, location,
+        and the qualified name of the parse function
+        """
+        return self._hash(target, parse_fn)
+
+    def get(self, key:str) -> None|list[Any]:
+        data = self._read(key)
+        if data is None:
+            return None
+
+        try:
+            return pickle.loads(zlib.decompress(data))
+        except Exception as err:
+            logging.warning("Discarding unreadable AST Cache entry: %s : %s", key, err)
+            self._path(key).unlink(missing_ok=True)
+            return None
+
+    def put(self, key:str, asts:list[Any]):
+        try:
+            data = zlib.compress(pickle.dumps(asts, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            logging.warning("ASTs could not be cached: %s", err)
+            return
+
+        self._write(key, data)
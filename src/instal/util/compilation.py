@@ -6,8 +6,10 @@
 from __future__ import annotations
 
 import abc
+import importlib
 import logging as logmod
 import pathlib as pl
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from dataclasses import InitVar, dataclass, field
 from re import Pattern
@@ -18,17 +20,76 @@ from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Final, Generic,
 from uuid import UUID, uuid1
 from weakref import ref
 
+import pyparsing as pp
+from instal import defaults
+from instal.interfaces.parser import InstalParser_i
+from instal.util.spans import set_sink, span
+
 if TYPE_CHECKING:
     # tc only imports
-    pass
+    from instal.interfaces.compiler import InstalCompiler_i
+    from instal.util.cache import ASTCache, CompileCache
 ##-- end imports
 
 ##-- logging
 logging = logmod.getLogger(__name__)
 ##-- end logging
 
+# Per-process parser, set by the pool initializer
+_worker_parser : None|InstalParser_i = None
+
+def load_parser(parser_import:str=defaults.PARSER, **kwargs) -> InstalParser_i:
+    """
+    Import and build a parser from an import string, eg: defaults.PARSER
+    kwargs are passed to the parser's constructor
+    """
+    parser_module_str = ".".join(parser_import.split(".")[:-1])
+    parser_class_str  = parser_import.split(".")[-1]
+    logging.info("Loading Parser Module : %s", parser_module_str)
+    parser_module     = importlib.import_module(parser_module_str)
+    logging.info("Loading Parser Class  : %s", parser_class_str)
+    parser            = getattr(parser_module, parser_class_str)(**kwargs)
+    assert(isinstance(parser, InstalParser_i))
+    return parser
 
-def compile_target(targets:list[pathlib.Path], debug=False, with_prelude=False, check=False, parser_import:str=defaults.PARSER) -> list[str]:
+def parse_and_compile(parser:InstalParser_i, target:pl.Path, parse_name:str, compiler:InstalCompiler_i, check=False) -> tuple[None|str, None|str]:
+    """
+    Parse and compile a single target.
+    Returns (compiled text, None), or (None, error message),
+    so errors can be reported in order, and don't need to be pickled from workers.
+    """
+    validator = None
+    try:
+        with span("parse", target=target.name, parser=parser.__class__.__name__):
+            ast = getattr(parser, parse_name)(target)
+
+        if check and validator:
+            validator.validate(ast)
+
+        with span("compile", target=target.name, compiler=compiler.__class__.__name__) as sp:
+            compiled = compiler.compile(ast)
+            sp.set(size=len(compiled))
+
+        return compiled, None
+    except pp.ParseException as exp:
+        return None, "File: {} : (line {} column {}) : {} : {}".format(target.name, exp.lineno, exp.col, exp.msg, exp.markInputline())
+    except pp.ParseFatalException as exp:
+        return None, "File: {} : (line {} column {}) : {} : {}".format(target.name, exp.lineno, exp.col, exp.msg, exp.markInputline())
+    except AssertionError as err:
+        return None, "File: {} : {}".format(target.name, str(err))
+    except Exception as err:
+        return None, "File: {} : {}".format(target.name, str(err))
+
+def _init_worker(parser_import:str, ast_cache:None|ASTCache):
+    global _worker_parser
+    set_sink(None, close=False)
+    _worker_parser = load_parser(parser_import, ast_cache=ast_cache)
+
+def _worker_parse_and_compile(target:pl.Path, parse_name:str, compiler:InstalCompiler_i, check:bool) -> tuple[None|str, None|str]:
+    return parse_and_compile(_worker_parser, target, parse_name, compiler, check)
+
+
+def compile_target(targets:list[pl.Path], debug=False, with_prelude=False, check=False, parser_import:str=defaults.PARSER, incremental=False, cache:None|CompileCache=None, ast_cache:None|ASTCache=None, workers:None|int=None) -> list[str]:
     """
     Compile targets (an explicit list, will not search or handle directories)
     using the default pyparsing parser.
@@ -37,6 +98,20 @@ def compile_target(targets:list[pathlib.Path], debug=False, with_prelude=False,
     with_prelude=True includes the default instal prelude from insta.__data.standard_prelude
     in the output.
 
+    incremental=True compiles institutions and bridges into base/step(t) programs,
+    with the incremental prelude, for use with ClingoIncrementalSolver.
+
+    cache, if provided, is checked for each target before parsing,
+    and successfully compiled targets are added to it.
+    Caching is disabled when debugging or checking, so parsing and validation always occur.
+
+    ast_cache, if provided, is given to the parser so unchanged files are not reparsed,
+    including when checking.
+
+    workers > 1 parses and compiles targets over a pool of processes.
+    Output is in the same order as compiling serially.
+    Debugging always compiles serially.
+
     Returns a list of strings of each separate compiled file addition.
     """
     logging.info("Compiling %s target files", len(targets))
@@ -54,46 +129,43 @@ def compile_target(targets:list[pathlib.Path], debug=False, with_prelude=False,
     from instal.compiler.query_compiler import InstalQueryCompiler
     from instal.compiler.situation_compiler import InstalSituationCompiler
 
-
     # Now import and build the parser
-    parser_module_str = ".".join(parser_import.split(".")[:-1])
-    parser_class_str  = parser_import.split(".")[-1]
-    logging.info("Loading Parser Module : %s", parser_module_str)
-    parser_module     = importlib.import_module(parser_module_str)
-    logging.info("Loading Parser Class  : %s", parser_class_str)
-    parser            = getattr(parser_module, parser_class_str)()
+    ast_cache = None if debug else ast_cache
+    parser    = load_parser(parser_import, ast_cache=ast_cache)
 
-    assert(isinstance(parser, InstalParser_i))
+    if cache is not None and (debug or check):
+        logging.info("Compile Cache disabled for debugging and checking")
+        cache = None
 
-    output : list[str] = []
-    prelude_classes    = set()
+    # Output slots, filled in target order. None marks a target still to compile
+    output          : list[None|str]                                          = []
+    pending         : list[tuple[int, pl.Path, str, InstalCompiler_i, None|str]] = []
+    prelude_classes : set[type]                                               = set()
 
     # Read each target, matching its suffix to choose
     # how to parse, check, and compile it
-    compilation_errored = False
     for target in targets:
         logging.info("Reading %s", str(target))
-        compiler  = None
-        parse_fn  = None
-        validator = None
+        compiler   = None
+        parse_name = None
 
         ##-- match
         match target.suffix:
             case defaults.INST_EXT:
-                parse_fn = parser.parse_institution
-                compiler = InstalInstitutionCompiler()
+                parse_name = "parse_institution"
+                compiler   = InstalInstitutionCompiler(incremental=incremental)
             case defaults.BRIDGE_EXT:
-                parse_fn = parser.parse_bridge
-                compiler = InstalBridgeCompiler()
+                parse_name = "parse_bridge"
+                compiler   = InstalBridgeCompiler(incremental=incremental)
             case defaults.QUERY_EXT:
-                parse_fn = parser.parse_query
-                compiler = InstalQueryCompiler()
+                parse_name = "parse_query"
+                compiler   = InstalQueryCompiler()
             case defaults.DOMAIN_EXT:
-                parse_fn = parser.parse_domain
-                compiler = InstalDomainCompiler()
+                parse_name = "parse_domain"
+                compiler   = InstalDomainCompiler()
             case defaults.SITUATION_EXT:
-                parse_fn = parser.parse_situation
-                compiler = InstalSituationCompiler()
+                parse_name = "parse_situation"
+                compiler   = InstalSituationCompiler()
             case _:
                 logging.warning("Unrecognized compilation target: %s", target)
                 continue
@@ -106,28 +178,39 @@ def compile_target(targets:list[pathlib.Path], debug=False, with_prelude=False,
             prelude_classes.add(compiler.__class__)
             output.append(compiler.load_prelude())
 
-        try:
-            ast = parse_fn(target)
-            if check and validator:
-                validator.validate(ast)
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(target, parser_import, incremental=incremental)
+            cached    = cache.get(cache_key)
+            if cached is not None:
+                logging.info("Compile Cache hit: %s", target)
+                output.append(cached)
+                continue
 
-            compiled     = compiler.compile(ast)
-            output.append(compiled)
-        except pp.ParseException as exp:
-            compilation_errored = True
-            logging.error(f"File: %s : (line %s column %s) : %s : %s",
-                            target.name, exp.lineno, exp.col, exp.msg, exp.markInputline())
-        except pp.ParseFatalException as exp:
-            compilation_errored = True
-            logging.error(f"File: %s : (line %s column %s) : %s : %s",
-                            target.name, exp.lineno, exp.col, exp.msg, exp.markInputline())
-        except AssertionError as err:
-            compilation_errored = True
-            logging.error("File: %s : %s", target.name, str(err))
-        except Exception as err:
+        pending.append((len(output), target, parse_name, compiler, cache_key))
+        output.append(None)
+
+    # Parse and compile everything not in the cache
+    if bool(workers) and 1 < workers and 1 < len(pending) and not debug:
+        logging.info("Compiling %s targets over %s workers", len(pending), workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(parser_import, ast_cache)) as pool:
+            futures = [pool.submit(_worker_parse_and_compile, target, parse_name, compiler, check)
+                       for _, target, parse_name, compiler, _ in pending]
+            results = [x.result() for x in futures]
+    else:
+        results = [parse_and_compile(parser, target, parse_name, compiler, check)
+                   for _, target, parse_name, compiler, _ in pending]
+
+    compilation_errored = False
+    for (slot, _, _, _, cache_key), (compiled, error) in zip(pending, results):
+        if error is not None:
             compilation_errored = True
-            logging.error("File: %s : %s", target.name, str(err))
+            logging.error(error)
+            continue
 
+        output[slot] = compiled
+        if cache_key is not None:
+            cache.put(cache_key, compiled)
 
     if compilation_errored:
         logging.error("Compilation Errored Out")
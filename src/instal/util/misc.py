@@ -33,20 +33,20 @@ def maybe_get_query_and_situation(query:None|str, situation:None|str) -> tuple[l
 
     Returns a tuple of lists of TermASTs, which are empty if the targets produce nothing
     """
-    from instal.parser.parser import InstalPyParser
-    parser    = InstalPyParser()
-    situation = []
-    query     = []
+    from instal.parser.v2.parser import InstalPyParser
+    parser         = InstalPyParser()
+    situation_asts = []
+    query_asts     = []
 
     if situation:
-        as_path    = pathlib.Path(situation).expanduser().resolve()
-        parse_this = as_path if as_path.exists() else situation.replace("\\n", "\n")
-        situation += parser.parse_situation(parse_this).body[:]
+        as_path         = pl.Path(situation).expanduser().resolve()
+        parse_this      = as_path if as_path.exists() else situation.replace("\\n", "\n")
+        situation_asts += parser.parse_situation(parse_this)[:]
 
     if query:
-        as_path    = pathlib.Path(query).expanduser().resolve()
-        parse_this = as_path if as_path.exists() else query.replace("\\n", "\n")
-        query     += parser.parse_query(parse_this).body[:]
+        as_path     = pl.Path(query).expanduser().resolve()
+        parse_this  = as_path if as_path.exists() else query.replace("\\n", "\n")
+        query_asts += parser.parse_query(parse_this)[:]
 
 
-    return query, situation
+    return query_asts, situation_asts
@@ -0,0 +1,206 @@
+#/usr/bin/env python3
+"""
+Lightweight timing spans, for seeing where a run spends its time.
+
+Stages of instal wrap their work in `span(name, **attrs)`,
+which records nothing unless a sink has been set with `set_sink`.
+While disabled, `span` returns a shared no-op context manager,
+so the cost is a global lookup and a function call.
+
+Sinks:
+LogSink        : logs each span as it finishes, indented by depth
+JsonLinesSink  : writes a json object per span to a file
+ChromeTraceSink: writes the Chrome trace event format on close,
+                 for chrome://tracing or https://ui.perfetto.dev
+
+Spans are recorded in the process that set the sink.
+Worker processes (eg: of compile_target and run_batch) clear it.
+Nesting depth is tracked per thread, as clingo runs solve callbacks on its own thread.
+"""
+##-- imports
+from __future__ import annotations
+
+import abc
+import json
+import logging as logmod
+import os
+import pathlib as pl
+import threading
+import time
+from dataclasses import InitVar, dataclass, field
+from typing import IO, Any, Final
+##-- end imports
+
+##-- logging
+logging = logmod.getLogger(__name__)
+##-- end logging
+
+SINK_FORMATS : Final[tuple[str, ...]] = ("log", "jsonl", "chrome")
+
+_sink  : None|SpanSink_i = None
+_local : threading.local = threading.local()
+
+@dataclass
+class SpanRecord:
+    """ A finished span. Times are perf_counter seconds """
+    name     : str
+    start    : float
+    duration : float
+    depth    : int
+    attrs    : dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name"     : self.name,
+            "start"    : self.start,
+            "duration" : self.duration,
+            "depth"    : self.depth,
+            "attrs"    : self.attrs,
+        }
+
+class SpanSink_i(abc.ABC):
+    """ Where finished spans are sent """
+
+    @abc.abstractmethod
+    def record(self, span:SpanRecord): pass
+
+    def close(self): pass
+
+class _NullSpan:
+    """ The span used while no sink is set """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs): pass
+
+_NULL_SPAN : Final[_NullSpan] = _NullSpan()
+
+class Span:
+    """ A timed region, sent to the sink it was created with on exit """
+    __slots__ = ("name", "attrs", "sink", "start", "depth")
+
+    def __init__(self, name:str, attrs:dict, sink:SpanSink_i):
+        self.name  = name
+        self.attrs = attrs
+        self.sink  = sink
+        self.start = 0.0
+        self.depth = 0
+
+    def __enter__(self):
+        self.depth   = getattr(_local, "depth", 0)
+        _local.depth = self.depth + 1
+        self.start   = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration     = time.perf_counter() - self.start
+        _local.depth = self.depth
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+
+        self.sink.record(SpanRecord(self.name, self.start, duration, self.depth, self.attrs))
+        return False
+
+    def set(self, **attrs):
+        """ Add attributes known only once the span has started, eg: result counts """
+        self.attrs.update(attrs)
+
+def span(name:str, **attrs) -> Span|_NullSpan:
+    """
+    Usage:
+        with span("compile", target=path.name) as sp:
+            ...
+            sp.set(size=len(result))
+    """
+    if _sink is None:
+        return _NULL_SPAN
+
+    return Span(name, attrs, _sink)
+
+def set_sink(sink:None|SpanSink_i, close:bool=True) -> None|SpanSink_i:
+    """
+    Set the sink for spans, returning the previous one,
+    closed unless close=False (eg: in a forked worker, where it is a copy)
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    _local.depth    = 0
+    if previous is not None and close:
+        previous.close()
+
+    return previous
+
+def get_sink() -> None|SpanSink_i:
+    return _sink
+
+def build_sink(fmt:str, output:pl.Path) -> SpanSink_i:
+    """ Build a sink by name (see SINK_FORMATS), writing into the directory `output` """
+    match fmt:
+        case "log":
+            return LogSink()
+        case "jsonl":
+            return JsonLinesSink(output / "spans.jsonl")
+        case "chrome":
+            return ChromeTraceSink(output / "spans.json")
+        case _:
+            raise ValueError("Unknown span sink format", fmt, SINK_FORMATS)
+
+@dataclass
+class LogSink(SpanSink_i):
+    """ Logs each span as it finishes """
+    level  : int = field(default=logmod.INFO)
+
+    def record(self, span:SpanRecord):
+        attrs = " ".join(f"{k}={v}" for k,v in span.attrs.items())
+        logging.log(self.level, "Span: %s%s : %.6fs %s", "  " * span.depth, span.name, span.duration, attrs)
+
+@dataclass
+class JsonLinesSink(SpanSink_i):
+    """ Writes a json object per span to `path`, as each finishes """
+    path    : pl.Path
+    _stream : None|IO        = field(init=False, default=None, repr=False)
+    _lock   : threading.Lock = field(init=False, default_factory=threading.Lock, repr=False)
+
+    def record(self, span:SpanRecord):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if self._stream is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._stream = self.path.open("w")
+
+            self._stream.write(line)
+            self._stream.write("\n")
+            # flushed, so forked workers don't inherit buffered spans
+            self._stream.flush()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+@dataclass
+class ChromeTraceSink(SpanSink_i):
+    """ Collects spans as complete ('X') events, written to `path` on close """
+    path   : pl.Path
+    events : list[dict] = field(init=False, default_factory=list, repr=False)
+
+    def record(self, span:SpanRecord):
+        self.events.append({
+            "name" : span.name,
+            "cat"  : span.name.split(".")[0],
+            "ph"   : "X",
+            "ts"   : span.start * 1_000_000,
+            "dur"  : span.duration * 1_000_000,
+            "pid"  : os.getpid(),
+            "tid"  : threading.get_ident(),
+            "args" : span.attrs,
+        })
+
+    def close(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"traceEvents" : self.events, "displayTimeUnit" : "ms"}, default=str))